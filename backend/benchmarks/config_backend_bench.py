@@ -0,0 +1,64 @@
+"""Benchmarks config reads and compare-and-swap writes on the local backends.
+
+Run from the repository root::
+
+    python -m backend.benchmarks.config_backend_bench --iterations 2000
+"""
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from backend.src.services.file_config_backend import FileConfigBackend
+from backend.src.services.sqlite_config_backend import SQLiteConfigBackend
+
+SAMPLE_CONFIG = json.loads(
+    (Path(__file__).resolve().parents[1] / "config.json").read_text(encoding="utf-8")
+)
+
+
+def _time_calls(fn, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _report(name: str, samples: list[float]):
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, round(0.99 * (len(ordered) - 1)))]
+    print(
+        f"{name:<28} mean {statistics.fmean(samples) * 1e6:>9.1f} us"
+        f"  p99 {p99 * 1e6:>9.1f} us"
+    )
+
+
+def _advance(config: dict):
+    schedule = config["on_call_schedule"]
+    schedule["current_index"] = (schedule["current_index"] + 1) % len(schedule["roster"])
+
+
+def main(args: argparse.Namespace):
+    with tempfile.TemporaryDirectory() as directory:
+        backends = {
+            "file": FileConfigBackend(f"{directory}/config.json"),
+            "sqlite": SQLiteConfigBackend(f"{directory}/config.db"),
+        }
+        for name, backend in backends.items():
+            backend.save_config(SAMPLE_CONFIG)
+            _report(f"{name} load_config (cached)", _time_calls(backend.load_config, args.iterations))
+            _report(
+                f"{name} update_config (CAS)",
+                _time_calls(lambda b=backend: b.update_config(_advance), args.iterations // 10),
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    main(parser.parse_args())
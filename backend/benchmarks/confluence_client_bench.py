@@ -0,0 +1,109 @@
+"""Benchmarks ConfluenceClient against a local stub Confluence server.
+
+Compares the previous transport behaviour (a fresh connection per call, one
+call at a time) with the shared keep-alive pool driven concurrently, and
+reports requests/sec and p50/p99 latency for each.
+
+Run from the repository root::
+
+    python -m backend.benchmarks.confluence_client_bench --requests 500 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+from backend.benchmarks.stub_confluence import StubConfluenceServer
+from backend.src.services import confluence_client
+from backend.src.services.confluence_client import ConfluenceClient
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _report(name: str, latencies: list[float], elapsed: float, connections: int):
+    print(
+        f"{name:<28} {len(latencies) / elapsed:>10.1f} req/s"
+        f"  p50 {statistics.median(latencies) * 1000:>7.2f} ms"
+        f"  p99 {_percentile(latencies, 99) * 1000:>7.2f} ms"
+        f"  connections {connections}"
+    )
+
+
+async def _bench_per_call(client: ConfluenceClient, total: int) -> tuple[list, float]:
+    """Mimics the old transport: a new connection for every sequential call."""
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(total):
+        call_started = time.perf_counter()
+        async with httpx.AsyncClient() as http:
+            response = await http.get(
+                f"{client.base_url}/content/1/child/page", headers=client.headers
+            )
+            response.raise_for_status()
+        latencies.append(time.perf_counter() - call_started)
+    return latencies, time.perf_counter() - started
+
+
+async def _bench_pooled(
+    client: ConfluenceClient, total: int, concurrency: int
+) -> tuple[list, float]:
+    """Drives the shared pool with ``concurrency`` in-flight calls."""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_call():
+        async with semaphore:
+            call_started = time.perf_counter()
+            await client.get_child_pages("1")
+            latencies.append(time.perf_counter() - call_started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_call() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    await confluence_client.close_http_client()
+    return latencies, elapsed
+
+
+async def main(args: argparse.Namespace):
+    with StubConfluenceServer(latency=args.latency_ms / 1000) as server:
+        os.environ.update(
+            {
+                "CONFLUENCE_DOMAIN": server.domain,
+                "CONFLUENCE_USERNAME": "bench",
+                "CONFLUENCE_API_TOKEN": "bench",
+                "CONFLUENCE_SPACE_KEY": "BENCH",
+                "CONFLUENCE_POOL_SIZE": str(args.pool_size),
+            }
+        )
+        client = ConfluenceClient()
+
+        latencies, elapsed = await _bench_per_call(client, args.requests)
+        _report("per-call connection", latencies, elapsed, server.connections)
+
+        server.connections = 0
+        latencies, elapsed = await _bench_pooled(client, args.requests, args.concurrency)
+        _report(
+            f"pooled (concurrency {args.concurrency})",
+            latencies,
+            elapsed,
+            server.connections,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--pool-size", type=int, default=20)
+    parser.add_argument(
+        "--latency-ms", type=float, default=5.0, help="Delay added by the stub server."
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,469 @@
+"""In-process fakes of the Confluence, Slack and GCS APIs used by the load benchmarks.
+
+Each fake implements the subset of the real API that the services call,
+keeps its state in memory and serves it over real HTTP on a background
+thread, so the app's clients, connection pools and retries are exercised
+end to end. Every fake can add latency, fail a share of requests with 503
+and enforce a request rate limit with 429 responses.
+"""
+
+import datetime
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+from backend.src.services.report_title import WeeklyReportTitle
+
+Response = tuple[int, bytes, str, dict[str, str]] # status, body, content type, headers
+
+
+def _json(payload, status: int = 200, headers: dict | None = None) -> Response:
+    return status, json.dumps(payload).encode(), "application/json", headers or {}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under concurrent connects.
+    request_queue_size = 512
+
+
+class FakeUpstream:
+    """Serves a fake API on a background thread, with injectable latency, errors and limits.
+
+    ``latency`` (plus up to ``jitter``) seconds are added to every response,
+    ``error_rate`` is the share of requests failed with 503, and
+    ``rate_limit`` (requests per second, bursting to ``burst``) rejects
+    excess requests with 429 and a ``Retry-After`` header. Counters record
+    requests per route and the failures injected.
+    """
+
+    name = "upstream"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float | None = None,
+        burst: int = 10,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.requests: Counter[str] = Counter()
+        self.injected_errors = 0
+        self.rate_limited = 0
+        self._tokens = float(burst)
+        self._tokens_updated = time.monotonic()
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _handle(self):
+                url = urlparse(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length) if length else b""
+                status, payload, content_type, headers = server.handle(
+                    self.command, url.path, parse_qs(url.query), self.headers, body
+                )
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+        self._httpd = _Server((host, port), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _take_token(self) -> bool:
+        if self.rate_limit is None:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._tokens_updated) * self.rate_limit
+            )
+            self._tokens_updated = now
+            if self._tokens < 1:
+                self.rate_limited += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    def handle(self, method: str, path: str, query: dict, headers, body: bytes) -> Response:
+        with self._lock:
+            self.requests[f"{method} {self.route_name(method, path)}"] += 1
+        if not self._take_token():
+            return self.rate_limited_response()
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+        if self.error_rate and random.random() < self.error_rate:
+            with self._lock:
+                self.injected_errors += 1
+            return _json({"message": "Injected failure"}, status=503)
+        return self.route(method, path, query, headers, body)
+
+    def rate_limited_response(self) -> Response:
+        retry_after = max(1, round(1 / self.rate_limit)) if self.rate_limit else 1
+        return _json({"message": "Rate limited"}, status=429, headers={"Retry-After": str(retry_after)})
+
+    def route_name(self, method: str, path: str) -> str:
+        """Groups request paths for the per-route counters (IDs replaced by placeholders)."""
+        return re.sub(r"/\d+", "/{id}", path)
+
+    def route(self, method: str, path: str, query: dict, headers, body: bytes) -> Response:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": sum(self.requests.values()),
+                "by_route": dict(self.requests),
+                "injected_errors": self.injected_errors,
+                "rate_limited": self.rate_limited,
+            }
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+_CQL_SPACE_RE = re.compile(r'space = "([^"]*)"')
+_CQL_ANCESTOR_RE = re.compile(r'ancestor = "?(\w+)"?')
+_CQL_TITLE_RE = re.compile(r'title ~ "([^"]*)"')
+_CONTENT_RE = re.compile(r"^/wiki/rest/api/content/(?P<id>\d+)(?P<rest>/child/page|/copy)?$")
+
+
+class FakeConfluence(FakeUpstream):
+    """A stateful fake of the Confluence Cloud REST API (content and CQL search).
+
+    Spaces are created on first use with this year's root page ("團隊週會
+    <year>") holding a report for last week, so any number of teams can be
+    driven without setup. Titles are unique per space, as in Confluence.
+    """
+
+    name = "confluence"
+
+    def __init__(self, report_label: str = "RD4 團隊週報", **options):
+        super().__init__(**options)
+        self.report_label = report_label
+        self._pages: dict[str, dict] = {}
+        self._titles: dict[tuple[str, str], str] = {} # (space, title) -> page ID
+        self._children: dict[str | None, list[str]] = {}
+        self._ids = itertools.count(1000)
+        self._spaces: set[str] = set()
+        self._state_lock = threading.RLock()
+
+    def _add_page(self, space: str, parent_id: str | None, title: str, body: str) -> dict | None:
+        with self._state_lock:
+            if (space, title) in self._titles:
+                return None
+            page_id = str(next(self._ids))
+            self._pages[page_id] = {
+                "id": page_id,
+                "space": space,
+                "parent_id": parent_id,
+                "title": title,
+                "body": body,
+                "version": 1,
+                "created": time.time_ns(),
+            }
+            self._titles[(space, title)] = page_id
+            self._children.setdefault(parent_id, []).append(page_id)
+            return self._pages[page_id]
+
+    def ensure_space(self, space: str):
+        """Seeds a space with this year's root page and last week's report."""
+        with self._state_lock:
+            if space in self._spaces:
+                return
+            self._spaces.add(space)
+            today = datetime.date.today()
+            root = self._add_page(space, None, f"團隊週會 {today.year}", f"{today.year} weekly reports.")
+            week = today - datetime.timedelta(days=today.weekday() + 7)
+            if week.year != today.year: # Early January: seed the year's first Monday instead
+                new_year = datetime.date(today.year, 1, 1)
+                week = new_year + datetime.timedelta(days=-new_year.weekday() % 7)
+            title = WeeklyReportTitle.for_week(self.report_label, week)
+            self._add_page(space, root["id"], str(title), "<p>{{title}}</p>")
+
+    def _render(self, page: dict, expand: str = "") -> dict:
+        rendered = {
+            "id": page["id"],
+            "type": "page",
+            "title": page["title"],
+            "space": {"key": page["space"]},
+            "version": {"number": page["version"]},
+            "ancestors": [{"id": page["parent_id"]}] if page["parent_id"] else [],
+            "_links": {"webui": f"/spaces/{page['space']}/pages/{page['id']}"},
+        }
+        if "body" in expand:
+            rendered["body"] = {"storage": {"value": page["body"], "representation": "storage"}}
+        return rendered
+
+    def route_name(self, method: str, path: str) -> str:
+        return re.sub(r"/\d+", "/{id}", path.removeprefix("/wiki/rest/api"))
+
+    def route(self, method: str, path: str, query: dict, headers, body: bytes) -> Response:
+        data = json.loads(body) if body else {}
+        first = {key: values[0] for key, values in query.items()}
+        if path == "/wiki/rest/api/content" and method == "GET":
+            return self._get_by_title(first.get("spaceKey", ""), first.get("title", ""))
+        if path == "/wiki/rest/api/content/search" and method == "GET":
+            return self._search(first.get("cql", ""), int(first.get("limit", 25)))
+        if path == "/wiki/rest/api/content/" and method == "POST":
+            return self._create(data)
+        match = _CONTENT_RE.match(path)
+        if not match:
+            return _json({"message": "Not found"}, status=404)
+        with self._state_lock:
+            page = self._pages.get(match["id"])
+        if page is None:
+            return _json({"message": "No content found"}, status=404)
+        if match["rest"] == "/child/page" and method == "GET":
+            return self._children_of(page, int(first.get("start", 0)), int(first.get("limit", 25)))
+        if match["rest"] == "/copy" and method == "POST":
+            return self._copy(page, data)
+        if match["rest"] is None and method == "GET":
+            return _json(self._render(page, first.get("expand", "")))
+        if match["rest"] is None and method == "PUT":
+            return self._update(page, data)
+        return _json({"message": "Method not allowed"}, status=405)
+
+    def _get_by_title(self, space: str, title: str) -> Response:
+        self.ensure_space(space)
+        with self._state_lock:
+            page_id = self._titles.get((space, title))
+            results = [self._render(self._pages[page_id])] if page_id else []
+        return _json({"results": results, "size": len(results)})
+
+    def _search(self, cql: str, limit: int) -> Response:
+        space = _CQL_SPACE_RE.search(cql)
+        ancestor = _CQL_ANCESTOR_RE.search(cql)
+        title = _CQL_TITLE_RE.search(cql)
+        if space:
+            self.ensure_space(space[1])
+        with self._state_lock:
+            pages = [
+                page for page in self._pages.values()
+                if (not space or page["space"] == space[1])
+                and (not ancestor or page["parent_id"] == ancestor[1])
+                and (not title or title[1].strip("*") in page["title"])
+            ]
+            pages.sort(key=lambda page: page["created"], reverse="DESC" in cql)
+            results = [self._render(page) for page in pages[:limit]]
+        return _json({"results": results, "size": len(results)})
+
+    def _children_of(self, page: dict, start: int, limit: int) -> Response:
+        with self._state_lock:
+            child_ids = self._children.get(page["id"], [])
+            results = [self._render(self._pages[i]) for i in child_ids[start : start + limit]]
+            has_more = start + limit < len(child_ids)
+        links = {}
+        if has_more:
+            links["next"] = (
+                f"/rest/api/content/{page['id']}/child/page?start={start + limit}&limit={limit}"
+            )
+        return _json({"results": results, "start": start, "limit": limit, "_links": links})
+
+    def _create(self, data: dict) -> Response:
+        space = data.get("space", {}).get("key", "")
+        ancestors = data.get("ancestors") or [{}]
+        body = data.get("body", {}).get("storage", {}).get("value", "")
+        page = self._add_page(space, ancestors[0].get("id"), data.get("title", ""), body)
+        if page is None:
+            return _json({"message": "A page with this title already exists"}, status=400)
+        return _json(self._render(page))
+
+    def _copy(self, source: dict, data: dict) -> Response:
+        parent_id = data.get("destination", {}).get("value")
+        title = data.get("pageTitle") or f"Copy of {source['title']}"
+        page = self._add_page(source["space"], parent_id, title, source["body"])
+        if page is None:
+            return _json({"message": "A page with this title already exists"}, status=400)
+        return _json(self._render(page))
+
+    def _update(self, page: dict, data: dict) -> Response:
+        with self._state_lock:
+            title = data.get("title", page["title"])
+            if title != page["title"]:
+                if (page["space"], title) in self._titles:
+                    return _json({"message": "A page with this title already exists"}, status=400)
+                del self._titles[(page["space"], page["title"])]
+                self._titles[(page["space"], title)] = page["id"]
+                page["title"] = title
+            page["version"] = data.get("version", {}).get("number", page["version"] + 1)
+            return _json(self._render(page))
+
+    def pages_in(self, space: str) -> list[str]:
+        """Returns the titles of a space's pages, in creation order."""
+        with self._state_lock:
+            return [page["title"] for page in self._pages.values() if page["space"] == space]
+
+
+class FakeSlack(FakeUpstream):
+    """A fake of the Slack Web API methods the app calls (chat.postMessage, conversations.setTopic).
+
+    Rate-limited calls get Slack's 429 response: ``{"ok": false, "error":
+    "ratelimited"}`` with ``Retry-After``. Posted messages are kept in order.
+    """
+
+    name = "slack"
+    METHODS = {"chat.postMessage", "conversations.setTopic"}
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.messages: list[dict] = []
+
+    def rate_limited_response(self) -> Response:
+        status, _, content_type, headers = super().rate_limited_response()
+        return status, json.dumps({"ok": False, "error": "ratelimited"}).encode(), content_type, headers
+
+    def route(self, method: str, path: str, query: dict, headers, body: bytes) -> Response:
+        api_method = path.removeprefix("/api/")
+        if api_method not in self.METHODS:
+            return _json({"ok": False, "error": "unknown_method"})
+        if not (headers.get("Authorization") or "").startswith("Bearer "):
+            return _json({"ok": False, "error": "not_authed"})
+        if "json" in (headers.get("Content-Type") or ""):
+            args = json.loads(body or b"{}")
+        else:
+            args = {key: values[0] for key, values in parse_qs(body.decode()).items()}
+            args.update({key: values[0] for key, values in query.items()})
+        if api_method == "chat.postMessage":
+            with self._lock:
+                self.messages.append(args)
+                ts = f"{time.time():.6f}"
+            return _json({"ok": True, "channel": args.get("channel"), "ts": ts, "message": args})
+        return _json({"ok": True, "channel": {"id": args.get("channel"), "topic": args.get("topic")}})
+
+
+_OBJECT_RE = re.compile(r"^(?:/download)?/storage/v1/b/(?P<bucket>[^/]+)/o/(?P<name>.+)$")
+_UPLOAD_RE = re.compile(r"^/upload/storage/v1/b/(?P<bucket>[^/]+)/o$")
+
+
+class FakeGCS(FakeUpstream):
+    """A fake of the GCS JSON API subset used by the config backend.
+
+    Supports object metadata, media downloads and multipart uploads with
+    ``ifGenerationMatch`` preconditions. Point the client library at it with
+    ``STORAGE_EMULATOR_HOST``.
+    """
+
+    name = "gcs"
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self._objects: dict[tuple[str, str], tuple[bytes, int, str]] = {} # data, generation, type
+        self._generations = itertools.count(1)
+        self._state_lock = threading.Lock()
+
+    def put_object(self, bucket: str, name: str, data: bytes, content_type: str = "application/json") -> int:
+        with self._state_lock:
+            generation = next(self._generations)
+            self._objects[(bucket, name)] = (data, generation, content_type)
+            return generation
+
+    def get_object(self, bucket: str, name: str) -> bytes | None:
+        with self._state_lock:
+            stored = self._objects.get((bucket, name))
+        return stored[0] if stored else None
+
+    def _metadata(self, bucket: str, name: str, stored: tuple[bytes, int, str]) -> dict:
+        data, generation, content_type = stored
+        return {
+            "kind": "storage#object",
+            "bucket": bucket,
+            "name": name,
+            "generation": str(generation),
+            "metageneration": "1",
+            "contentType": content_type,
+            "size": str(len(data)),
+        }
+
+    def route_name(self, method: str, path: str) -> str:
+        if path.startswith("/download/"):
+            return "download"
+        if path.startswith("/upload/"):
+            return "upload"
+        return "metadata"
+
+    def route(self, method: str, path: str, query: dict, headers, body: bytes) -> Response:
+        first = {key: values[0] for key, values in query.items()}
+        if method == "POST" and (match := _UPLOAD_RE.match(path)):
+            return self._upload(match["bucket"], first, headers, body)
+        match = _OBJECT_RE.match(path)
+        if method != "GET" or not match:
+            return _json({"error": {"code": 404, "message": "Not found"}}, status=404)
+        bucket, name = match["bucket"], unquote(match["name"])
+        with self._state_lock:
+            stored = self._objects.get((bucket, name))
+        if stored is None:
+            return _json({"error": {"code": 404, "message": f"No such object: {bucket}/{name}"}}, status=404)
+        if path.startswith("/download/") or first.get("alt") == "media":
+            return 200, stored[0], stored[2], {"x-goog-generation": str(stored[1])}
+        return _json(self._metadata(bucket, name, stored))
+
+    def _upload(self, bucket: str, query: dict, headers, body: bytes) -> Response:
+        metadata, data = self._parse_multipart(headers.get("Content-Type") or "", body)
+        name = metadata.get("name") or query.get("name", "")
+        with self._state_lock:
+            stored = self._objects.get((bucket, name))
+            if "ifGenerationMatch" in query:
+                current = stored[1] if stored else 0
+                if int(query["ifGenerationMatch"]) != current:
+                    return _json({"error": {"code": 412, "message": "Precondition Failed"}}, status=412)
+            generation = next(self._generations)
+            stored = (data, generation, metadata.get("contentType", "application/octet-stream"))
+            self._objects[(bucket, name)] = stored
+        return _json(self._metadata(bucket, name, stored))
+
+    @staticmethod
+    def _parse_multipart(content_type: str, body: bytes) -> tuple[dict, bytes]:
+        """Splits a multipart/related upload into its JSON metadata and media parts."""
+        boundary = re.search(r'boundary="?([^";]+)"?', content_type)
+        if not boundary:
+            return {}, body
+        parts = body.split(b"--" + boundary[1].encode())
+        contents = []
+        for part in parts[1:-1]:
+            _, _, content = part.partition(b"\r\n\r\n")
+            contents.append(content.removesuffix(b"\r\n"))
+        metadata = json.loads(contents[0]) if contents else {}
+        return metadata, contents[1] if len(contents) > 1 else b""
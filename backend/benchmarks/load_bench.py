@@ -0,0 +1,277 @@
+"""Load-tests the FastAPI app end to end against local fakes of Confluence, Slack and GCS.
+
+Starts the fakes from ``fake_upstreams``, points the app at them through
+its usual environment variables, seeds the config into the fake bucket and
+drives the app in process (lifespan included) with concurrent requests.
+For each scenario it reports throughput, latency percentiles, response
+statuses, peak memory and the calls each upstream received. Nothing leaves
+the machine, so runs are repeatable and need no credentials.
+
+Scenarios:
+
+- ``config-read``: GET /api/config, revalidating the cached config against GCS.
+- ``batch-report``: weekly reports for ``--teams`` new team spaces per request.
+- ``on-call``: on-call notifications, each a Slack post and a conditional
+  config write, so concurrent requests contend on the config generation.
+
+The app paces Slack calls to Slack's published limits (one message per
+channel per second), which would dominate every Slack-bound scenario; the
+pacing is lifted unless ``--slack-pacing`` is given. The fake Slack's own
+``--rate-limit`` still applies.
+
+``--save-baseline`` stores the results in ``benchmarks/baselines/`` and
+``--compare`` checks a run against them, exiting with status 1 if throughput
+dropped or p95 latency grew by more than ``--tolerance``. Baselines are
+machine-specific; record them on the machine that compares against them.
+
+Run from the repository root::
+
+    python -m backend.benchmarks.load_bench --requests 200 --concurrency 20
+    python -m backend.benchmarks.load_bench --scenario batch-report --latency-ms 20 --error-rate 0.02
+    python -m backend.benchmarks.load_bench --compare
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from backend.benchmarks.fake_upstreams import FakeConfluence, FakeGCS, FakeSlack
+from backend.src.services import slack_dispatcher
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+SAMPLE_CONFIG = (Path(__file__).resolve().parents[1] / "config.json").read_bytes()
+BUCKET = "bench-config"
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def _configure_environment(confluence: FakeConfluence, slack: FakeSlack, gcs: FakeGCS):
+    """Points the app's clients at the fakes, the way a deployment's env would."""
+    os.environ.update(
+        {
+            "CONFLUENCE_DOMAIN": confluence.url,
+            "CONFLUENCE_USERNAME": "bench",
+            "CONFLUENCE_API_TOKEN": "bench",
+            "CONFLUENCE_SPACE_KEY": "BENCH",
+            "CONFLUENCE_HTTP2": "false", # The fakes speak HTTP/1.1 only
+            "SLACK_API_TOKEN": "xoxb-bench",
+            "SLACK_API_URL": f"{slack.url}/api/",
+            "STORAGE_EMULATOR_HOST": gcs.url,
+            "GOOGLE_CLOUD_PROJECT": "bench",
+            "CONFIG_BACKEND": "gcs",
+            "GCS_BUCKET_NAME": BUCKET,
+            "SCHEDULER_ENABLED": "false",
+        }
+    )
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def _config_read(run_id: str, index: int, args) -> tuple[str, str, dict]:
+    return "GET", "/api/config", {}
+
+
+def _batch_report(run_id: str, index: int, args) -> tuple[str, str, dict]:
+    targets = [
+        {"team": f"team-{team}", "space_key": f"B{run_id}{index}T{team}"}
+        for team in range(args.teams)
+    ]
+    return "POST", "/schedule/confluence-weekly-report/batch", {
+        "json": {"targets": targets, "max_concurrency": args.teams},
+        "headers": {"Idempotency-Key": f"{run_id}-{index}"},
+    }
+
+
+def _on_call(run_id: str, index: int, args) -> tuple[str, str, dict]:
+    return "POST", "/schedule/on-call-notification", {
+        "headers": {"Idempotency-Key": f"{run_id}-{index}"}
+    }
+
+
+SCENARIOS = {
+    "config-read": _config_read,
+    "batch-report": _batch_report,
+    "on-call": _on_call,
+}
+
+
+async def _run_scenario(client, name: str, args) -> dict:
+    """Sends ``args.requests`` requests with ``args.concurrency`` in flight."""
+    build_request = SCENARIOS[name]
+    run_id = uuid.uuid4().hex[:8]
+    latencies = []
+    statuses: Counter[str] = Counter()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one_request(index: int):
+        method, path, options = build_request(run_id, index, args)
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, **options)
+                statuses[str(response.status_code)] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_request(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": args.requests,
+        "throughput": args.requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": _percentile(latencies, 95) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def _report(name: str, result: dict):
+    print(
+        f"{name:<14} {result['throughput']:>8.1f} req/s"
+        f"  p50 {result['p50_ms']:>8.2f} ms"
+        f"  p95 {result['p95_ms']:>8.2f} ms"
+        f"  p99 {result['p99_ms']:>8.2f} ms"
+        f"  peak RSS {result['peak_rss_mb']:>6.1f} MB"
+    )
+    print(f"{'':<14} statuses {result['statuses']}")
+    for upstream, calls in result["upstreams"].items():
+        print(
+            f"{'':<14} {upstream:<10} {calls['requests']:>6} calls"
+            f"  {calls['injected_errors']} injected errors  {calls['rate_limited']} rate limited"
+        )
+
+
+def _compare(name: str, result: dict, tolerance: float) -> list[str]:
+    """Returns the regressions of ``result`` against the scenario's saved baseline."""
+    path = BASELINE_DIR / f"{name}.json"
+    if not path.exists():
+        print(f"{'':<14} no baseline at {path}")
+        return []
+    baseline = json.loads(path.read_text())
+    if baseline["settings"] != result["settings"]:
+        print(f"{'':<14} baseline was recorded with {baseline['settings']}; comparing anyway")
+    regressions = []
+    if result["throughput"] < baseline["throughput"] * (1 - tolerance):
+        regressions.append(
+            f"{name}: throughput {result['throughput']:.1f} req/s"
+            f" < baseline {baseline['throughput']:.1f} req/s"
+        )
+    if result["p95_ms"] > baseline["p95_ms"] * (1 + tolerance):
+        regressions.append(
+            f"{name}: p95 {result['p95_ms']:.2f} ms > baseline {baseline['p95_ms']:.2f} ms"
+        )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict]:
+    """Runs the selected scenarios against fresh fakes and returns their results."""
+    import httpx
+
+    options = {
+        "latency": args.latency_ms / 1000,
+        "jitter": args.jitter_ms / 1000,
+        "error_rate": args.error_rate,
+        "rate_limit": args.rate_limit,
+    }
+    fakes = {
+        "confluence": FakeConfluence(**options),
+        "slack": FakeSlack(**options),
+        "gcs": FakeGCS(**options),
+    }
+    results = {}
+    with contextlib.ExitStack() as stack:
+        for fake in fakes.values():
+            stack.enter_context(fake)
+        fakes["gcs"].put_object(BUCKET, "config.json", SAMPLE_CONFIG)
+        _configure_environment(fakes["confluence"], fakes["slack"], fakes["gcs"])
+
+        if not args.slack_pacing:
+            unlimited = (1e6, 1_000_000)
+            slack_dispatcher.METHOD_LIMITS = dict.fromkeys(slack_dispatcher.METHOD_LIMITS, unlimited)
+            slack_dispatcher.DEFAULT_METHOD_LIMIT = unlimited
+            slack_dispatcher.CHANNEL_LIMIT = unlimited
+
+        from backend.src.main import app # Imported after the environment is set
+
+        transport = httpx.ASGITransport(app=app)
+        async with (
+            app.router.lifespan_context(app),
+            httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client,
+        ):
+            for name in args.scenario or SCENARIOS:
+                before = {upstream: fake.stats() for upstream, fake in fakes.items()}
+                result = await _run_scenario(client, name, args)
+                result["peak_rss_mb"] = _peak_rss_mb()
+                result["upstreams"] = {}
+                for upstream, fake in fakes.items():
+                    after = fake.stats()
+                    result["upstreams"][upstream] = {
+                        key: after[key] - before[upstream][key]
+                        for key in ("requests", "injected_errors", "rate_limited")
+                    }
+                result["settings"] = {
+                    "requests": args.requests,
+                    "concurrency": args.concurrency,
+                    "teams": args.teams,
+                    "slack_pacing": args.slack_pacing,
+                    **options,
+                }
+                results[name] = result
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS),
+        help="Scenario to run; repeatable (default: all).",
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--teams", type=int, default=5, help="Teams per batch-report request.")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Delay added by each fake.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random delay, up to this much.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of upstream calls failed with 503.")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Upstream requests/sec before 429s.")
+    parser.add_argument("--slack-pacing", action="store_true", help="Keep the app's Slack rate pacing.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baselines.")
+    parser.add_argument("--compare", action="store_true", help="Fail if results regressed against the baselines.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression (default 0.2 = 20%%).")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args))
+    regressions = []
+    for name, result in results.items():
+        _report(name, result)
+        if args.compare:
+            regressions += _compare(name, result, args.tolerance)
+        if args.save_baseline:
+            BASELINE_DIR.mkdir(exist_ok=True)
+            (BASELINE_DIR / f"{name}.json").write_text(json.dumps(result, indent=2) + "\n")
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Benchmarks weekly report title parsing over a synthetic archive.
+
+Compares the previous per-call parsing (two regex searches and ad-hoc year
+handling for every title) with WeeklyReportTitle parsing cold, warm (from
+the LRU cache) and vectorized over the whole archive with
+parse_report_titles.
+
+Run from the repository root::
+
+    python -m backend.benchmarks.report_title_bench --years 10 --repeat 5
+"""
+
+import argparse
+import datetime
+import re
+import time
+
+from backend.src.services import report_title
+from backend.src.services.report_title import WeeklyReportTitle
+
+_DATE_RANGE_RE = re.compile(r"\((\d{4})-(\d{4})\)")
+_TITLE_YEAR_RE = re.compile(r"^(\d{4})")
+TEAMS = ["技術部 RD1 團隊週報", "技術部 RD4 團隊週報", "產品部 PM 週報", "營運部 週會紀錄"]
+
+
+def legacy_end_date(title: str) -> datetime.date | None:
+    """The title parsing ConfluenceService used before WeeklyReportTitle."""
+    match = _DATE_RANGE_RE.search(title)
+    if not match:
+        return None
+    start_str, end_str = match.groups()
+    end_month, end_day = int(end_str[:2]), int(end_str[2:])
+    year_match = _TITLE_YEAR_RE.search(title)
+    if not year_match:
+        return None
+    year = int(year_match.group(1))
+    if end_month == 1 and int(start_str[:2]) == 12:
+        year += 1
+    return datetime.date(year, end_month, end_day)
+
+
+def synthetic_archive(years: int) -> list[str]:
+    """Weekly titles for every team over ``years`` years, plus some non-report pages."""
+    titles = []
+    monday = datetime.date(2026 - years, 1, 1)
+    monday += datetime.timedelta(days=-monday.weekday() % 7)
+    while monday.year < 2026:
+        for team in TEAMS:
+            titles.append(str(WeeklyReportTitle.for_week(team, monday)))
+        titles.append(f"{monday.year} 會議紀錄 {monday:%m%d}")
+        monday += datetime.timedelta(weeks=1)
+    return titles
+
+
+def _best_of(fn, repeat: int, reset=None) -> float:
+    samples = []
+    for _ in range(repeat):
+        if reset:
+            reset()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return min(samples)
+
+
+def _clear_caches():
+    report_title.parse_report_title.cache_clear()
+    report_title._resolve_fields.cache_clear()
+
+
+def main(args: argparse.Namespace):
+    titles = synthetic_archive(args.years)
+    print(f"{len(titles)} titles over {args.years} years (best of {args.repeat})")
+    parse = report_title.parse_report_title
+    runs = {
+        "legacy per-title": (lambda: [legacy_end_date(t) for t in titles], None),
+        "parse_report_titles": (lambda: report_title.parse_report_titles(titles), _clear_caches),
+        "parse_report_title cold": (lambda: [parse(t) for t in titles], _clear_caches),
+        "parse_report_title warm": (lambda: [parse(t) for t in titles], None),
+    }
+    for name, (fn, reset) in runs.items():
+        elapsed = _best_of(fn, args.repeat, reset)
+        print(
+            f"{name:<28} {elapsed * 1000:>8.2f} ms"
+            f"  {elapsed / len(titles) * 1e6:>6.2f} us/title"
+        )
+    cache = report_title.parse_report_title.cache_info()
+    print(f"title cache: {cache.currsize}/{cache.maxsize} entries, {cache.hits} hits")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
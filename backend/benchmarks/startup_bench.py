@@ -0,0 +1,56 @@
+"""Measures how long importing the FastAPI app takes, via ``python -X importtime``.
+
+Run from the repository root::
+
+    python -m backend.benchmarks.startup_bench --runs 5
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+def measure_import(module: str = "backend.src.main") -> dict[str, int]:
+    """Imports ``module`` in a fresh interpreter and returns cumulative import time (us) per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        timings[name.strip()] = int(cumulative_us)
+    return timings
+
+
+def app_import_ms(timings: dict[str, int]) -> float:
+    """Returns the app's own import time: everything under backend.src.main except FastAPI itself."""
+    return (timings["backend.src.main"] - timings.get("fastapi", 0)) / 1000
+
+
+def main(args: argparse.Namespace):
+    runs = [measure_import() for _ in range(args.runs)]
+    totals = [timings["backend.src.main"] / 1000 for timings in runs]
+    own = [app_import_ms(timings) for timings in runs]
+    print(f"import backend.src.main  median {statistics.median(totals):>8.1f} ms")
+    print(f"  excluding fastapi      median {statistics.median(own):>8.1f} ms")
+    slowest = sorted(runs[-1].items(), key=lambda item: item[1], reverse=True)
+    print("slowest modules (cumulative, last run):")
+    for name, cumulative_us in slowest[: args.top]:
+        print(f"  {cumulative_us / 1000:>8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    main(parser.parse_args())
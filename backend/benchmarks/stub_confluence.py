@@ -0,0 +1,135 @@
+"""A minimal local stub of the Confluence REST API used by the benchmarks."""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_CHILD_RE = re.compile(r"^/wiki/rest/api/content/(?P<id>[^/]+)/child/page$")
+_COPY_RE = re.compile(r"^/wiki/rest/api/content/(?P<id>[^/]+)/copy$")
+_PAGE_RE = re.compile(r"^/wiki/rest/api/content/(?P<id>[^/]+)$")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under concurrent connects.
+    request_queue_size = 128
+
+
+class StubConfluenceServer:
+    """Serves canned Confluence responses on a background thread.
+
+    The server speaks HTTP/1.1 with keep-alive so that connection reuse in the
+    client is observable. ``latency`` adds a fixed delay to every response to
+    mimic a remote upstream.
+    """
+
+    def __init__(self, latency: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.latency = latency
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._next_id = 1000
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, payload: dict, status: int = 200):
+                if server.latency:
+                    time.sleep(server.latency)
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self) -> dict:
+                length = int(self.headers.get("Content-Length", 0))
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path == "/wiki/rest/api/content":
+                    title = parse_qs(url.query).get("title", [""])[0]
+                    self._send({"results": [{"id": "1", "title": title}]})
+                elif match := _CHILD_RE.match(url.path):
+                    self._send({"results": server.child_pages(match["id"])})
+                elif match := _PAGE_RE.match(url.path):
+                    self._send(server.page(match["id"]))
+                else:
+                    self._send({"message": "not found"}, status=404)
+
+            def do_POST(self):
+                url = urlparse(self.path)
+                data = self._read_json()
+                if match := _COPY_RE.match(url.path):
+                    self._send(
+                        server.page(server.new_id(), title=data.get("pageTitle"), source=match["id"])
+                    )
+                elif url.path == "/wiki/rest/api/content/":
+                    self._send(server.page(server.new_id()))
+                else:
+                    self._send({"message": "not found"}, status=404)
+
+            def do_PUT(self):
+                url = urlparse(self.path)
+                data = self._read_json()
+                if match := _PAGE_RE.match(url.path):
+                    self._send(server.page(match["id"], title=data.get("title")))
+                else:
+                    self._send({"message": "not found"}, status=404)
+
+        self._httpd = _Server((host, port), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def domain(self) -> str:
+        """The value to use for ``CONFLUENCE_DOMAIN`` when targeting this stub."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def new_id(self) -> str:
+        with self._lock:
+            self._next_id += 1
+            return str(self._next_id)
+
+    def page(self, page_id: str, title: str | None = None, source: str | None = None) -> dict:
+        return {
+            "id": page_id,
+            "title": title or f"Page {page_id}",
+            "version": {"number": 1},
+            "body": {"storage": {"value": "<p>stub</p>"}},
+            "_links": {"webui": f"/spaces/STUB/pages/{page_id}"},
+        }
+
+    def child_pages(self, page_id: str) -> list:
+        return [
+            {"id": "2", "title": "2025 W01 RD4 團隊週報 (1230-0103)"},
+            {"id": "3", "title": "2025 W02 RD4 團隊週報 (0106-0110)"},
+        ]
+
+    def start(self) -> "StubConfluenceServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubConfluenceServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -1,16 +1,50 @@
+from fastapi import APIRouter, Header, HTTPException, Response, status
+
 from ..models.config import AppConfig
-from ..services.config_service import get_app_config, save_app_config
-from fastapi import APIRouter
+from ..services.config_service import (
+    get_app_config,
+    get_app_config_generation,
+    save_app_config,
+)
+from .routing import ValidationErrorHandlingRoute
+
+router = APIRouter(route_class=ValidationErrorHandlingRoute)
 
-router = APIRouter()
+# The ETag of GET /api/config. Sent back on PUT, it tells the server which
+# version was edited, so rotation positions are only kept from storage if a
+# trigger moved them in the meantime.
+IF_MATCH = Header(
+    None, alias="If-Match", description="ETag of the config this update was based on."
+)
 
 @router.get("/api/config", response_model=AppConfig)
-async def get_config():
+async def get_config(response: Response):
     """Retrieves the entire application configuration."""
-    return get_app_config()
+    config = get_app_config()
+    generation = get_app_config_generation()
+    if generation is not None:
+        response.headers["ETag"] = f'"{generation}"'
+    return config
 
 @router.put("/api/config", response_model=AppConfig)
-async def update_config(new_config: AppConfig):
-    """Updates the entire application configuration."""
-    save_app_config(new_config)
+async def update_config(
+    new_config: AppConfig, response: Response, if_match: str | None = IF_MATCH
+):
+    """
+    Updates the entire application configuration.
+    Rotation positions that changed in storage since the edited version are
+    kept, and named in the ``Config-Ignored-Fields`` response header.
+    """
+    expected_generation = None
+    if if_match:
+        try:
+            expected_generation = int(if_match.removeprefix("W/").strip('"'))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="If-Match must be an ETag returned by GET /api/config.",
+            ) from None
+    ignored = save_app_config(new_config, expected_generation)
+    if ignored:
+        response.headers["Config-Ignored-Fields"] = ", ".join(ignored)
     return new_config
@@ -0,0 +1,46 @@
+import time
+
+from ..services.metrics import CONTENT_TYPE, render_metrics, request_duration
+from fastapi import APIRouter, Response
+
+router = APIRouter() # Scrapes are not traced
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Exposes the service's metrics in the Prometheus text format."""
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
+class MetricsMiddleware:
+    """
+    Records each HTTP request's latency, labelled by its route template
+    (e.g. /schedule/jobs/{job_id}) so the label set stays bounded.
+    A plain ASGI middleware, it adds no per-request task or body buffering.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            )
@@ -0,0 +1,66 @@
+import asyncio
+import datetime
+
+from ..models.config import Rotation
+from ..models.oncall import OnCallShift, RotationStatus, UserRotations
+from ..services.config_service import get_app_config
+from ..services.oncall_calendar import get_on_call_calendar
+from ..services.oncall_service import current_on_call, get_rotation_index
+from .routing import ValidationErrorHandlingRoute
+from fastapi import APIRouter, HTTPException, Query, status
+
+router = APIRouter(route_class=ValidationErrorHandlingRoute)
+
+def _as_utc(value: datetime.datetime) -> datetime.datetime:
+    return value.replace(tzinfo=datetime.timezone.utc) if value.tzinfo is None else value
+
+def _rotation_status(rotation: Rotation) -> RotationStatus:
+    return RotationStatus(
+        id=rotation.id,
+        name=rotation.name,
+        slack_channel=rotation.slack_channel,
+        cadence_days=rotation.cadence_days,
+        on_call=current_on_call(rotation),
+    )
+
+@router.get("/api/oncall/rotations/{rotation_id}", response_model=RotationStatus)
+async def get_rotation(rotation_id: str):
+    """Returns a rotation and who is currently on call in it."""
+    app_config = await asyncio.to_thread(get_app_config)
+    rotation = get_rotation_index(app_config.rotations).get(rotation_id)
+    if rotation is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Rotation not found.")
+    return _rotation_status(rotation)
+
+@router.get("/api/oncall/users/{slack_user_id}", response_model=UserRotations)
+async def get_user_rotations(slack_user_id: str):
+    """Returns every rotation a Slack user is on, with its current on-call person."""
+    app_config = await asyncio.to_thread(get_app_config)
+    rotations = get_rotation_index(app_config.rotations).for_slack_user(slack_user_id)
+    return UserRotations(
+        slack_user_id=slack_user_id,
+        rotations=[_rotation_status(rotation) for rotation in rotations],
+    )
+
+@router.get("/api/oncall/at", response_model=OnCallShift)
+async def get_on_call_at(ts: datetime.datetime = Query(description="ISO 8601 time; naive times are UTC.")):
+    """Returns the on-call shift covering a point in time, overrides and swaps included."""
+    app_config = await asyncio.to_thread(get_app_config)
+    shift = get_on_call_calendar(app_config.on_call_schedule).at(ts)
+    if shift is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No on-call shift at that time. Is on_call_schedule.rotation_start set?",
+        )
+    return shift
+
+@router.get("/api/oncall/shifts", response_model=list[OnCallShift])
+async def get_on_call_shifts(start: datetime.datetime, end: datetime.datetime):
+    """Returns the on-call shifts overlapping ``[start, end)``; naive times are UTC."""
+    start, end = _as_utc(start), _as_utc(end)
+    if end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="end must be after start."
+        )
+    app_config = await asyncio.to_thread(get_app_config)
+    return get_on_call_calendar(app_config.on_call_schedule).between(start, end)
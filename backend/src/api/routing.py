@@ -0,0 +1,37 @@
+from ..services.tracing import extract_span_context, start_span
+from fastapi import HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+
+class ValidationErrorHandlingRoute(APIRoute):
+    """
+    Turns ValueErrors raised by handlers into 400 responses, and runs each
+    request in a server span that continues the caller's trace, if any.
+    """
+
+    def get_route_handler(self):
+        original_route_handler = super().get_route_handler()
+
+        async def custom_route_handler(request: Request) -> JSONResponse:
+            with start_span(
+                f"{request.method} {self.path_format}",
+                kind="server",
+                attributes={"http.request.method": request.method, "http.route": self.path_format},
+                parent=extract_span_context(request.headers),
+            ) as span:
+                try:
+                    response = await original_route_handler(request)
+                except ValueError as exc:
+                    response = JSONResponse(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        content={"detail": str(exc)},
+                    )
+                except HTTPException as exc:
+                    if span is not None:
+                        span.set_attribute("http.response.status_code", exc.status_code)
+                    raise
+                if span is not None:
+                    span.set_attribute("http.response.status_code", response.status_code)
+                return response
+        return custom_route_handler
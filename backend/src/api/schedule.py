@@ -1,80 +1,420 @@
-from ..services.config_service import get_app_config, save_app_config
-from ..services.confluence_service import ConfluenceService
-from ..services.oncall_service import OnCallService  # Import OnCallService
-from ..services.slack_service import SlackService
-from fastapi import APIRouter, HTTPException, status
+import asyncio
+import datetime
+import functools
+import logging
+import os
+import time
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response, status
+from fastapi.responses import JSONResponse
+
+from ..models.job import Job, JobAccepted
+from ..models.schedule import (
+    RotationBatchResponse,
+    WeeklyReportBatchRequest,
+    WeeklyReportBatchResponse,
+    WeeklyReportRangeRequest,
+    WeeklyReportRangeResponse,
+)
+from ..services.config_service import (
+    advance_on_call_rotation,
+    advance_rotations,
+    get_app_config,
+)
+from ..services.confluence_service import ConfluenceService, create_weekly_reports
+from ..services.idempotency import (
+    NotRecorded,
+    derive_idempotency_key,
+    get_idempotency_store,
+)
+from ..services.job_runner import get_job_runner
+from ..services.metrics import record_job
+from ..services.oncall_service import (  # Import OnCallService
+    OnCallService,
+    is_rotation_due,
+    next_rotation_index,
+    scheduled_handover_at,
+)
+from ..services.resilience import deadline
+from ..services.slack_service import AsyncSlackService
+from ..services.structured_logging import log_context
+from .routing import ValidationErrorHandlingRoute
+
+router = APIRouter(route_class=ValidationErrorHandlingRoute)
+logger = logging.getLogger(__name__)
+
+# Opt-in background mode: `?async=true` enqueues the job and returns 202 at once.
+RUN_ASYNC = Query(False, alias="async", description="Run as a background job and return 202.")
+
+# Scheduler retries are at-least-once. Without an explicit key, a trigger is
+# deduplicated per job type and ISO week.
+IDEMPOTENCY_KEY = Header(
+    None, alias="Idempotency-Key", description="Replays the stored response for a repeated key."
+)
+
+def _idempotent(job_type: str, fn, idempotency_key: str | None, payload: str = "", response: Response | None = None):
+    """Wraps ``fn`` so repeated triggers with the same key replay the first response."""
+    if idempotency_key:
+        key = f"{job_type}:{idempotency_key}"
+    else:
+        key = derive_idempotency_key(job_type, payload)
+
+    async def run_once():
+        started = time.perf_counter()
+        try:
+            # Every upstream call the job makes shares one overall deadline.
+            with (
+                log_context(job_type=job_type),
+                deadline(float(os.getenv("JOB_DEADLINE_SECONDS", "600"))),
+            ):
+                result, replayed = await get_idempotency_store().run(key, fn)
+        except Exception:
+            _finish_job(job_type, "failed", started)
+            raise
+        _finish_job(job_type, "replayed" if replayed else "succeeded", started)
+        if replayed and response is not None:
+            response.headers["Idempotent-Replayed"] = "true"
+        return result
+
+    return run_once
+
+def _finish_job(job_type: str, outcome: str, started: float):
+    """Counts a finished job run and logs its outcome and duration."""
+    duration = time.perf_counter() - started
+    record_job(job_type, outcome, duration)
+    logger.info(
+        "Job %s %s", job_type, outcome,
+        extra={"job_type": job_type, "outcome": outcome, "duration_ms": duration * 1000},
+    )
+
+def _accept_job(job_type: str, fn) -> JSONResponse:
+    """Enqueues ``fn`` on the job runner and returns a 202 with the job ID."""
+    job = get_job_runner().submit(job_type, fn)
+    accepted = JobAccepted(
+        job_id=job.id, status=job.status, status_url=f"/schedule/jobs/{job.id}"
+    )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED, content=accepted.model_dump()
+    )
 
-router = APIRouter()
 
 @router.post("/schedule/confluence-weekly-report")
-async def trigger_confluence_weekly_report():
+async def trigger_confluence_weekly_report(
+    response: Response,
+    run_async: bool = RUN_ASYNC,
+    idempotency_key: str | None = IDEMPOTENCY_KEY,
+):
     """Triggers the copying of a Confluence page for the next week."""
-    app_config = get_app_config()
+    job_type = "confluence-weekly-report"
+    if run_async:
+        return _accept_job(
+            job_type, _idempotent(job_type, _run_confluence_weekly_report, idempotency_key)
+        )
+    return await _idempotent(
+        job_type, _run_confluence_weekly_report, idempotency_key, response=response
+    )()
+
+async def _run_confluence_weekly_report() -> dict | NotRecorded:
+    app_config = await asyncio.to_thread(get_app_config)
     confluence_config = app_config.confluence_config
 
     if not confluence_config.weekly_report_enabled:
-        return {"message": "Confluence page copying is disabled."}
+        return NotRecorded({"message": "Confluence page copying is disabled."})
 
-    confluence_service = ConfluenceService()
-    slack_service = SlackService()
+    confluence_service = ConfluenceService(
+        template_page_id=confluence_config.weekly_report_template_page_id,
+        on_call_schedule=app_config.on_call_schedule,
+    )
+    slack_service = AsyncSlackService()
 
     try:
-        new_page_url = confluence_service.create_next_weekly_report()
-        slack_service.send_message(
+        new_page_url = await confluence_service.create_next_weekly_report()
+        await slack_service.send_message(
             channel=confluence_config.weekly_report_slack_channel,
             message=f"Confluence weekly report for next week created: {new_page_url}",
         )
         return {"message": "Confluence page copy for next week triggered."}
     except Exception as e:
         error_message = f"Error copying Confluence page: {e}"
-        print(error_message)
+        logger.error(error_message, exc_info=e)
         try:
-            slack_service.send_message(
-                channel=confluence_config.weekly_report_slack_channel, message=error_message
+            await slack_service.send_message(
+                channel=confluence_config.weekly_report_slack_channel,
+                message=error_message,
             )
         except Exception as slack_e:
-            print(f"Failed to send error notification to Slack: {slack_e}")
+            logger.warning("Failed to send error notification to Slack: %s", slack_e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_message
         ) from e
 
 
+@router.post(
+    "/schedule/confluence-weekly-report/batch", response_model=WeeklyReportBatchResponse
+)
+async def trigger_confluence_weekly_report_batch(
+    batch: WeeklyReportBatchRequest,
+    response: Response,
+    run_async: bool = RUN_ASYNC,
+    idempotency_key: str | None = IDEMPOTENCY_KEY,
+):
+    """Triggers the next weekly report for many teams/spaces concurrently."""
+    job_type = "confluence-weekly-report-batch"
+    run = functools.partial(_run_confluence_weekly_report_batch, batch)
+    # The targets are part of the derived key, so different batches in the same week all run.
+    payload = batch.model_dump_json()
+    if run_async:
+        return _accept_job(job_type, _idempotent(job_type, run, idempotency_key, payload))
+    return await _idempotent(job_type, run, idempotency_key, payload, response)()
+
+async def _run_confluence_weekly_report_batch(
+    batch: WeeklyReportBatchRequest,
+) -> WeeklyReportBatchResponse | NotRecorded:
+    app_config = await asyncio.to_thread(get_app_config)
+    confluence_config = app_config.confluence_config
+
+    if not confluence_config.weekly_report_enabled:
+        return NotRecorded(WeeklyReportBatchResponse(results={}))
+
+    results = await create_weekly_reports(
+        batch.targets,
+        batch.max_concurrency,
+        batch.timeout_seconds,
+        template_page_id=confluence_config.weekly_report_template_page_id,
+        on_call_schedule=app_config.on_call_schedule,
+    )
+
+    slack_service = AsyncSlackService()
+
+    async def notify(target, result):
+        channel = target.slack_channel or confluence_config.weekly_report_slack_channel
+        if not channel:
+            return
+        if result.status == "created":
+            message = f"Confluence weekly report for next week created: {result.url}"
+        else:
+            message = f"Error copying Confluence page for {target.team}: {result.error}"
+        try:
+            await slack_service.send_message(channel=channel, message=message)
+        except Exception as slack_e:
+            logger.warning(
+                "Failed to send batch notification to Slack: %s", slack_e,
+                extra={"team": target.team},
+            )
+
+    await asyncio.gather(
+        *(notify(target, results[target.team]) for target in batch.targets)
+    )
+    return WeeklyReportBatchResponse(results=results)
+
+
+@router.post(
+    "/schedule/confluence-weekly-report/range", response_model=WeeklyReportRangeResponse
+)
+async def trigger_confluence_weekly_report_range(
+    report_range: WeeklyReportRangeRequest,
+    response: Response,
+    run_async: bool = RUN_ASYNC,
+    idempotency_key: str | None = IDEMPOTENCY_KEY,
+):
+    """Pre-creates the next N weekly reports, or backfills missing weeks, in one job."""
+    job_type = "confluence-weekly-report-range"
+    run = functools.partial(_run_confluence_weekly_report_range, report_range)
+    payload = report_range.model_dump_json()
+    if run_async:
+        return _accept_job(job_type, _idempotent(job_type, run, idempotency_key, payload))
+    return await _idempotent(job_type, run, idempotency_key, payload, response)()
+
+async def _run_confluence_weekly_report_range(
+    report_range: WeeklyReportRangeRequest,
+) -> WeeklyReportRangeResponse | NotRecorded:
+    app_config = await asyncio.to_thread(get_app_config)
+    confluence_config = app_config.confluence_config
+
+    if not confluence_config.weekly_report_enabled:
+        return NotRecorded(WeeklyReportRangeResponse(results=[]))
+
+    slack_service = AsyncSlackService()
+    try:
+        results = await ConfluenceService(
+            space_key=report_range.space_key,
+            template_page_id=confluence_config.weekly_report_template_page_id,
+            on_call_schedule=app_config.on_call_schedule,
+        ).create_weekly_reports_range(
+            weeks=report_range.weeks,
+            through=report_range.through,
+            max_concurrency=report_range.max_concurrency,
+        )
+    except Exception as e:
+        error_message = f"Error creating Confluence weekly reports: {e}"
+        logger.error(error_message, exc_info=e)
+        try:
+            await slack_service.send_message(
+                channel=confluence_config.weekly_report_slack_channel,
+                message=error_message,
+            )
+        except Exception as slack_e:
+            logger.warning("Failed to send error notification to Slack: %s", slack_e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_message
+        ) from e
+
+    if results:
+        lines = [
+            f"{result.title}: {result.url}" if result.status == "created"
+            else f"{result.title}: failed ({result.error})"
+            for result in results
+        ]
+        try:
+            await slack_service.send_message(
+                channel=confluence_config.weekly_report_slack_channel,
+                message="Confluence weekly reports created:\n" + "\n".join(lines),
+            )
+        except Exception as slack_e:
+            logger.warning("Failed to send range notification to Slack: %s", slack_e)
+    return WeeklyReportRangeResponse(results=results)
+
+
 @router.post("/schedule/on-call-notification")
-async def trigger_on_call_notification():
+async def trigger_on_call_notification(
+    response: Response,
+    run_async: bool = RUN_ASYNC,
+    idempotency_key: str | None = IDEMPOTENCY_KEY,
+):
     """Triggers the on-call notification."""
-    app_config = get_app_config()
+    job_type = "on-call-notification"
+    if run_async:
+        return _accept_job(
+            job_type, _idempotent(job_type, _run_on_call_notification, idempotency_key)
+        )
+    return await _idempotent(
+        job_type, _run_on_call_notification, idempotency_key, response=response
+    )()
+
+async def _run_on_call_notification() -> dict | NotRecorded:
+    app_config = await asyncio.to_thread(get_app_config)
     on_call_config = app_config.on_call_config
     on_call_schedule = app_config.on_call_schedule
 
     if not on_call_config.enabled:
-        return {"message": "On-call notification is disabled."}
+        return NotRecorded({"message": "On-call notification is disabled."})
 
     on_call_service = OnCallService()
 
     try:
-        on_call_person, updated_schedule = on_call_service.notify_on_call_person(
+        expected_index = on_call_schedule.current_index
+        on_call_person, updated_schedule = await on_call_service.notify_on_call_person(
             on_call_config, on_call_schedule
         )
-        # Update the app_config with the new schedule and save it
-        app_config.on_call_schedule = updated_schedule
-        save_app_config(app_config)
+        # Persist only the new rotation position, guarded against concurrent updates
+        await asyncio.to_thread(
+            advance_on_call_rotation, expected_index, updated_schedule.current_index
+        )
 
         return {
             "message": f"On-call notification triggered for {on_call_person.name} ({on_call_person.slack_user_id})."
         }
     except Exception as e:
         error_message = f"Error sending on-call notification: {e}"
-        print(error_message)
+        logger.error(error_message, exc_info=e)
         # Attempt to send error notification to Slack (using the general slack_service if available)
         try:
-            # Re-initialize SlackService if not already done, or pass it around
-            slack_service = SlackService()
-            slack_service.send_message(
+            # AsyncSlackService reuses the process-wide pooled client
+            slack_service = AsyncSlackService()
+            await slack_service.send_message(
                 channel=on_call_config.slack_channel,  # Send to the configured on-call channel
                 message=error_message,
             )
         except Exception as slack_e:
-            print(f"Failed to send error notification to Slack: {slack_e}")
+            logger.warning("Failed to send error notification to Slack: %s", slack_e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_message
         ) from e
+
+
+@router.post("/schedule/on-call-rotations", response_model=RotationBatchResponse)
+async def trigger_on_call_rotations(
+    response: Response,
+    run_async: bool = RUN_ASYNC,
+    idempotency_key: str | None = IDEMPOTENCY_KEY,
+):
+    """Notifies and advances every configured on-call rotation that is due."""
+    job_type = "on-call-rotations"
+    # Rotations can have daily cadences, so derived keys are per hour, not per
+    # week; the due check and conditional advance guard against double handovers.
+    payload = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%dT%H")
+    if run_async:
+        return _accept_job(
+            job_type, _idempotent(job_type, _run_on_call_rotations, idempotency_key, payload)
+        )
+    return await _idempotent(
+        job_type, _run_on_call_rotations, idempotency_key, payload, response
+    )()
+
+async def _run_on_call_rotations() -> RotationBatchResponse | NotRecorded:
+    app_config = await asyncio.to_thread(get_app_config)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    due = [rotation for rotation in app_config.rotations if is_rotation_due(rotation, now)]
+    if not due:
+        return NotRecorded(RotationBatchResponse(results={}))
+
+    results = await OnCallService().notify_rotations(due)
+
+    # Advance every rotation that was notified in one conditional config write.
+    notified = [rotation for rotation in due if results[rotation.id].status == "notified"]
+    advances = {
+        rotation.id: (rotation.current_index, next_rotation_index(rotation))
+        for rotation in notified
+    }
+    if advances:
+        handovers = {rotation.id: scheduled_handover_at(rotation, now) for rotation in notified}
+        await asyncio.to_thread(advance_rotations, advances, handovers)
+    return RotationBatchResponse(results=results)
+
+
+async def _run_scheduled_rotations() -> RotationBatchResponse:
+    """Runs the scheduler's regular rotation check, counted like a triggered job."""
+    started = time.perf_counter()
+    try:
+        with log_context(job_type="on-call-rotations"):
+            result = await _run_on_call_rotations()
+    except Exception:
+        _finish_job("on-call-rotations", "failed", started)
+        raise
+    _finish_job("on-call-rotations", "succeeded", started)
+    return result.response if isinstance(result, NotRecorded) else result
+
+def scheduled_jobs() -> dict:
+    """
+    Returns the jobs for the in-process scheduler, keyed by job type, with the
+    cron strings from the config. Scheduled runs share the triggers'
+    idempotency keys, so a Cloud Scheduler call for the same run is replayed.
+    """
+    app_config = get_app_config()
+    jobs = {}
+    if app_config.confluence_config.weekly_report_enabled:
+        jobs["confluence-weekly-report"] = (
+            app_config.confluence_config.schedule,
+            lambda: _idempotent("confluence-weekly-report", _run_confluence_weekly_report, None)(),
+        )
+    if app_config.on_call_config.enabled:
+        jobs["on-call-notification"] = (
+            app_config.on_call_config.schedule,
+            lambda: _idempotent("on-call-notification", _run_on_call_notification, None)(),
+        )
+    if app_config.rotations:
+        # Rotations carry cadences rather than cron strings; check for due ones regularly.
+        jobs["on-call-rotations"] = (
+            os.getenv("SCHEDULER_ROTATIONS_CRON", "0 * * * *"),
+            _run_scheduled_rotations,
+        )
+    return jobs
+
+
+@router.get("/schedule/jobs/{job_id}", response_model=Job)
+async def get_job_status(job_id: str):
+    """Returns the status, result and upstream timings of a background job."""
+    job = get_job_runner().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found.")
+    return job
@@ -1,35 +1,69 @@
-from dotenv import load_dotenv  # 修正：導入 load_dotenv
-from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
-from fastapi.routing import APIRoute
+from contextlib import asynccontextmanager
+from pathlib import Path
 
-load_dotenv() # 修正：在應用程式啟動時加載 .env 檔案
+from fastapi import FastAPI
+
+
+def _load_env_file():
+    """
+    Loads the nearest .env file above this module, like load_dotenv() does.
+    python-dotenv is only imported when there is a file to load, so
+    deployments configured purely through the environment skip it.
+    """
+    for directory in Path(__file__).resolve().parents:
+        env_path = directory / ".env"
+        if env_path.is_file():
+            from dotenv import load_dotenv  # 修正：導入 load_dotenv
+
+            load_dotenv(env_path)
+            return
+
+_load_env_file() # 修正：在應用程式啟動時加載 .env 檔案
 
 from .api.config import router as config_router  # Import the config router
+from .api.metrics import MetricsMiddleware
+from .api.metrics import router as metrics_router
+from .api.oncall import router as oncall_router
+from .api.routing import ValidationErrorHandlingRoute
 from .api.schedule import (
     router as schedule_router,  # Import the schedule router
 )
+from .api.schedule import scheduled_jobs
+from .services.confluence_client import close_http_client
+from .services.job_runner import get_job_runner
+from .services.scheduler import build_scheduler
+from .services.slack_service import close_slack_client
+from .services.structured_logging import configure_logging, stop_logging
 
 
-class ValidationErrorHandlingRoute(APIRoute):
-    def get_route_handler(self):
-        original_route_handler = super().get_route_handler()
-
-        async def custom_route_handler(request: Request) -> JSONResponse:
-            try:
-                return await original_route_handler(request)
-            except ValueError as exc:
-                return JSONResponse(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    content={"detail": str(exc)},
-                )
-        return custom_route_handler
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Sets up structured logging and starts the in-process scheduler if
+    enabled. On shutdown, stops it, drains background jobs, releases pooled
+    upstream connections and flushes queued log records.
+    """
+    configure_logging()
+    scheduler = build_scheduler(scheduled_jobs)
+    if scheduler is not None:
+        scheduler.start()
+    yield
+    if scheduler is not None:
+        await scheduler.stop()
+    await get_job_runner().shutdown()
+    await close_http_client()
+    await close_slack_client()
+    stop_logging()
 
-app = FastAPI(route_class=ValidationErrorHandlingRoute)
+app = FastAPI(lifespan=lifespan)
+app.router.route_class = ValidationErrorHandlingRoute
+app.add_middleware(MetricsMiddleware)
 
 # Include API routes
 app.include_router(schedule_router)
 app.include_router(config_router)
+app.include_router(oncall_router)
+app.include_router(metrics_router)
 
 @app.get("/")
 async def read_root():
@@ -1,5 +1,7 @@
 
-from pydantic import BaseModel, Field, HttpUrl
+import datetime
+
+from pydantic import BaseModel, Field, HttpUrl, field_validator, model_validator
 
 
 class OnCallPerson(BaseModel):
@@ -7,10 +9,43 @@ class OnCallPerson(BaseModel):
     name: str
     slack_user_id: str
 
+class OnCallOverride(BaseModel):
+    """Puts someone else on call for a time window, e.g. to cover a day off."""
+    start: datetime.datetime
+    end: datetime.datetime
+    name: str
+    slack_user_id: str
+
+    @model_validator(mode="after")
+    def end_must_follow_start(self):
+        if self.end <= self.start:
+            raise ValueError("Override end must be after its start.")
+        return self
+
+class OnCallSwap(BaseModel):
+    """Swaps the people on call in the two shifts containing these instants."""
+    first: datetime.datetime
+    second: datetime.datetime
+
 class OnCallSchedule(BaseModel):
     """Represents the on-call schedule."""
     current_index: int = 0
     roster: list[OnCallPerson] = Field(default_factory=list)
+    rotation_start: datetime.datetime | None = None # Start of roster[0]'s first shift; anchors the calendar
+    shift_days: int = Field(default=7, ge=1)
+    overrides: list[OnCallOverride] = Field(default_factory=list) # Later overrides win
+    swaps: list[OnCallSwap] = Field(default_factory=list)
+
+class Rotation(BaseModel):
+    """Represents one named on-call rotation with its own roster and channel."""
+    id: str = Field(min_length=1)
+    name: str = ""
+    enabled: bool = True
+    slack_channel: str
+    cadence_days: int = Field(default=7, ge=1) # Days between handovers
+    current_index: int = 0 # Owned by the rotation trigger
+    last_advanced_at: datetime.datetime | None = None # Owned by the rotation trigger
+    roster: list[OnCallPerson] = Field(default_factory=list)
 
 class ConfluenceConfig(BaseModel):
     """Represents the Confluence configuration."""
@@ -20,6 +55,7 @@ class ConfluenceConfig(BaseModel):
     slack_channel: str
     weekly_report_enabled: bool = False
     weekly_report_slack_channel: str = ""
+    weekly_report_template_page_id: str = "" # Create reports from this page instead of copying the latest
 
 class OnCallConfig(BaseModel):
     """Represents the on-call configuration."""
@@ -32,3 +68,12 @@ class AppConfig(BaseModel):
     confluence_config: ConfluenceConfig
     on_call_config: OnCallConfig
     on_call_schedule: OnCallSchedule
+    rotations: list[Rotation] = Field(default_factory=list)
+
+    @field_validator("rotations")
+    @classmethod
+    def rotation_ids_must_be_unique(cls, rotations: list[Rotation]):
+        ids = [rotation.id for rotation in rotations]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Rotation IDs must be unique.")
+        return rotations
@@ -0,0 +1,29 @@
+import datetime
+
+from pydantic import BaseModel, Field
+
+
+class UpstreamTiming(BaseModel):
+    """Represents the duration of one upstream call made by a job."""
+    upstream: str # e.g. "confluence", "slack", "gcs"
+    operation: str
+    duration_ms: float
+    ok: bool
+
+class Job(BaseModel):
+    """Represents a background job and its outcome."""
+    id: str
+    type: str
+    status: str = "queued" # "queued", "running", "succeeded" or "failed"
+    created_at: datetime.datetime
+    started_at: datetime.datetime | None = None
+    finished_at: datetime.datetime | None = None
+    result: dict | None = None
+    error: str | None = None
+    timings: list[UpstreamTiming] = Field(default_factory=list)
+
+class JobAccepted(BaseModel):
+    """Represents the response for a job accepted for background execution."""
+    job_id: str
+    status: str
+    status_url: str
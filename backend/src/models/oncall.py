@@ -0,0 +1,26 @@
+import datetime
+
+from pydantic import BaseModel
+
+from .config import OnCallPerson
+
+
+class RotationStatus(BaseModel):
+    """Represents a rotation and who is currently on call in it."""
+    id: str
+    name: str
+    slack_channel: str
+    cadence_days: int
+    on_call: OnCallPerson | None = None
+
+class UserRotations(BaseModel):
+    """Represents the rotations a Slack user belongs to."""
+    slack_user_id: str
+    rotations: list[RotationStatus]
+
+class OnCallShift(BaseModel):
+    """Represents who is on call for one interval of the calendar."""
+    start: datetime.datetime
+    end: datetime.datetime
+    on_call: OnCallPerson
+    override: bool = False # True when an override, not the roster, set this interval
@@ -0,0 +1,11 @@
+
+from pydantic import BaseModel
+
+
+class ReportIndexEntry(BaseModel):
+    """Represents the cached weekly report location for one space and year."""
+    root_page_id: str
+    root_page_title: str
+    latest_report_id: str
+    latest_report_title: str
+    latest_end_date: str | None = None # ISO date of the latest report's end date
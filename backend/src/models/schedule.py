@@ -0,0 +1,72 @@
+
+import datetime
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+
+class WeeklyReportTarget(BaseModel):
+    """Represents one team/space to generate a weekly report for."""
+    team: str
+    space_key: str
+    slack_channel: str = "" # Falls back to the configured weekly report channel
+    template_page_id: str = "" # Falls back to the configured weekly report template
+
+class WeeklyReportBatchRequest(BaseModel):
+    """Represents a batch weekly report request across many teams."""
+    targets: list[WeeklyReportTarget] = Field(min_length=1)
+    max_concurrency: int = Field(default=8, ge=1, le=100)
+    timeout_seconds: float = Field(default=120.0, gt=0)
+
+    @field_validator("targets")
+    @classmethod
+    def teams_must_be_unique(cls, targets: list[WeeklyReportTarget]):
+        teams = [target.team for target in targets]
+        if len(teams) != len(set(teams)):
+            raise ValueError("Team names in a batch must be unique.")
+        return targets
+
+class WeeklyReportResult(BaseModel):
+    """Represents the outcome of one team's weekly report creation."""
+    status: str # "created", "failed" or "timeout"
+    url: str | None = None
+    error: str | None = None
+    duration_seconds: float
+
+class WeeklyReportBatchResponse(BaseModel):
+    """Represents the per-team results of a batch weekly report request."""
+    results: dict[str, WeeklyReportResult]
+
+class WeeklyReportRangeRequest(BaseModel):
+    """Represents a request to pre-create or backfill several weekly reports."""
+    space_key: str | None = None # Defaults to CONFLUENCE_SPACE_KEY
+    weeks: int | None = Field(default=None, ge=1, le=104) # Weeks to create after the latest report
+    through: datetime.date | None = None # Or: every missing week up to the one containing this date
+    max_concurrency: int = Field(default=4, ge=1, le=50)
+
+    @model_validator(mode="after")
+    def weeks_or_through(self):
+        if (self.weeks is None) == (self.through is None):
+            raise ValueError("Exactly one of weeks and through must be given.")
+        return self
+
+class WeeklyReportWeekResult(BaseModel):
+    """Represents the outcome of creating one week's report in a range."""
+    title: str
+    status: str # "created" or "failed"
+    url: str | None = None
+    error: str | None = None
+
+class WeeklyReportRangeResponse(BaseModel):
+    """Represents the per-week results of a weekly report range request, in week order."""
+    results: list[WeeklyReportWeekResult]
+
+class RotationResult(BaseModel):
+    """Represents the outcome of notifying one due on-call rotation."""
+    status: str # "notified" or "failed"
+    on_call_name: str | None = None
+    slack_user_id: str | None = None
+    error: str | None = None
+
+class RotationBatchResponse(BaseModel):
+    """Represents the per-rotation results of an on-call rotations trigger."""
+    results: dict[str, RotationResult]
@@ -0,0 +1,199 @@
+import copy
+import logging
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+from .telemetry import track_upstream
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigConflictError(Exception):
+    """Raised when a conditional config write loses a race with another writer."""
+
+
+class ConfigBackend(ABC):
+    """
+    Storage interface for the config file and other small JSON documents.
+    Every document has a generation that changes on each write. Backends
+    implement a cheap generation check plus read/write primitives; this base
+    class builds the generation-aware config cache and compare-and-swap
+    updates on top of them, so callers behave the same on every backend.
+    A write with ``if_generation_match=0`` only succeeds if the document does
+    not exist yet.
+    """
+
+    upstream = "config" # Name used when timing this backend's I/O
+
+    def __init__(self, config_name: str, cache_ttl_seconds: float = 0.0):
+        self.config_name = config_name
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.generation: int | None = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._cached_config: dict | None = None
+        self._validated_at = 0.0
+
+    @abstractmethod
+    def get_generation(self, name: str) -> int | None:
+        """Returns a document's current generation, or None if it does not exist."""
+
+    @abstractmethod
+    def read_document(self, name: str) -> tuple[dict | None, int | None]:
+        """Reads a document and the generation it was read at."""
+
+    @abstractmethod
+    def write_document(
+        self, name: str, data: dict, if_generation_match: int | None = None
+    ) -> int | None:
+        """Writes a document and returns its new generation."""
+
+    def read_documents(self, names: list[str]) -> dict[str, tuple[dict | None, int | None]]:
+        """Reads several documents; backends override this to batch the reads."""
+        return {name: self.read_document(name) for name in names}
+
+    def write_documents(self, documents: dict[str, dict]) -> dict[str, int | None]:
+        """Writes several documents; backends override this to batch the writes."""
+        return {name: self.write_document(name, data) for name, data in documents.items()}
+
+    def _cache_is_valid(self) -> bool:
+        """Checks the cached config against the document's current generation."""
+        if self._cached_config is None:
+            return False
+        if time.monotonic() - self._validated_at < self.cache_ttl_seconds:
+            return True
+        with track_upstream(self.upstream, "get_generation"):
+            generation = self.get_generation(self.config_name)
+        self._validated_at = time.monotonic()
+        return generation == self.generation
+
+    def _remember(self, config: dict, generation: int | None):
+        self._cached_config = config
+        self.generation = generation
+        self._validated_at = time.monotonic()
+
+    def load_config(self) -> dict:
+        """
+        Loads the configuration, reusing the cache when unchanged.
+        A config that does not exist yet loads as ``{}``. If loading fails, the
+        last known config is served; without one the error is raised, so
+        callers never mistake an unreachable store for an empty config.
+        """
+        try:
+            if self._cache_is_valid():
+                self.cache_hits += 1
+                return self._cached_config
+            self.cache_misses += 1
+            with track_upstream(self.upstream, "load_config"):
+                config, generation = self.read_document(self.config_name)
+            if config is None:
+                return {} # Not created yet, will be initialized by Admin UI
+            self._remember(config, generation)
+            return config
+        except Exception as e:
+            logger.error(
+                "Error loading config from %s: %s", type(self).__name__, e,
+                extra={"upstream": self.upstream, "outcome": "error"},
+            )
+            if self._cached_config is not None:
+                return self._cached_config # Serve the last known config instead
+            raise
+
+    def save_config(self, config: dict, if_generation_match: int | None = None):
+        """
+        Saves the configuration.
+        With ``if_generation_match`` the write only succeeds if the config is
+        still at that generation; otherwise ConfigConflictError is raised.
+        """
+        try:
+            with track_upstream(self.upstream, "save_config"):
+                generation = self.write_document(
+                    self.config_name, config, if_generation_match
+                )
+        except ConfigConflictError:
+            self._validated_at = float("-inf") # Force revalidation on next load
+            raise
+        except Exception as e:
+            logger.error(
+                "Error saving config to %s: %s", type(self).__name__, e,
+                extra={"upstream": self.upstream, "outcome": "error"},
+            )
+            raise # Re-raise to indicate save failure
+        self._remember(config, generation)
+
+    def update_config(
+        self, mutator: Callable[[dict], dict | None], max_attempts: int = 5
+    ) -> dict:
+        """
+        Applies ``mutator`` to the latest config and writes it with compare-and-swap.
+        The mutator receives a private copy of the stored config and may modify
+        it in place or return a replacement. If it changes nothing, nothing is
+        written. On a concurrent write it is re-run against the fresh config,
+        with jittered backoff between attempts.
+        """
+        for attempt in range(max_attempts):
+            self._validated_at = float("-inf") # Always compare against the latest
+            stored = self.load_config()
+            current = copy.deepcopy(stored)
+            generation = self.generation if current else 0
+            updated = mutator(current)
+            if updated is None:
+                updated = current
+            if updated == stored:
+                return updated
+            try:
+                self.save_config(updated, if_generation_match=generation)
+                return updated
+            except ConfigConflictError:
+                time.sleep(random.uniform(0, 0.05 * 2**attempt))
+        raise ConfigConflictError(
+            f"Config update failed after {max_attempts} conflicting attempts."
+        )
+
+    def cache_stats(self) -> dict:
+        """Returns config cache hit/miss counters."""
+        total = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_ratio": self.cache_hits / total if total else 0.0,
+        }
+
+
+_config_backend: ConfigBackend | None = None
+
+def get_config_backend() -> ConfigBackend:
+    """
+    Returns the process-wide config backend selected by CONFIG_BACKEND.
+    "gcs" (default) stores config in GCS_BUCKET_NAME, "file" in a local JSON
+    file (CONFIG_FILE_PATH) and "sqlite" in a WAL-mode database
+    (CONFIG_SQLITE_PATH).
+    """
+    global _config_backend
+    if _config_backend is None:
+        backend = os.getenv("CONFIG_BACKEND", "gcs").lower()
+        cache_ttl_seconds = float(os.getenv("CONFIG_CACHE_TTL_SECONDS", "0"))
+        if backend == "gcs":
+            from .gcs_service import get_gcs_config_service
+
+            _config_backend = get_gcs_config_service()
+        elif backend == "file":
+            from .file_config_backend import FileConfigBackend
+
+            _config_backend = FileConfigBackend(
+                os.getenv("CONFIG_FILE_PATH", "config.json"), cache_ttl_seconds
+            )
+        elif backend == "sqlite":
+            from .sqlite_config_backend import SQLiteConfigBackend
+
+            _config_backend = SQLiteConfigBackend(
+                os.getenv("CONFIG_SQLITE_PATH", "config.db"),
+                os.getenv("CONFIG_SQLITE_DOCUMENT", "config.json"),
+                cache_ttl_seconds,
+            )
+        else:
+            raise ValueError(f"Unknown CONFIG_BACKEND: {backend}")
+    return _config_backend
@@ -1,35 +1,165 @@
+import copy
+import datetime
+import logging
 
 from ..models.config import (
     AppConfig,
     ConfluenceConfig,
     OnCallConfig,
     OnCallSchedule,
+    Rotation,
 )
-from .gcs_service import get_gcs_config_service
+from .config_backend import ConfigConflictError, get_config_backend
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
 
 _app_config_instance: AppConfig | None = None
+_app_config_generation: int | None = None
 
+@traced("config.get_app_config")
 def get_app_config() -> AppConfig:
-    global _app_config_instance
-    if _app_config_instance is None:
-        gcs_service = get_gcs_config_service()
-        config_data = gcs_service.load_config()
+    """
+    Returns the application config, revalidated against the stored object.
+    The parsed AppConfig is reused as long as the storage generation it was
+    built from is current, so unchanged config is never re-validated.
+    """
+    global _app_config_instance, _app_config_generation
+    config_backend = get_config_backend()
+    config_data = config_backend.load_config()
+    if (
+        _app_config_instance is None
+        or config_backend.generation is None
+        or config_backend.generation != _app_config_generation
+    ):
         try:
             _app_config_instance = AppConfig(**config_data)
+            _app_config_generation = config_backend.generation
         except Exception as e:
             # If config is invalid or empty, provide a default structure
-            print(f"Error loading or parsing config: {e}. Initializing with default structure.")
+            logger.warning("Error loading or parsing config: %s. Initializing with default structure.", e)
             _app_config_instance = AppConfig(
                 confluence_config=ConfluenceConfig(confluence_url="https://example.com", slack_channel=""),
                 on_call_config=OnCallConfig(slack_channel=""),
                 on_call_schedule=OnCallSchedule(roster=[])
             )
-            # Optionally save the default config immediately
-            gcs_service.save_config(_app_config_instance.model_dump(mode='json'))
+            # Optionally save the default config immediately, but only if none exists
+            try:
+                config_backend.save_config(
+                    _app_config_instance.model_dump(mode='json'), if_generation_match=0
+                )
+                _app_config_generation = config_backend.generation
+            except ConfigConflictError:
+                _app_config_generation = None # A real config exists; reload next time
     return _app_config_instance
 
-def save_app_config(config: AppConfig):
-    global _app_config_instance
-    gcs_service = get_gcs_config_service()
-    gcs_service.save_config(config.model_dump(mode='json'))
+def get_app_config_generation() -> int | None:
+    """Returns the storage generation the current AppConfig was read at, if known."""
+    return _app_config_generation
+
+@traced("config.save_app_config")
+def save_app_config(config: AppConfig, expected_generation: int | None = None) -> list[str]:
+    """
+    Saves the application config with compare-and-swap.
+    Rotation positions (``on_call_schedule.current_index`` and each rotation's
+    ``current_index``/``last_advanced_at``) are also moved by the on-call
+    triggers. If the stored config is still at ``expected_generation`` (by
+    default the generation last read by this process), the submitted config
+    is written as is. Otherwise the config changed since it was read, and the
+    stored positions are kept instead of overwriting a rotation that advanced
+    concurrently. Returns the fields whose submitted values were replaced.
+    """
+    global _app_config_instance, _app_config_generation
+    config_backend = get_config_backend()
+    new_data = config.model_dump(mode='json')
+    if expected_generation is None:
+        expected_generation = _app_config_generation
+    replaced: list[str] = []
+
+    def keep_stored(target: dict, stored: dict, field: str, path: str):
+        if field in stored and target.get(field) != stored[field]:
+            target[field] = stored[field]
+            replaced.append(path)
+
+    def merge(stored: dict) -> dict:
+        replaced.clear()  # The mutator is re-run on conflicts
+        merged = copy.deepcopy(new_data)
+        if expected_generation is not None and expected_generation == config_backend.generation:
+            return merged  # Nothing changed since the config was read
+        keep_stored(
+            merged["on_call_schedule"],
+            stored.get("on_call_schedule", {}),
+            "current_index",
+            "on_call_schedule.current_index",
+        )
+        # Normalized like new_data, so equal timestamps compare equal.
+        stored_rotations = {
+            rotation["id"]: Rotation(**rotation).model_dump(mode='json')
+            for rotation in stored.get("rotations", [])
+        }
+        for rotation in merged["rotations"]:
+            stored_rotation = stored_rotations.get(rotation["id"])
+            if stored_rotation is not None:
+                for field in ("current_index", "last_advanced_at"):
+                    path = f"rotations[{rotation['id']}].{field}"
+                    keep_stored(rotation, stored_rotation, field, path)
+        return merged
+
+    saved = config_backend.update_config(merge)
+    if replaced:
+        logger.warning(
+            "Config changed since it was read; kept the stored %s.", ", ".join(replaced)
+        )
+    config.on_call_schedule.current_index = saved["on_call_schedule"]["current_index"]
+    config.rotations = [Rotation(**rotation) for rotation in saved["rotations"]]
     _app_config_instance = config # Update the in-memory instance
+    _app_config_generation = config_backend.generation
+    return replaced
+
+def advance_on_call_rotation(expected_index: int, next_index: int):
+    """
+    Persists only the on-call rotation position, with compare-and-swap.
+    The index moves to ``next_index`` only if it is still ``expected_index``,
+    so a concurrent or repeated trigger can never advance the rotation twice.
+    Unlike save_app_config this never re-serializes the full AppConfig.
+    """
+    global _app_config_instance, _app_config_generation
+    config_backend = get_config_backend()
+
+    def advance(stored: dict):
+        schedule = stored.setdefault("on_call_schedule", {})
+        if schedule.get("current_index", 0) == expected_index:
+            schedule["current_index"] = next_index
+
+    config_backend.update_config(advance)
+    # Re-parse lazily from the (already cached) stored copy on next access.
+    _app_config_instance = None
+    _app_config_generation = None
+
+def advance_rotations(
+    advances: dict[str, tuple[int, int]], advanced_at: dict[str, datetime.datetime]
+) -> list[str]:
+    """
+    Persists new positions for several rotations in one compare-and-swap write.
+    ``advances`` maps rotation IDs to ``(expected_index, next_index)``; like
+    advance_on_call_rotation, a rotation only moves if it is still at its
+    expected index. ``advanced_at`` maps the same IDs to the handover times
+    to record. Returns the IDs of the rotations that were advanced.
+    """
+    global _app_config_instance, _app_config_generation
+    config_backend = get_config_backend()
+    advanced: list[str] = []
+
+    def advance(stored: dict):
+        advanced.clear() # The mutator is re-run on conflicts
+        for rotation in stored.get("rotations", []):
+            move = advances.get(rotation.get("id"))
+            if move and rotation.get("current_index", 0) == move[0]:
+                rotation["current_index"] = move[1]
+                rotation["last_advanced_at"] = advanced_at[rotation["id"]].isoformat()
+                advanced.append(rotation["id"])
+
+    config_backend.update_config(advance)
+    _app_config_instance = None
+    _app_config_generation = None
+    return advanced
@@ -1,21 +1,137 @@
+import asyncio
 import base64
+import logging
 import os
+from collections.abc import AsyncIterator
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlsplit
 
-import requests
-from requests.exceptions import HTTPError
+from .resilience import call_timeout, get_upstream
+from .telemetry import track_upstream
+from .tracing import current_span, trace_headers
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Shared, keep-alive connection pool for all Confluence calls in this process.
+# httpx clients are bound to the event loop they were first used on, so the
+# pool is recreated if the running loop changes (e.g. between test clients),
+# closing the superseded one on its own loop where that is still possible.
+_http_client: "httpx.AsyncClient | None" = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+# Base URLs whose servers rejected a CQL search, so later searches skip
+# straight to the caller's fallback instead of failing again.
+_cql_unsupported: set[str] = set()
+# Statuses meaning the server has no CQL search endpoint. A 400 only rejects
+# the one query (e.g. a title CQL cannot parse), so it is not remembered.
+_CQL_UNSUPPORTED_STATUSES = {404, 405, 501}
+# Only reads are retried; a retried copy or create could make a duplicate page.
+_IDEMPOTENT_METHODS = {"GET", "HEAD"}
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed Confluence call says the server or network is degraded."""
+    import httpx
+
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def _timeouts() -> tuple[float, float]:
+    return (
+        float(os.getenv("CONFLUENCE_CONNECT_TIMEOUT", "5")),
+        float(os.getenv("CONFLUENCE_READ_TIMEOUT", "30")),
+    )
+
+
+def _cql_string(value: str) -> str:
+    """Quotes a value as a CQL string literal."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _build_http_client() -> "httpx.AsyncClient":
+    """Builds the pooled async HTTP client from environment settings."""
+    import httpx  # Deferred so importing the app stays fast
+
+    pool_size = int(os.getenv("CONFLUENCE_POOL_SIZE", "20"))
+    http2 = os.getenv("CONFLUENCE_HTTP2", "true").lower() != "false"
+    verify = os.getenv("REQUESTS_VERIFY", "true").lower() != "false"
+    connect_timeout, read_timeout = _timeouts()
+    return httpx.AsyncClient(
+        http2=http2,
+        verify=verify,
+        timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        limits=httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        ),
+    )
+
+
+def _discard_http_client(
+    client: "httpx.AsyncClient", loop: asyncio.AbstractEventLoop
+) -> "asyncio.Future | None":
+    """
+    Closes a pooled client bound to another event loop.
+    The close has to run on the client's own loop, so it is handed over if
+    that loop is still running (returning the pending close); a client whose
+    loop has stopped cannot be closed cleanly and is logged instead.
+    """
+    if loop.is_running() and not loop.is_closed():
+        return asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
+    logger.warning(
+        "Dropping a Confluence HTTP client whose event loop has %s; "
+        "its pooled connections were not closed.",
+        "closed" if loop.is_closed() else "stopped",
+    )
+    return None
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """Returns the process-wide pooled HTTP client for the running event loop."""
+    global _http_client, _http_client_loop
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        if _http_client is not None:
+            _discard_http_client(_http_client, _http_client_loop)
+        _http_client = _build_http_client()
+        _http_client_loop = loop
+    return _http_client
+
+
+async def close_http_client():
+    """Closes the shared HTTP client, whichever loop it was created on."""
+    global _http_client, _http_client_loop
+    client, loop = _http_client, _http_client_loop
+    _http_client = None
+    _http_client_loop = None
+    if client is None:
+        return
+    if loop is asyncio.get_running_loop():
+        await client.aclose()
+    else:
+        closing = _discard_http_client(client, loop)
+        if closing is not None:
+            await closing
 
 
 class ConfluenceClient:
-    """A client for interacting with the Confluence API."""
+    """An async client for interacting with the Confluence API."""
 
-    def __init__(self):
+    def __init__(self, space_key: str | None = None):
         domain = os.getenv("CONFLUENCE_DOMAIN")
         if not domain:
             raise ValueError("CONFLUENCE_DOMAIN environment variable not set.")
-        self.base_url = f"https://{domain}/wiki/rest/api"
+        # A scheme may be given explicitly, e.g. for a local stub server.
+        if not domain.startswith(("http://", "https://")):
+            domain = f"https://{domain}"
+        self.base_url = f"{domain}/wiki/rest/api"
         self.username = os.getenv("CONFLUENCE_USERNAME")
         self.api_token = os.getenv("CONFLUENCE_API_TOKEN")
-        self.space_key = os.getenv("CONFLUENCE_SPACE_KEY")
+        self.space_key = space_key or os.getenv("CONFLUENCE_SPACE_KEY")
         if not self.username:
             raise ValueError("CONFLUENCE_USERNAME environment variable not set.")
         if not self.api_token:
@@ -35,71 +151,184 @@ class ConfluenceClient:
         # This is insecure and should not be used in production.
         self.verify = os.getenv("REQUESTS_VERIFY", "true").lower() != "false"
         if not self.verify:
-            print(
-                "\n"
-                "!!! WARNING: SSL verification is DISABLED for ConfluenceClient. !!!\n"
-                "This is insecure and should only be used for local development.\n"
-                "Do not use this setting in production.\n"
+            logger.warning(
+                "SSL verification is DISABLED for ConfluenceClient. This is insecure "
+                "and should only be used for local development, not in production."
             )
 
-    def get_page_by_title(self, title: str) -> dict | None:
+    async def _request(
+        self, method: str, path: str, operation: str, **kwargs
+    ) -> "httpx.Response":
+        """
+        Sends a request over the shared pool and raises on HTTP errors.
+        Calls go through the Confluence circuit breaker, and their timeouts
+        are capped by the job's deadline. Reads are retried on transient
+        failures; writes are not.
+        """
+        import httpx
+
+        async def attempt() -> "httpx.Response":
+            connect_timeout, read_timeout = _timeouts()
+            timeout = httpx.Timeout(
+                call_timeout(read_timeout), connect=call_timeout(connect_timeout)
+            )
+            with track_upstream("confluence", operation):
+                response = await get_http_client().request(
+                    method,
+                    f"{self.base_url}{path}",
+                    headers={**self.headers, **trace_headers()},
+                    timeout=timeout,
+                    **kwargs,
+                )
+                span = current_span()
+                if span is not None:
+                    span.set_attribute("http.response.status_code", response.status_code)
+                try:
+                    response.raise_for_status()
+                except httpx.HTTPStatusError as e:
+                    logger.error(
+                        "Error in %s: %s", operation, e.response.text,
+                        extra={
+                            "upstream": "confluence",
+                            "operation": operation,
+                            "status_code": e.response.status_code,
+                        },
+                    )
+                    raise
+            return response
+
+        return await get_upstream("confluence").acall(
+            attempt, idempotent=method in _IDEMPOTENT_METHODS, is_transient=_is_transient
+        )
+
+    async def get_page_by_title(self, title: str) -> dict | None:
         """Gets a page by title."""
-        url = f"{self.base_url}/content"
         params = {"spaceKey": self.space_key, "title": title}
-        response = requests.get(url, headers=self.headers, params=params, verify=self.verify)
-        try:
-            response.raise_for_status()
-        except HTTPError as e:
-            print(f"Error getting page by title: {e.response.text}")
-            raise
+        response = await self._request(
+            "GET", "/content", "get_page_by_title", params=params
+        )
         results = response.json().get("results")
         if results:
             return results[0]
         return None
 
-    def get_child_pages(self, page_id: str) -> list:
-        """Gets the child pages of a given page."""
-        url = f"{self.base_url}/content/{page_id}/child/page"
-        response = requests.get(url, headers=self.headers, verify=self.verify)
+    async def search_pages(
+        self,
+        ancestor: str | None = None,
+        title: str | None = None,
+        order_by: str | None = "created DESC",
+        limit: int = 25,
+    ) -> list[dict] | None:
+        """
+        Searches the space's pages with CQL, in a single request.
+        ``ancestor`` restricts the search to pages below a page, ``title`` is a
+        CQL title pattern (e.g. "週報*") and ``order_by`` a CQL ordering.
+        Returns None if the server does not support CQL search or rejects
+        this query, so the caller falls back to its non-CQL lookup.
+        """
+        import httpx
+
+        if self.base_url in _cql_unsupported:
+            return None
+        clauses = ["type = page", f"space = {_cql_string(self.space_key)}"]
+        if ancestor:
+            ancestor = str(ancestor)
+            clauses.append(f"ancestor = {ancestor if ancestor.isdigit() else _cql_string(ancestor)}")
+        if title:
+            clauses.append(f"title ~ {_cql_string(title)}")
+        cql = " AND ".join(clauses)
+        if order_by:
+            cql += f" ORDER BY {order_by}"
         try:
-            response.raise_for_status()
-        except HTTPError as e:
-            print(f"Error getting child pages: {e.response.text}")
+            response = await self._request(
+                "GET",
+                "/content/search",
+                "search_pages",
+                params={"cql": cql, "limit": limit},
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in _CQL_UNSUPPORTED_STATUSES:
+                _cql_unsupported.add(self.base_url)
+                return None
+            if e.response.status_code == 400:
+                logger.warning("Confluence rejected the CQL search %r; falling back.", cql)
+                return None
             raise
         return response.json().get("results", [])
 
-    def update_page(self, page_id: str, title: str, version: int) -> dict:
+    async def iter_child_pages(
+        self, page_id: str, limit: int = 100, orderby: str | None = None
+    ) -> AsyncIterator[dict]:
+        """
+        Streams the child pages of a given page, one result page at a time.
+        Follows ``_links.next`` until the server reports no further results, so
+        folders larger than one page are never truncated. ``orderby`` is passed
+        through for servers that support ordering child pages.
+        """
+        params = {"start": 0, "limit": limit}
+        if orderby:
+            params["orderby"] = orderby
+        while True:
+            response = await self._request(
+                "GET",
+                f"/content/{page_id}/child/page",
+                "get_child_pages",
+                params=params,
+            )
+            data = response.json()
+            results = data.get("results", [])
+            for page in results:
+                yield page
+            next_link = data.get("_links", {}).get("next")
+            if not next_link or not results:
+                return
+            # The next link carries the cursor (start/limit/cursor) in its query.
+            params = dict(parse_qsl(urlsplit(next_link).query))
+
+    async def get_child_pages(self, page_id: str) -> list:
+        """Gets all child pages of a given page."""
+        return [page async for page in self.iter_child_pages(page_id)]
+
+    async def update_page(self, page_id: str, title: str, version: int) -> dict:
         """Updates the title of a page."""
-        url = f"{self.base_url}/content/{page_id}"
         data = {
             "version": {"number": version},
             "title": title,
             "type": "page",
         }
-        response = requests.put(url, headers=self.headers, json=data, verify=self.verify)
-        try:
-            response.raise_for_status()
-        except HTTPError as e:
-            print(f"Error updating page: {e.response.text}")
-            raise
+        response = await self._request(
+            "PUT", f"/content/{page_id}", "update_page", json=data
+        )
         return response.json()
 
-    def get_page_content(self, page_id: str) -> dict:
-        """Gets the content of a Confluence page."""
-        url = f"{self.base_url}/content/{page_id}?expand=body.storage"
-        response = requests.get(url, headers=self.headers, verify=self.verify)
+    async def get_page(self, page_id: str, expand: str = "version") -> dict | None:
+        """Gets a page's metadata by ID, or None if it no longer exists."""
+        import httpx
+
         try:
-            response.raise_for_status()
-        except HTTPError as e:
-            print(f"Error getting page content: {e.response.text}")
+            response = await self._request(
+                "GET", f"/content/{page_id}", "get_page", params={"expand": expand}
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
             raise
         return response.json()
 
-    def create_page(
+    async def get_page_content(self, page_id: str) -> dict:
+        """Gets the content and version of a Confluence page."""
+        response = await self._request(
+            "GET",
+            f"/content/{page_id}",
+            "get_page_content",
+            params={"expand": "body.storage,version"},
+        )
+        return response.json()
+
+    async def create_page(
         self, space_key: str, parent_id: str, title: str, content: str
     ) -> dict:
         """Creates a new Confluence page."""
-        url = f"{self.base_url}/content/"
         data = {
             "type": "page",
             "title": title,
@@ -107,22 +336,23 @@ class ConfluenceClient:
             "ancestors": [{"id": parent_id}],
             "body": {"storage": {"value": content, "representation": "storage"}},
         }
-        response = requests.post(url, headers=self.headers, json=data, verify=self.verify)
-        try:
-            response.raise_for_status()
-        except HTTPError as e:
-            print(f"Error creating page: {e.response.text}")
-            raise
+        response = await self._request("POST", "/content/", "create_page", json=data)
         return response.json()
 
-    def copy_page(self, page_id: str, destination: dict) -> dict:
-        """Copies a Confluence page."""
-        url = f"{self.base_url}/content/{page_id}/copy"
-        print(f"DEBUG: copy_page request body (destination): {destination}") # Added print statement
-        response = requests.post(url, headers=self.headers, json=destination, verify=self.verify)
-        try:
-            response.raise_for_status()
-        except HTTPError as e:
-            print(f"Error copying page: {e.response.text}")
-            raise
+    async def copy_page(
+        self, page_id: str, destination: dict, title: str | None = None
+    ) -> dict:
+        """
+        Copies a Confluence page.
+        ``title`` is sent as ``pageTitle`` so the copy is created with its final
+        title in the same write; servers that ignore it keep the source's title.
+        """
+        if title:
+            destination = {**destination, "pageTitle": title}
+        logger.debug(
+            "copy_page request", extra={"page_id": page_id, "destination": destination}
+        )
+        response = await self._request(
+            "POST", f"/content/{page_id}/copy", "copy_page", json=destination
+        )
         return response.json()
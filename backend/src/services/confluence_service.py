@@ -1,75 +1,347 @@
+import asyncio
 import datetime
-import re
+import logging
+import os
+import time
+
+from ..models.config import OnCallPerson, OnCallSchedule
+from ..models.report_index import ReportIndexEntry
+from ..models.schedule import (
+    WeeklyReportResult,
+    WeeklyReportTarget,
+    WeeklyReportWeekResult,
+)
 from .confluence_client import ConfluenceClient
+from .oncall_calendar import get_on_call_calendar
+from .report_index import ReportIndex, get_report_index
+from .report_template import get_report_template_cache, render_template
+from .report_title import WeeklyReportTitle, parse_report_title
+from .resilience import deadline
+from .structured_logging import log_context
+from .tracing import start_span, traced
+
+logger = logging.getLogger(__name__)
+
+# Recently created pages compared when looking up the latest report by CQL.
+LATEST_REPORT_CANDIDATES = 25
 
 
 class ConfluenceService:
     """Service for interacting with Confluence."""
 
-    def __init__(self):
-        self.confluence_client = ConfluenceClient()
+    def __init__(
+        self,
+        space_key: str | None = None,
+        report_index: ReportIndex | None = None,
+        template_page_id: str | None = None,
+        on_call_schedule: OnCallSchedule | None = None,
+    ):
+        self.confluence_client = ConfluenceClient(space_key=space_key)
+        self.report_index = report_index or get_report_index()
+        # Template mode: new reports are created from this page's cached body
+        # instead of copying last week's report. The on-call schedule fills the
+        # template's on-call placeholders.
+        self.template_page_id = template_page_id or None
+        self.on_call_schedule = on_call_schedule
+        # The latest report is looked up with one CQL search unless disabled;
+        # an optional CQL title pattern (e.g. "週報") skips non-report pages.
+        self.use_cql = os.getenv("CONFLUENCE_USE_CQL", "true").lower() != "false"
+        self.report_title_pattern = os.getenv("CONFLUENCE_REPORT_TITLE_PATTERN") or None
 
-    def create_next_weekly_report(self) -> str:
+    @traced("confluence.create_next_weekly_report")
+    async def create_next_weekly_report(self) -> str:
         """
         Orchestrates the creation of the next weekly report.
-        1. Finds the root folder for the current year.
+        1. Finds the root folder for the current year, or the previous one
+           if the current year has no reports yet.
         2. Finds the latest weekly report under that root.
         3. Calculates the date for the next week's report.
         4. Handles year change by creating a new root folder if necessary.
-        5. Copies the latest report to the correct root folder.
-        6. Updates the title of the new report.
+        5. Copies the latest report to the correct root folder, with its new
+           title set in the same request (renamed afterwards only if the
+           server ignores it).
+        Steps 1 and 2 are answered from the report index when its entry for the
+        year is still valid, which skips the root lookup and the folder scan.
         """
         today = datetime.date.today()
-        root_page, _ = self._find_or_create_root_page(today.year)
-        if not root_page:
-            raise Exception(f"Could not find or create root folder for year {today.year}")
-
-        latest_report = self._find_latest_weekly_report(root_page["id"])
-        if not latest_report:
-            raise Exception(f"No weekly reports found under root page {root_page['title']}")
+        root_page, latest_report = await self._find_latest(today.year)
 
         new_title, next_monday = self._generate_next_week_title(latest_report["title"])
 
-        # Handle year change
+        # Handle year change; reports are filed under their Monday's year.
         destination_parent_id = root_page["id"]
-        if next_monday.year != today.year:
-            new_root_page, _ = self._find_or_create_root_page(next_monday.year)
+        new_root_page = None
+        if next_monday.year != parse_report_title(latest_report["title"]).start_date.year:
+            new_root_page, _ = await self._find_or_create_root_page(
+                next_monday.year
+            )
             if not new_root_page:
                 raise Exception(
                     f"Could not create root folder for new year {next_monday.year}"
                 )
             destination_parent_id = new_root_page["id"]
 
-        # Copy the page
-        copied_page = self.confluence_client.copy_page(
-            page_id=latest_report["id"],
+        try:
+            updated_page = await self._create_report(
+                latest_report, parse_report_title(new_title), destination_parent_id
+            )
+        except Exception:
+            # The cached latest report may be out of date; rescan next time.
+            if self.report_index:
+                await self.report_index.invalidate(
+                    self.confluence_client.space_key, today.year
+                )
+            raise
+
+        await self._update_report_index(
+            {today.year, next_monday.year},
+            new_root_page or root_page,
+            updated_page,
+            next_monday,
+        )
+        return updated_page["_links"]["webui"]
+
+    @traced("confluence.create_weekly_reports_range")
+    async def create_weekly_reports_range(
+        self,
+        weeks: int | None = None,
+        through: datetime.date | None = None,
+        max_concurrency: int = 4,
+    ) -> list[WeeklyReportWeekResult]:
+        """
+        Creates several weekly reports after the latest one in a single job.
+        Either the next ``weeks`` weeks are pre-created, or every missing week
+        up to the one containing ``through`` is backfilled. The latest report
+        is looked up once (in last year's folder if this year has none yet),
+        all titles are computed up front and the root folder of each further
+        year the planned weeks fall in is found or created once. The copies then run with at
+        most ``max_concurrency`` in flight; a failed week does not stop the
+        others. Results are in week order.
+        """
+        if (weeks is None) == (through is None):
+            raise ValueError("Exactly one of weeks and through must be given.")
+        today = datetime.date.today()
+        root_page, latest_report = await self._find_latest(today.year)
+
+        latest_title = parse_report_title(latest_report["title"])
+        if not latest_title:
+            raise ValueError("Could not parse date from latest report title.")
+        planned = []
+        next_title = latest_title.next_week()
+        while (len(planned) < weeks) if weeks is not None else (next_title.start_date <= through):
+            planned.append(next_title)
+            next_title = next_title.next_week()
+        if not planned:
+            return []
+
+        root_pages = {latest_title.start_date.year: root_page}
+        new_years = sorted({title.start_date.year for title in planned} - root_pages.keys())
+        for year, (page, _) in zip(
+            new_years,
+            await asyncio.gather(*(self._find_or_create_root_page(year) for year in new_years)),
+        ):
+            if not page:
+                raise Exception(f"Could not create root folder for new year {year}")
+            root_pages[year] = page
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def create_week(
+            title: WeeklyReportTitle,
+        ) -> tuple[WeeklyReportWeekResult, dict | None]:
+            async with semaphore:
+                try:
+                    page = await self._create_report(
+                        latest_report, title, root_pages[title.start_date.year]["id"]
+                    )
+                except Exception as e:
+                    logger.error(
+                        "Error creating weekly report %s: %s", title, e,
+                        extra={"report_title": str(title), "outcome": "failed"},
+                    )
+                    return WeeklyReportWeekResult(title=str(title), status="failed", error=str(e)), None
+                return (
+                    WeeklyReportWeekResult(
+                        title=str(title), status="created", url=page["_links"]["webui"]
+                    ),
+                    page,
+                )
+
+        outcomes = await asyncio.gather(*(create_week(title) for title in planned))
+
+        created = [(title, page) for title, (_, page) in zip(planned, outcomes) if page]
+        if created:
+            title, page = created[-1]
+            await self._update_report_index(
+                {today.year, title.start_date.year},
+                root_pages[title.start_date.year],
+                page,
+                title.start_date,
+            )
+        elif self.report_index:
+            # The cached latest report may be out of date; rescan next time.
+            await self.report_index.invalidate(self.confluence_client.space_key, today.year)
+        return [result for result, _ in outcomes]
+
+    @traced("confluence.find_latest")
+    async def _find_latest(self, year: int) -> tuple[dict, dict]:
+        """
+        Returns the latest report and the root folder it is filed under, from
+        the index or a scan. After a holiday or an outage the latest report can
+        still be in the previous year's folder, so that year is searched when
+        ``year`` has no reports. No root folder is created here.
+        """
+        for search_year in (year, year - 1):
+            root_page, latest_report = await self._lookup_report_index(search_year)
+            if latest_report:
+                return root_page, latest_report
+            root_page = await self.confluence_client.get_page_by_title(
+                self._root_page_title(search_year)
+            )
+            if root_page:
+                latest_report = await self._find_latest_weekly_report(root_page["id"])
+                if latest_report:
+                    return root_page, latest_report
+        raise Exception(
+            f"No weekly reports found under root pages "
+            f"{self._root_page_title(year)} or {self._root_page_title(year - 1)}"
+        )
+
+    @traced("confluence.create_report")
+    async def _create_report(
+        self, source_page: dict, title: WeeklyReportTitle, parent_id: str
+    ) -> dict:
+        """Creates a report from the template in template mode, or else as a copy of ``source_page``."""
+        if not self.template_page_id:
+            return await self._copy_report(source_page, str(title), parent_id)
+        template = await get_report_template_cache().get(
+            self.confluence_client, self.template_page_id
+        )
+        return await self.confluence_client.create_page(
+            space_key=self.confluence_client.space_key,
+            parent_id=parent_id,
+            title=str(title),
+            content=render_template(template, self._template_values(title)),
+        )
+
+    def _template_values(self, title: WeeklyReportTitle) -> dict[str, str]:
+        """Returns the placeholder values for a report's template."""
+        on_call = self._on_call_for(title.start_date)
+        return {
+            "title": str(title),
+            "team": title.label,
+            "year": str(title.year),
+            "week": f"{title.week:02d}" if title.week is not None else "",
+            "start_date": title.start_date.isoformat(),
+            "end_date": title.end_date.isoformat(),
+            "date_range": f"{title.start_date:%m%d}-{title.end_date:%m%d}",
+            "on_call": on_call.name if on_call else "",
+            "on_call_slack_user_id": on_call.slack_user_id if on_call else "",
+        }
+
+    def _on_call_for(self, monday: datetime.date) -> OnCallPerson | None:
+        """
+        Returns who is on call in the week starting ``monday``, if known.
+        Without a calendar, ``current_index`` is taken as next week's person
+        and later (or earlier) weeks move along the roster from there.
+        """
+        schedule = self.on_call_schedule
+        if not schedule or not schedule.roster:
+            return None
+        if schedule.rotation_start is not None:
+            shift = get_on_call_calendar(schedule).at(
+                datetime.datetime.combine(monday, datetime.time(), datetime.timezone.utc)
+            )
+            if shift:
+                return shift.on_call
+        today = datetime.date.today()
+        next_monday = today + datetime.timedelta(days=7 - today.weekday())
+        weeks_ahead = (monday - next_monday).days // 7
+        return schedule.roster[(schedule.current_index + weeks_ahead) % len(schedule.roster)]
+
+    async def _copy_report(self, source_page: dict, title: str, parent_id: str) -> dict:
+        """
+        Copies a report under ``parent_id`` with its new title.
+        The title is set in the copy request itself, so one write and one page
+        version suffice. Only servers that ignore ``pageTitle`` need the
+        follow-up rename.
+        """
+        copied_page = await self.confluence_client.copy_page(
+            page_id=source_page["id"],
             destination={
                 "destination": {  # Corrected payload structure
                     "type": "parent_page",
-                    "value": destination_parent_id,
+                    "value": parent_id,
                 }
             },
+            title=title,
         )
-
-        # Update the title of the copied page
-        updated_page = self.confluence_client.update_page(
+        if copied_page.get("title") == title:
+            return copied_page
+        return await self.confluence_client.update_page(
             page_id=copied_page["id"],
-            title=new_title,
+            title=title,
             version=copied_page["version"]["number"] + 1,
         )
 
-        return updated_page["_links"]["webui"]
+    @traced("confluence.lookup_report_index")
+    async def _lookup_report_index(self, year: int) -> tuple[dict | None, dict | None]:
+        """
+        Returns the cached root page and latest report for a year if still valid.
+        The cached latest report is re-fetched by ID and is only trusted if it
+        still exists under the same title and the week after it has no report
+        yet, which another instance or a manual edit may have created. Both
+        checks are small requests, sent concurrently.
+        """
+        if not self.report_index:
+            return None, None
+        entry = await self.report_index.get(self.confluence_client.space_key, year)
+        if not entry:
+            return None, None
+        checks = [self.confluence_client.get_page(entry.latest_report_id)]
+        cached_title = parse_report_title(entry.latest_report_title)
+        if cached_title:
+            checks.append(self.confluence_client.get_page_by_title(str(cached_title.next_week())))
+        page, *newer_reports = await asyncio.gather(*checks)
+        if not page or page.get("title") != entry.latest_report_title or any(newer_reports):
+            await self.report_index.invalidate(self.confluence_client.space_key, year)
+            return None, None
+        root_page = {"id": entry.root_page_id, "title": entry.root_page_title}
+        return root_page, page
+
+    @traced("confluence.update_report_index")
+    async def _update_report_index(
+        self, years: set[int], root_page: dict, new_report: dict, next_monday: datetime.date
+    ):
+        """Records the newly created report as the latest for the given years."""
+        if not self.report_index:
+            return
+        entry = ReportIndexEntry(
+            root_page_id=root_page["id"],
+            root_page_title=root_page["title"],
+            latest_report_id=new_report["id"],
+            latest_report_title=new_report["title"],
+            latest_end_date=(next_monday + datetime.timedelta(days=4)).isoformat(),
+        )
+        await self.report_index.put(
+            self.confluence_client.space_key, {year: entry for year in years}
+        )
 
-    def _find_or_create_root_page(self, year: int) -> tuple[dict, bool]:
+    @staticmethod
+    def _root_page_title(year: int) -> str:
+        return f"團隊週會 {year}"
+
+    @traced("confluence.find_or_create_root_page")
+    async def _find_or_create_root_page(self, year: int) -> tuple[dict, bool]:
         """Finds the root page for a given year, or creates it if it doesn't exist."""
-        title = f"團隊週會 {year}"
-        page = self.confluence_client.get_page_by_title(title)
+        title = self._root_page_title(year)
+        page = await self.confluence_client.get_page_by_title(title)
         if page:
             return page, True
 
         # If not found, create it.
         # This assumes we are creating it at the space root. A parent can be specified if needed.
-        new_page = self.confluence_client.create_page(
+        new_page = await self.confluence_client.create_page(
             space_key=self.confluence_client.space_key,
             parent_id=None,  # Or a configured parent ID for all yearly folders
             title=title,
@@ -77,16 +349,32 @@ class ConfluenceService:
         )
         return new_page, False
 
-    def _find_latest_weekly_report(self, parent_page_id: str) -> dict | None:
-        """Finds the latest weekly report under a given parent page."""
-        child_pages = self.confluence_client.get_child_pages(parent_page_id)
-        if not child_pages:
-            return None
+    @traced("confluence.find_latest_weekly_report")
+    async def _find_latest_weekly_report(self, parent_page_id: str) -> dict | None:
+        """
+        Finds the latest weekly report under a given parent page.
+        A CQL search for the most recently created pages below the parent
+        answers this in one request regardless of the folder's size. Reports
+        are not always created in week order (backfills, concurrent range
+        creation), so the candidates are compared by the week in their title.
+        If CQL is unavailable, or none of the candidates is a report, child
+        pages are streamed instead and only the running maximum is kept; the
+        scan never stops early, since no server-side order is the week order.
+        """
+        if self.use_cql:
+            pages = await self.confluence_client.search_pages(
+                ancestor=parent_page_id,
+                title=self.report_title_pattern,
+                limit=LATEST_REPORT_CANDIDATES,
+            )
+            latest_report = self._latest_by_title(pages or [])
+            if latest_report:
+                return latest_report
 
         latest_report = None
         latest_date = datetime.date.min
 
-        for page in child_pages:
+        async for page in self.confluence_client.iter_child_pages(parent_page_id):
             end_date = self._get_date_from_title(page["title"])
             if end_date and end_date > latest_date:
                 latest_date = end_date
@@ -94,62 +382,98 @@ class ConfluenceService:
 
         return latest_report
 
+    def _latest_by_title(self, pages: list[dict]) -> dict | None:
+        """Returns the page whose report title has the latest end date, if any."""
+        latest_report = None
+        latest_date = datetime.date.min
+        for page in pages:
+            end_date = self._get_date_from_title(page["title"])
+            if end_date and end_date > latest_date:
+                latest_date = end_date
+                latest_report = page
+        return latest_report
+
     def _get_date_from_title(self, title: str) -> datetime.date | None:
         """Extracts the end date from a report title."""
-        match = re.search(r"\((\d{4})-(\d{4})\)", title)
-        if not match:
-            return None
+        parsed = parse_report_title(title)
+        return parsed.end_date if parsed else None
 
-        start_str, end_str = match.groups()
-        # We only care about the end date for sorting
-        end_month, end_day = int(end_str[:2]), int(end_str[2:])
+    def _generate_next_week_title(self, latest_title: str) -> tuple[str, datetime.date]:
+        """
+        Generates the title for the next week's report.
+        The team label is kept and the year, week and date range are replaced,
+        e.g. "2025 W52 技術部 RD4 團隊週報 (1222-1226)" is followed by
+        "2025 W01 技術部 RD4 團隊週報 (1229-0102)".
+        """
+        parsed = parse_report_title(latest_title)
+        if not parsed:
+            raise ValueError("Could not parse date from latest report title.")
 
-        # This is tricky because we don't know the year of the end date.
-        # We can infer it from the title, assuming format "YYYY W## ..."
-        year_match = re.search(r"^(\d{4})", title)
-        if not year_match:
-            return None
-        year = int(year_match.group(1))
+        next_title = parsed.next_week()
+        return str(next_title), next_title.start_date
 
-        # Handle year-end case where end_month is 1 and start_month is 12
-        if end_month == 1 and int(start_str[:2]) == 12:
-            year += 1
 
-        return datetime.date(year, end_month, end_day)
+async def create_weekly_reports(
+    targets: list[WeeklyReportTarget],
+    max_concurrency: int,
+    timeout_seconds: float,
+    template_page_id: str = "",
+    on_call_schedule: OnCallSchedule | None = None,
+) -> dict[str, WeeklyReportResult]:
+    """
+    Creates the next weekly report for many teams concurrently.
+    At most ``max_concurrency`` reports are in flight at once, and each team's
+    report creation is bounded by ``timeout_seconds``. A failure or timeout for
+    one team does not affect the others. Teams use their own template page,
+    else ``template_page_id``; all teams sharing a template render it from one
+    cached copy.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
 
-    def _generate_next_week_title(self, latest_title: str) -> tuple[str, datetime.date]:
-        """Generates the title for the next week's report."""
-        end_date = self._get_date_from_title(latest_title)
-        if not end_date:
-            raise ValueError("Could not parse date from latest report title.")
+    async def create_for_target(target: WeeklyReportTarget) -> WeeklyReportResult:
+        async with semaphore:
+            with log_context(team=target.team), start_span(
+                "confluence.team_weekly_report", attributes={"team": target.team}
+            ) as span:
+                started = time.perf_counter()
+                try:
+                    service = ConfluenceService(
+                        space_key=target.space_key,
+                        template_page_id=target.template_page_id or template_page_id,
+                        on_call_schedule=on_call_schedule,
+                    )
+                    with deadline(timeout_seconds):
+                        url = await asyncio.wait_for(
+                            service.create_next_weekly_report(), timeout=timeout_seconds
+                        )
+                    return WeeklyReportResult(
+                        status="created",
+                        url=url,
+                        duration_seconds=time.perf_counter() - started,
+                    )
+                except asyncio.TimeoutError as e:
+                    if span is not None:
+                        span.record_error(e)
+                    return WeeklyReportResult(
+                        status="timeout",
+                        error=f"Timed out after {timeout_seconds} seconds.",
+                        duration_seconds=time.perf_counter() - started,
+                    )
+                except Exception as e:
+                    logger.error(
+                        "Error creating weekly report for team %s: %s", target.team, e,
+                        extra={
+                            "outcome": "failed",
+                            "duration_ms": (time.perf_counter() - started) * 1000,
+                        },
+                    )
+                    if span is not None:
+                        span.record_error(e)
+                    return WeeklyReportResult(
+                        status="failed",
+                        error=str(e),
+                        duration_seconds=time.perf_counter() - started,
+                    )
 
-        next_monday = end_date + datetime.timedelta(days=1)
-        # Find the next Monday
-        while next_monday.weekday() != 0:
-            next_monday += datetime.timedelta(days=1)
-
-        next_friday = next_monday + datetime.timedelta(days=4)
-        
-        # Keep the original title structure, but replace the date part.
-        # Example: "2025 W1 技術部 RD4 團隊週報 (1229-0102)"
-        title_prefix = re.sub(r"\((\d{4})-(\d{4})\)", "", latest_title).strip()
-        
-        # Generate new year and week number for the title
-        year = next_monday.year
-        week_num = next_monday.isocalendar()[1]
-        
-        # Reconstruct prefix with new year and week number
-        # Assuming format "YYYY W## TEAM_NAME REPORT_TYPE"
-        parts = title_prefix.split(" ")
-        if len(parts) >= 4:
-            team_and_report = " ".join(parts[2:])
-            new_prefix = f"{year} W{week_num:02d} {team_and_report}"
-        else:
-            new_prefix = title_prefix # Fallback
-
-        start_str = next_monday.strftime("%m%d")
-        end_str = next_friday.strftime("%m%d")
-        
-        new_title = f"{new_prefix} ({start_str}-{end_str})"
-        
-        return new_title, next_monday
+    results = await asyncio.gather(*(create_for_target(t) for t in targets))
+    return {target.team: result for target, result in zip(targets, results)}
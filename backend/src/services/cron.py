@@ -0,0 +1,122 @@
+import datetime
+from bisect import bisect_left
+from functools import lru_cache
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_MONTH_NAMES = {
+    name: number
+    for number, name in enumerate(
+        ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"],
+        start=1,
+    )
+}
+_WEEKDAY_NAMES = {
+    name: number
+    for number, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])
+}
+# Upper bound on the days scanned for a match; the rarest valid expression
+# (Feb 29 on a given weekday) recurs well within this.
+_MAX_DAYS = 366 * 30
+
+
+def _parse_value(value: str, names: dict[str, int]) -> int:
+    return names[value.lower()] if value.lower() in names else int(value)
+
+
+def _parse_field(field: str, low: int, high: int, names: dict[str, int] | None = None) -> tuple[int, ...]:
+    """Expands one cron field (lists, ranges, steps and names) into sorted values."""
+    names = names or {}
+    values = set()
+    for item in field.split(","):
+        expression, _, step_text = item.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"Invalid step in cron field: {field}")
+        if expression == "*":
+            start, end = low, high
+        elif "-" in expression:
+            start_text, end_text = expression.split("-", 1)
+            start, end = _parse_value(start_text, names), _parse_value(end_text, names)
+        else:
+            start = _parse_value(expression, names)
+            end = high if step_text else start
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field out of range ({low}-{high}): {field}")
+        values.update(range(start, end + 1, step))
+    return tuple(sorted(values))
+
+
+class CronSchedule:
+    """
+    A standard five-field cron expression compiled for fast next-fire lookups.
+    Each field is expanded once into sorted values, so finding the next fire
+    time is a few set checks per day and a binary search within a day. As in
+    cron, when both day-of-month and day-of-week are restricted a day
+    matches if either does. Times are computed in ``timezone``.
+    """
+
+    def __init__(self, expression: str, timezone: datetime.tzinfo = datetime.timezone.utc):
+        self.expression = expression
+        self.timezone = timezone
+        fields = _MACROS.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression}")
+        minute, hour, day, month, weekday = fields
+        self.minutes = _parse_field(minute, 0, 59)
+        self.hours = _parse_field(hour, 0, 23)
+        self.days = frozenset(_parse_field(day, 1, 31))
+        self.months = frozenset(_parse_field(month, 1, 12, _MONTH_NAMES))
+        # Both 0 and 7 mean Sunday.
+        self.weekdays = frozenset(
+            value % 7 for value in _parse_field(weekday, 0, 7, _WEEKDAY_NAMES)
+        )
+        self._any_day = day.startswith("*")
+        self._any_weekday = weekday.startswith("*")
+
+    def _day_matches(self, date: datetime.date) -> bool:
+        if date.month not in self.months:
+            return False
+        day_match = date.day in self.days
+        weekday_match = (date.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_match and weekday_match
+        return day_match or weekday_match
+
+    def next_fire(self, after: datetime.datetime) -> datetime.datetime:
+        """Returns the first fire time strictly after ``after``."""
+        local = after.astimezone(self.timezone).replace(tzinfo=None)
+        local = local.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        date = local.date()
+        hour, minute = local.hour, local.minute
+        for _ in range(_MAX_DAYS):
+            if self._day_matches(date):
+                hour_index = bisect_left(self.hours, hour)
+                while hour_index < len(self.hours):
+                    fire_hour = self.hours[hour_index]
+                    start_minute = minute if fire_hour == hour else 0
+                    minute_index = bisect_left(self.minutes, start_minute)
+                    if minute_index < len(self.minutes):
+                        fire = datetime.datetime.combine(
+                            date, datetime.time(fire_hour, self.minutes[minute_index])
+                        )
+                        return fire.replace(tzinfo=self.timezone)
+                    hour_index += 1
+            date += datetime.timedelta(days=1)
+            hour, minute = 0, 0
+        raise ValueError(f"Cron expression never fires: {self.expression}")
+
+
+@lru_cache(maxsize=128)
+def compile_cron(expression: str, timezone_name: str = "UTC") -> CronSchedule:
+    """Returns a compiled, shared CronSchedule for an expression and IANA time zone."""
+    from zoneinfo import ZoneInfo
+
+    return CronSchedule(expression, ZoneInfo(timezone_name))
@@ -0,0 +1,75 @@
+import fcntl
+import json
+import os
+import threading
+
+from .config_backend import ConfigBackend, ConfigConflictError
+
+
+class FileConfigBackend(ConfigBackend):
+    """
+    Stores the config file and sibling documents as JSON files on local disk.
+    Writes go to a temporary file that is atomically renamed into place, so a
+    reader never sees a partial document. A document's generation is derived
+    from its inode and modification time, both of which change on every
+    rename, so revalidating the cache costs a single ``stat`` call. Parsed
+    documents are cached in memory and only re-read when that changes.
+    Conditional writes are serialized across processes with an advisory lock.
+    """
+
+    upstream = "file"
+
+    def __init__(self, config_path: str, cache_ttl_seconds: float = 0.0):
+        super().__init__(os.path.basename(config_path), cache_ttl_seconds)
+        self.directory = os.path.dirname(os.path.abspath(config_path))
+        self._documents: dict[str, tuple[int, dict]] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    @staticmethod
+    def _generation(stat: os.stat_result) -> int:
+        return (stat.st_ino << 64) | stat.st_mtime_ns
+
+    def get_generation(self, name: str) -> int | None:
+        try:
+            return self._generation(os.stat(self._path(name)))
+        except FileNotFoundError:
+            return None
+
+    def read_document(self, name: str) -> tuple[dict | None, int | None]:
+        try:
+            f = open(self._path(name), encoding="utf-8")
+        except FileNotFoundError:
+            return None, None
+        with f:
+            # Stamp the file actually opened, even if it is replaced meanwhile.
+            generation = self._generation(os.fstat(f.fileno()))
+            cached = self._documents.get(name)
+            if cached and cached[0] == generation:
+                return cached[1], generation
+            data = json.load(f)
+        self._documents[name] = (generation, data)
+        return data, generation
+
+    def write_document(
+        self, name: str, data: dict, if_generation_match: int | None = None
+    ) -> int | None:
+        path = self._path(name)
+        with self._lock, open(f"{path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            current = self.get_generation(name)
+            if if_generation_match is not None and (current or 0) != if_generation_match:
+                raise ConfigConflictError(
+                    f"{name} changed since generation {if_generation_match}."
+                )
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            generation = self.get_generation(name)
+        self._documents[name] = (generation, data)
+        return generation
@@ -1,34 +1,115 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
+from google.api_core.exceptions import (
+    NotFound,
+    PreconditionFailed,
+    ServerError,
+    TooManyRequests,
+)
 from google.cloud import storage
 
+from .config_backend import ConfigBackend, ConfigConflictError
+from .resilience import call_timeout, get_upstream
 
-class GCSConfigService:
-    def __init__(self, bucket_name: str, config_file_path: str):
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed GCS call says the service or network is degraded."""
+    # requests' connection errors and timeouts are OSErrors.
+    return isinstance(error, (ServerError, TooManyRequests, OSError, TimeoutError))
+
+
+class GCSConfigService(ConfigBackend):
+    """
+    Stores the config file and sibling documents as objects in a GCS bucket.
+    Object generations back the config cache and compare-and-swap writes: a
+    metadata-only reload revalidates the cache, and conditional uploads use
+    ``if_generation_match``. Calls run on several threads at once, so each
+    uses its own Blob and reads the generation from the response it made.
+    """
+
+    upstream = "gcs"
+
+    def __init__(self, bucket_name: str, config_file_path: str, cache_ttl_seconds: float = 0.0):
+        super().__init__(config_file_path, cache_ttl_seconds)
         self.bucket_name = bucket_name
         self.config_file_path = config_file_path
         self.client = storage.Client()
         self.bucket = self.client.bucket(self.bucket_name)
-        self.blob = self.bucket.blob(self.config_file_path)
+        self.connect_timeout = float(os.getenv("GCS_CONNECT_TIMEOUT", "5"))
+        self.read_timeout = float(os.getenv("GCS_READ_TIMEOUT", "30"))
+
+    def _blob(self, name: str):
+        # Blob objects hold the properties of their last response, so they are
+        # never shared between calls.
+        return self.bucket.blob(name)
 
-    def load_config(self) -> dict:
-        """Loads the configuration from GCS."""
+    def _call(self, fn, idempotent: bool):
+        """
+        Runs a GCS request through the GCS circuit breaker with deadline-capped
+        timeouts. The client library's own retries are disabled so reads are
+        retried only within the job's deadline, and writes not at all.
+        """
+        return get_upstream("gcs").call(
+            lambda: fn(
+                timeout=(call_timeout(self.connect_timeout), call_timeout(self.read_timeout)),
+                retry=None,
+            ),
+            idempotent=idempotent,
+            is_transient=_is_transient,
+        )
+
+    def get_generation(self, name: str) -> int | None:
+        blob = self._blob(name)
+        try:
+            self._call(blob.reload, idempotent=True) # Metadata-only request
+        except NotFound:
+            return None
+        return blob.generation
+
+    def read_document(self, name: str) -> tuple[dict | None, int | None]:
+        blob = self._blob(name)
         try:
-            content = self.blob.download_as_text()
-            return json.loads(content)
-        except Exception as e:
-            # Handle cases where the file doesn't exist yet or other GCS errors
-            print(f"Error loading config from GCS: {e}")
-            return {} # Return empty config for now, will be initialized by Admin UI
-
-    def save_config(self, config: dict):
-        """Saves the configuration to GCS."""
+            content = self._call(blob.download_as_text, idempotent=True)
+        except NotFound:
+            return None, None
+        return json.loads(content), blob.generation
+
+    def write_document(
+        self, name: str, data: dict, if_generation_match: int | None = None
+    ) -> int | None:
+        blob = self._blob(name)
+        kwargs = {}
+        if if_generation_match is not None:
+            kwargs["if_generation_match"] = if_generation_match
         try:
-            self.blob.upload_from_string(json.dumps(config, indent=2), content_type="application/json")
-        except Exception as e:
-            print(f"Error saving config to GCS: {e}")
-            raise # Re-raise to indicate save failure
+            self._call(
+                lambda **options: blob.upload_from_string(
+                    json.dumps(data, indent=2),
+                    content_type="application/json",
+                    **kwargs,
+                    **options,
+                ),
+                idempotent=False,
+            )
+        except PreconditionFailed as e:
+            raise ConfigConflictError(
+                f"{name} changed since generation {if_generation_match}."
+            ) from e
+        return blob.generation
+
+    def read_documents(self, names: list[str]) -> dict[str, tuple[dict | None, int | None]]:
+        # GCS has no multi-object download, so fetch the objects concurrently.
+        with ThreadPoolExecutor(max_workers=max(1, len(names))) as pool:
+            return dict(zip(names, pool.map(self.read_document, names)))
+
+    def write_documents(self, documents: dict[str, dict]) -> dict[str, int | None]:
+        with ThreadPoolExecutor(max_workers=max(1, len(documents))) as pool:
+            generations = pool.map(
+                lambda item: self.write_document(*item), documents.items()
+            )
+            return dict(zip(documents, generations))
 
 _gcs_config_service = None
 
@@ -39,5 +120,6 @@ def get_gcs_config_service() -> GCSConfigService:
         config_file_path = os.getenv("GCS_CONFIG_FILE_PATH", "config.json")
         if not bucket_name:
             raise ValueError("GCS_BUCKET_NAME environment variable not set.")
-        _gcs_config_service = GCSConfigService(bucket_name, config_file_path)
+        cache_ttl_seconds = float(os.getenv("CONFIG_CACHE_TTL_SECONDS", "0"))
+        _gcs_config_service = GCSConfigService(bucket_name, config_file_path, cache_ttl_seconds)
     return _gcs_config_service
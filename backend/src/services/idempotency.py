@@ -0,0 +1,202 @@
+import asyncio
+import datetime
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from pydantic import BaseModel
+
+from .config_backend import ConfigConflictError
+
+logger = logging.getLogger(__name__)
+
+
+def derive_idempotency_key(job_type: str, payload: str = "") -> str:
+    """
+    Builds the default key for a scheduled trigger: the job type plus the
+    current ISO week, so at-least-once scheduler retries within a week
+    collapse onto one run. ``payload`` distinguishes requests whose body
+    changes what the run does (e.g. batch targets).
+    """
+    year, week, _ = datetime.date.today().isocalendar()
+    key = f"{job_type}:{year}-W{week:02d}"
+    if payload:
+        key += ":" + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    return key
+
+
+class NotRecorded:
+    """
+    Wraps a job's response so it is returned but not recorded, e.g. when the
+    job was disabled and did nothing: a retry should then run again rather
+    than replay the no-op for the rest of the key's lifetime.
+    """
+
+    def __init__(self, response):
+        self.response = response
+
+
+class ConfigBackendIdempotencyStore:
+    """Persists idempotency records as a document next to the config file."""
+
+    def __init__(self, document_name: str, max_attempts: int = 3):
+        self.document_name = document_name
+        self.max_attempts = max_attempts
+
+    def get(self, key: str) -> dict | None:
+        from .config_backend import get_config_backend
+
+        data, _ = get_config_backend().read_document(self.document_name)
+        record = (data or {}).get(key)
+        if record and record["expires_at"] > time.time():
+            return record
+        return None
+
+    def put(self, key: str, record: dict):
+        from .config_backend import get_config_backend
+
+        backend = get_config_backend()
+        for _ in range(self.max_attempts):
+            data, generation = backend.read_document(self.document_name)
+            now = time.time()
+            # Drop expired records while rewriting so the document stays small.
+            data = {k: v for k, v in (data or {}).items() if v["expires_at"] > now}
+            data[key] = record
+            try:
+                backend.write_document(self.document_name, data, generation or 0)
+                return
+            except ConfigConflictError:
+                continue
+        raise ConfigConflictError(f"Could not record idempotency key {key}.")
+
+
+class IdempotencyStore:
+    """
+    Deduplicates trigger runs by idempotency key.
+    Successful responses are kept for ``ttl_seconds`` in an in-memory LRU of
+    up to ``max_entries`` keys and, optionally, in a persistent store shared
+    with other instances. A duplicate request replays the stored response
+    without calling any upstream; a duplicate that arrives while the first
+    run is still in flight waits for it. Failed runs, and responses wrapped
+    in NotRecorded, are not recorded, so a retry after them runs again.
+    """
+
+    def __init__(self, ttl_seconds: float = 7 * 24 * 3600, max_entries: int = 1024, store=None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.store = store
+        self.replays = 0
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    def _get_local(self, key: str) -> dict | None:
+        with self._lock:
+            record = self._entries.get(key)
+            if record is None:
+                return None
+            if record["expires_at"] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return record
+
+    def _put_local(self, key: str, record: dict):
+        with self._lock:
+            self._entries[key] = record
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def _lookup(self, key: str) -> dict | None:
+        record = self._get_local(key)
+        if record is None and self.store is not None:
+            try:
+                record = await asyncio.to_thread(self.store.get, key)
+            except Exception as e:
+                logger.warning("Error reading idempotency store: %s", e)
+            if record is not None:
+                self._put_local(key, record)
+        return record
+
+    async def _record(self, key: str, response) -> dict:
+        record = {"response": response, "expires_at": time.time() + self.ttl_seconds}
+        self._put_local(key, record)
+        if self.store is not None:
+            try:
+                await asyncio.to_thread(self.store.put, key, record)
+            except Exception as e:
+                logger.warning("Error writing idempotency store: %s", e)
+        return record
+
+    async def run(self, key: str, fn: Callable[[], Awaitable]) -> tuple[object, bool]:
+        """
+        Runs ``fn`` once per key and returns ``(response, replayed)``.
+        Pydantic responses are stored and returned as JSON-compatible dicts.
+        """
+        record = await self._lookup(key)
+        if record is not None:
+            self.replays += 1
+            return record["response"], True
+
+        loop = asyncio.get_running_loop()
+        pending = self._in_flight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            self.replays += 1
+            return await asyncio.shield(pending), True
+
+        future = loop.create_future()
+        self._in_flight[key] = future
+        try:
+            response = await fn()
+            recorded = not isinstance(response, NotRecorded)
+            if not recorded:
+                response = response.response
+            if isinstance(response, BaseModel):
+                response = response.model_dump(mode="json")
+            if recorded:
+                await self._record(key, response)
+            future.set_result(response)
+            return response, False
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception() # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+
+_idempotency_store: IdempotencyStore | None = None
+
+def get_idempotency_store() -> IdempotencyStore:
+    """
+    Returns the process-wide idempotency store.
+    IDEMPOTENCY_BACKEND selects "memory" (default) or "config", which also
+    persists records as IDEMPOTENCY_DOCUMENT in the config backend so
+    retries landing on another instance are deduplicated too.
+    """
+    global _idempotency_store
+    if _idempotency_store is None:
+        backend = os.getenv("IDEMPOTENCY_BACKEND", "memory").lower()
+        if backend == "config":
+            store = ConfigBackendIdempotencyStore(
+                os.getenv("IDEMPOTENCY_DOCUMENT", "idempotency.json")
+            )
+        elif backend == "memory":
+            store = None
+        else:
+            raise ValueError(f"Unknown IDEMPOTENCY_BACKEND: {backend}")
+        _idempotency_store = IdempotencyStore(
+            ttl_seconds=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", str(7 * 24 * 3600))),
+            max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", "1024")),
+            store=store,
+        )
+    return _idempotency_store
@@ -0,0 +1,104 @@
+import asyncio
+import datetime
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from pydantic import BaseModel
+
+from ..models.job import Job
+from .structured_logging import log_context
+from .telemetry import collect_timings
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """
+    Runs jobs in the background on the event loop with bounded concurrency.
+    Submitted jobs start immediately as asyncio tasks but wait for one of
+    ``max_workers`` slots before doing any work. Finished jobs are kept for
+    status polling, up to ``max_jobs`` of the most recent ones.
+    """
+
+    def __init__(self, max_workers: int = 4, max_jobs: int = 1000):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def submit(self, job_type: str, fn: Callable[[], Awaitable]) -> Job:
+        """Enqueues ``fn`` as a job and returns it without waiting."""
+        job = Job(
+            id=uuid.uuid4().hex,
+            type=job_type,
+            created_at=datetime.datetime.now(datetime.timezone.utc),
+        )
+        self._jobs[job.id] = job
+        self._evict_finished()
+        task = asyncio.get_running_loop().create_task(self._run(job, fn))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Returns a job by ID, if it is still known."""
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: Job, fn: Callable[[], Awaitable]):
+        async with self._get_semaphore():
+            job.status = "running"
+            job.started_at = datetime.datetime.now(datetime.timezone.utc)
+            with collect_timings() as timings, log_context(job_id=job.id, job_type=job.type):
+                try:
+                    result = await fn()
+                    if isinstance(result, BaseModel):
+                        result = result.model_dump(mode="json")
+                    job.result = result
+                    job.status = "succeeded"
+                except Exception as e:
+                    # HTTPExceptions raised by route logic carry their message in detail.
+                    job.error = str(getattr(e, "detail", None) or e)
+                    job.status = "failed"
+                    logger.error("Job %s (%s) failed: %s", job.id, job.type, job.error)
+                finally:
+                    job.timings = list(timings)
+                    job.finished_at = datetime.datetime.now(datetime.timezone.utc)
+
+    def _evict_finished(self):
+        """Drops the oldest finished jobs once more than ``max_jobs`` are kept."""
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.finished_at][:excess]:
+            del self._jobs[job_id]
+
+    async def shutdown(self, timeout: float = 30.0):
+        """Waits for in-flight jobs to finish, up to ``timeout`` seconds."""
+        loop = asyncio.get_running_loop()
+        tasks = {task for task in self._tasks if task.get_loop() is loop}
+        if tasks:
+            await asyncio.wait(tasks, timeout=timeout)
+
+
+_job_runner: JobRunner | None = None
+
+def get_job_runner() -> JobRunner:
+    global _job_runner
+    if _job_runner is None:
+        _job_runner = JobRunner(
+            max_workers=int(os.getenv("JOB_RUNNER_MAX_WORKERS", "4")),
+            max_jobs=int(os.getenv("JOB_RUNNER_MAX_JOBS", "1000")),
+        )
+    return _job_runner
@@ -0,0 +1,254 @@
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+
+# Upper bounds, in seconds, of the latency histogram buckets. They span fast
+# cached routes through slow Confluence copies and whole weekly jobs.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (label name, label value) pairs and a sample value, as returned by collectors.
+Sample = tuple[tuple[tuple[str, str], ...], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs: Iterable[tuple[str, str]]) -> str:
+    body = ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs)
+    return f"{{{body}}}" if body else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Sharded:
+    """
+    Per-thread shards of metric cells, keyed by label values.
+    Each thread only ever writes to its own shard, so recording takes no
+    lock; the shards are summed when the metrics are scraped. The event
+    loop thread and each worker thread of asyncio.to_thread get one shard.
+    """
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...]):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards: list[dict[tuple[str, ...], list]] = []
+        self._shards_lock = threading.Lock() # Only taken on a thread's first record
+
+    def _shard(self) -> dict[tuple[str, ...], list]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _merged(self, size: int) -> dict[tuple[str, ...], list]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged: dict[tuple[str, ...], list] = {}
+        for shard in shards:
+            for labels, cell in list(shard.items()): # Copy: its thread may add labels meanwhile
+                total = merged.setdefault(labels, [0] * size)
+                for i, value in enumerate(cell):
+                    total[i] += value
+        return merged
+
+    def _labels(self, labels: tuple[str, ...], *extra: tuple[str, str]) -> str:
+        return _format_labels((*zip(self.labelnames, labels), *extra))
+
+
+class Counter(_Sharded):
+    """A monotonically increasing count, e.g. of finished jobs."""
+
+    def inc(self, *labels: str, amount: float = 1):
+        shard = self._shard()
+        cell = shard.get(labels)
+        if cell is None:
+            cell = shard[labels] = [0]
+        cell[0] += amount
+
+    def value(self, *labels: str) -> float:
+        return self._merged(1).get(labels, [0])[0]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        for labels, cell in sorted(self._merged(1).items()):
+            lines.append(f"{self.name}{self._labels(labels)} {_format_value(cell[0])}")
+        return lines
+
+
+class Histogram(_Sharded):
+    """
+    A latency distribution with fixed buckets.
+    Each cell holds the per-bucket counts (the last one for values above the
+    largest bound) followed by the sum of the observed values.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: tuple[str, ...],
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels: str):
+        shard = self._shard()
+        cell = shard.get(labels)
+        if cell is None:
+            cell = shard[labels] = [0] * (len(self.buckets) + 2)
+        cell[bisect_left(self.buckets, value)] += 1 # Bounds are inclusive ("le")
+        cell[-1] += value
+
+    def count(self, *labels: str) -> int:
+        cell = self._merged(len(self.buckets) + 2).get(labels)
+        return sum(cell[:-1]) if cell else 0
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        bounds = [*map(_format_value, self.buckets), "+Inf"]
+        for labels, cell in sorted(self._merged(len(self.buckets) + 2).items()):
+            cumulative = 0
+            for bound, count in zip(bounds, cell):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{self._labels(labels, ('le', bound))} {cumulative}"
+                )
+            lines.append(f"{self.name}_sum{self._labels(labels)} {_format_value(cell[-1])}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+        return lines
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+upstream_duration = Histogram(
+    "upstream_call_duration_seconds",
+    "Latency of calls to Confluence, Slack and the config store.",
+    ("upstream", "operation", "outcome"),
+)
+job_duration = Histogram(
+    "job_duration_seconds",
+    "Duration of scheduled jobs, inline or in the background.",
+    ("job_type", "outcome"),
+)
+jobs_total = Counter(
+    "jobs_total",
+    "Scheduled jobs by outcome: succeeded, failed or replayed.",
+    ("job_type", "outcome"),
+)
+
+
+def record_job(job_type: str, outcome: str, duration: float):
+    """Counts one finished job run and records its duration."""
+    jobs_total.inc(job_type, outcome)
+    job_duration.observe(duration, job_type, outcome)
+
+
+def _family(name: str, kind: str, description: str, samples: list[Sample]) -> list[str]:
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return lines
+
+
+def _collect_config_cache() -> list[str]:
+    from . import config_backend
+
+    backend = config_backend._config_backend
+    if backend is None: # Not loaded yet; scraping must not connect to GCS
+        return []
+    stats = backend.cache_stats()
+    labels = (("backend", backend.upstream),)
+    families = {
+        "hits": ("config_cache_hits_total", "counter", "Config loads served from the cache."),
+        "misses": ("config_cache_misses_total", "counter", "Config loads that read the store."),
+        "hit_ratio": ("config_cache_hit_ratio", "gauge", "Share of config loads from the cache."),
+    }
+    lines = []
+    for field, (name, kind, description) in families.items():
+        lines.extend(_family(name, kind, description, [(labels, stats[field])]))
+    return lines
+
+
+def _collect_slack_dispatcher() -> list[str]:
+    from . import slack_dispatcher
+
+    dispatcher = slack_dispatcher._slack_dispatcher
+    if dispatcher is None:
+        return []
+    stats = dispatcher.stats()
+    families = {
+        "calls": ("slack_dispatcher_calls_total", "counter", "Slack calls made."),
+        "rate_limited": ("slack_dispatcher_rate_limited_total", "counter", "Rate-limited calls."),
+        "queue_depth": ("slack_dispatcher_queue_depth", "gauge", "Calls waiting for a token."),
+        "wait_seconds_total": ("slack_dispatcher_wait_seconds_total", "counter", "Time spent waiting."),
+        "wait_seconds_max": ("slack_dispatcher_wait_seconds_max", "gauge", "Longest token wait."),
+    }
+    lines = []
+    for field, (name, kind, description) in families.items():
+        samples = [((("method", method),), values[field]) for method, values in sorted(stats.items())]
+        lines.extend(_family(name, kind, description, samples))
+    return lines
+
+
+def _collect_resilience() -> list[str]:
+    from .resilience import CircuitBreaker, resilience_stats
+
+    stats = sorted(resilience_stats().items())
+    if not stats:
+        return []
+    states = (CircuitBreaker.CLOSED, CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN)
+    lines = _family(
+        "upstream_circuit_state",
+        "gauge",
+        "1 for each upstream's current circuit breaker state.",
+        [
+            ((("upstream", upstream), ("state", state)), int(values["state"] == state))
+            for upstream, values in stats
+            for state in states
+        ],
+    )
+    families = {
+        "calls": ("upstream_attempts_total", "counter", "Attempts, including retries."),
+        "failures": ("upstream_failures_total", "counter", "Attempts that failed transiently."),
+        "retries": ("upstream_retries_total", "counter", "Attempts that were retried."),
+        "rejected": ("upstream_rejected_total", "counter", "Calls rejected by an open breaker."),
+    }
+    for field, (name, kind, description) in families.items():
+        samples = [((("upstream", upstream),), values[field]) for upstream, values in stats]
+        lines.extend(_family(name, kind, description, samples))
+    return lines
+
+
+_collectors: list[Callable[[], list[str]]] = [
+    request_duration.render,
+    upstream_duration.render,
+    job_duration.render,
+    jobs_total.render,
+    _collect_config_cache,
+    _collect_slack_dispatcher,
+    _collect_resilience,
+]
+
+def render_metrics() -> str:
+    """Renders every metric in the Prometheus text exposition format."""
+    lines = []
+    for collect in _collectors:
+        lines.extend(collect())
+    return "\n".join(lines) + "\n"
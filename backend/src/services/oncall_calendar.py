@@ -0,0 +1,153 @@
+import datetime
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+
+from ..models.config import OnCallPerson, OnCallSchedule
+from ..models.oncall import OnCallShift
+
+
+def _timestamp(value: datetime.datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc) # Naive times are UTC
+    return value.timestamp()
+
+
+def _datetime(timestamp: float) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+
+
+class OnCallCalendar:
+    """
+    Precomputed on-call shifts for a schedule, from ``rotation_start`` to ``until``.
+    Shifts are stored as parallel compact arrays: sorted start timestamps,
+    an index into a table of people, and an override flag. A shift ends
+    where the next one starts, and the last one ends at ``until``. Swaps are
+    applied to the roster shifts first, then overrides split and replace the
+    intervals they cover, so point and range queries are a binary search.
+    """
+
+    def __init__(self, schedule: OnCallSchedule, until: datetime.datetime):
+        self.until = _timestamp(until)
+        self._people: list[OnCallPerson] = []
+        self._person_ids: dict[str, int] = {}
+        self._starts = array("d")
+        self._who = array("I")
+        self._overridden = array("B")
+        if schedule.rotation_start is None or not schedule.roster:
+            return
+
+        start = _timestamp(schedule.rotation_start)
+        shift_seconds = schedule.shift_days * 86400
+        roster = [self._person_id(person) for person in schedule.roster]
+        shift = 0
+        while start + shift * shift_seconds < self.until:
+            self._starts.append(start + shift * shift_seconds)
+            self._who.append(roster[shift % len(roster)])
+            self._overridden.append(0)
+            shift += 1
+
+        for swap in schedule.swaps:
+            first = self._index_at(_timestamp(swap.first))
+            second = self._index_at(_timestamp(swap.second))
+            if first is not None and second is not None:
+                self._who[first], self._who[second] = self._who[second], self._who[first]
+
+        for override in schedule.overrides:
+            self._apply_override(
+                _timestamp(override.start),
+                _timestamp(override.end),
+                self._person_id(
+                    OnCallPerson(name=override.name, slack_user_id=override.slack_user_id)
+                ),
+            )
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def _person_id(self, person: OnCallPerson) -> int:
+        person_id = self._person_ids.get(person.slack_user_id)
+        if person_id is None:
+            person_id = len(self._people)
+            self._people.append(person)
+            self._person_ids[person.slack_user_id] = person_id
+        return person_id
+
+    def _index_at(self, timestamp: float) -> int | None:
+        index = bisect_right(self._starts, timestamp) - 1
+        if index < 0 or timestamp >= self.until:
+            return None
+        return index
+
+    def _split(self, timestamp: float):
+        """Makes ``timestamp`` a shift boundary if it falls inside a shift."""
+        index = self._index_at(timestamp)
+        if index is None or self._starts[index] == timestamp:
+            return
+        self._starts.insert(index + 1, timestamp)
+        self._who.insert(index + 1, self._who[index])
+        self._overridden.insert(index + 1, self._overridden[index])
+
+    def _apply_override(self, start: float, end: float, person_id: int):
+        if not self._starts:
+            return
+        start = max(start, self._starts[0])
+        end = min(end, self.until)
+        if start >= end:
+            return
+        self._split(start)
+        self._split(end)
+        # The whole window becomes one interval for the override's person.
+        first = bisect_left(self._starts, start)
+        last = bisect_left(self._starts, end)
+        self._who[first] = person_id
+        self._overridden[first] = 1
+        del self._starts[first + 1:last]
+        del self._who[first + 1:last]
+        del self._overridden[first + 1:last]
+
+    def _shift(self, index: int) -> OnCallShift:
+        end = self._starts[index + 1] if index + 1 < len(self._starts) else self.until
+        return OnCallShift(
+            start=_datetime(self._starts[index]),
+            end=_datetime(end),
+            on_call=self._people[self._who[index]],
+            override=bool(self._overridden[index]),
+        )
+
+    def at(self, when: datetime.datetime) -> OnCallShift | None:
+        """Returns the shift covering ``when``, or None outside the calendar."""
+        index = self._index_at(_timestamp(when))
+        return None if index is None else self._shift(index)
+
+    def between(self, start: datetime.datetime, end: datetime.datetime) -> list[OnCallShift]:
+        """Returns the shifts overlapping ``[start, end)``."""
+        start_ts, end_ts = _timestamp(start), min(_timestamp(end), self.until)
+        if start_ts >= end_ts:
+            return []
+        first = max(bisect_right(self._starts, start_ts) - 1, 0)
+        last = bisect_left(self._starts, end_ts)
+        return [self._shift(index) for index in range(first, last)]
+
+
+_calendar: OnCallCalendar | None = None
+_calendar_schedule: OnCallSchedule | None = None
+
+def get_on_call_calendar(schedule: OnCallSchedule) -> OnCallCalendar:
+    """
+    Returns the calendar for a schedule, covering ONCALL_CALENDAR_WEEKS_AHEAD
+    weeks (default 12) past now. It is rebuilt only when the schedule object
+    changes, which get_app_config limits to config changes, or when half of
+    the look-ahead has elapsed.
+    """
+    global _calendar, _calendar_schedule
+    weeks_ahead = int(os.getenv("ONCALL_CALENDAR_WEEKS_AHEAD", "12"))
+    now = datetime.datetime.now(datetime.timezone.utc)
+    if (
+        _calendar is None
+        or _calendar_schedule is not schedule
+        or _calendar.until < _timestamp(now + datetime.timedelta(weeks=weeks_ahead / 2))
+    ):
+        _calendar = OnCallCalendar(schedule, now + datetime.timedelta(weeks=weeks_ahead))
+        _calendar_schedule = schedule
+    return _calendar
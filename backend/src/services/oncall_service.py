@@ -1,12 +1,123 @@
-from ..models.config import OnCallConfig, OnCallPerson, OnCallSchedule
-from .slack_service import SlackService
+import asyncio
+import datetime
+import logging
+
+from ..models.config import OnCallConfig, OnCallPerson, OnCallSchedule, Rotation
+from ..models.schedule import RotationResult
+from .oncall_calendar import get_on_call_calendar
+from .slack_service import AsyncSlackService
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Absorbs scheduler jitter, so a weekly trigger that fires a little early still
+# hands over a weekly rotation.
+DUE_TOLERANCE = datetime.timedelta(hours=1)
+
+
+def current_on_call(rotation: Rotation) -> OnCallPerson | None:
+    """Returns the person on call in a rotation, or None if its roster is empty."""
+    if not rotation.roster:
+        return None
+    index = rotation.current_index
+    if index >= len(rotation.roster):
+        index = 0 # Reset if index is out of bounds, like the single schedule
+    return rotation.roster[index]
+
+
+def next_rotation_index(rotation: Rotation) -> int:
+    """Returns the roster position after the current on-call person."""
+    index = rotation.current_index if rotation.current_index < len(rotation.roster) else 0
+    return (index + 1) % len(rotation.roster)
+
+
+def _last_handover(rotation: Rotation) -> datetime.datetime | None:
+    last_advanced_at = rotation.last_advanced_at
+    if last_advanced_at is not None and last_advanced_at.tzinfo is None:
+        last_advanced_at = last_advanced_at.replace(tzinfo=datetime.timezone.utc)
+    return last_advanced_at
+
+
+def is_rotation_due(rotation: Rotation, now: datetime.datetime) -> bool:
+    """Checks whether a rotation's cadence has elapsed since its last handover."""
+    if not rotation.enabled or not rotation.roster:
+        return False
+    last_advanced_at = _last_handover(rotation)
+    if last_advanced_at is None:
+        return True
+    cadence = datetime.timedelta(days=rotation.cadence_days)
+    return now - last_advanced_at >= cadence - DUE_TOLERANCE
+
+
+def scheduled_handover_at(rotation: Rotation, now: datetime.datetime) -> datetime.datetime:
+    """
+    Returns the scheduled time of a handover that runs at ``now``: the last
+    handover plus whole cadences, skipping any that were missed. Recording
+    this rather than ``now`` keeps handovers anchored to the schedule, so a
+    run starting slightly late or early does not shift the following ones.
+    A rotation's first handover is anchored at ``now``.
+    """
+    last_advanced_at = _last_handover(rotation)
+    if last_advanced_at is None:
+        return now
+    cadence = datetime.timedelta(days=rotation.cadence_days)
+    periods = max(1, (now - last_advanced_at + DUE_TOLERANCE) // cadence)
+    return last_advanced_at + periods * cadence
+
+
+class RotationIndex:
+    """Looks up rotations by ID and by the Slack users on their rosters in O(1)."""
+
+    def __init__(self, rotations: list[Rotation]):
+        self.rotations = rotations
+        self.by_id = {rotation.id: rotation for rotation in rotations}
+        self.by_slack_user: dict[str, list[Rotation]] = {}
+        for rotation in rotations:
+            for slack_user_id in {person.slack_user_id for person in rotation.roster}:
+                self.by_slack_user.setdefault(slack_user_id, []).append(rotation)
+
+    def get(self, rotation_id: str) -> Rotation | None:
+        return self.by_id.get(rotation_id)
+
+    def for_slack_user(self, slack_user_id: str) -> list[Rotation]:
+        return self.by_slack_user.get(slack_user_id, [])
+
+
+_rotation_index: RotationIndex | None = None
+
+def get_rotation_index(rotations: list[Rotation]) -> RotationIndex:
+    """
+    Returns the index for a rotations list, rebuilding it only when the list
+    changes. get_app_config reuses its parsed config while the stored
+    generation is unchanged, so the index is built once per config version.
+    """
+    global _rotation_index
+    if _rotation_index is None or _rotation_index.rotations is not rotations:
+        _rotation_index = RotationIndex(rotations)
+    return _rotation_index
 
 
 class OnCallService:
-    def __init__(self):
-        self.slack_service = SlackService()
+    def __init__(self, slack_service: AsyncSlackService | None = None):
+        self.slack_service = slack_service or AsyncSlackService()
 
-    def notify_on_call_person(
+    async def _announce(self, channel: str, on_call_person: OnCallPerson):
+        """Sends the on-call notification and updates the channel description concurrently."""
+        message = f":uia_cat: 本週值班人員: <@{on_call_person.slack_user_id}>"
+        description = f":uia_cat: 本週值班人員: <@{on_call_person.slack_user_id}>"
+        await asyncio.gather(
+            self.slack_service.send_message(
+                channel=channel,
+                message=message
+            ),
+            self.slack_service.update_channel_description(
+                channel=channel,
+                description=description
+            ),
+        )
+
+    @traced("oncall.notify_on_call_person")
+    async def notify_on_call_person(
         self,
         on_call_config: OnCallConfig,
         on_call_schedule: OnCallSchedule
@@ -14,6 +125,9 @@ class OnCallService:
         """
         Determines the current on-call person, sends a Slack notification,
         updates the channel description, and advances the rotation.
+        With ``rotation_start`` set, the person comes from the on-call
+        calendar, so the page matches /api/oncall/at; otherwise it is the
+        roster entry at ``current_index``.
         """
         if not on_call_schedule.roster:
             raise ValueError("On-call roster is empty. Cannot notify anyone.")
@@ -23,23 +137,46 @@ class OnCallService:
             current_index = 0 # Reset if index is out of bounds
 
         on_call_person = on_call_schedule.roster[current_index]
+        if on_call_schedule.rotation_start is not None:
+            # Page whoever the calendar (overrides and swaps included) has on call now.
+            shift = get_on_call_calendar(on_call_schedule).at(
+                datetime.datetime.now(datetime.timezone.utc)
+            )
+            if shift is not None:
+                on_call_person = shift.on_call
 
-        # Send Slack notification
-        message = f":uia_cat: 本週值班人員: <@{on_call_person.slack_user_id}>"
-        self.slack_service.send_message(
-            channel=on_call_config.slack_channel,
-            message=message
-        )
-
-        # Update Slack channel description
-        description = f":uia_cat: 本週值班人員: <@{on_call_person.slack_user_id}>"
-        self.slack_service.update_channel_description(
-            channel=on_call_config.slack_channel,
-            description=description
-        )
+        await self._announce(on_call_config.slack_channel, on_call_person)
 
         # Advance rotation for next week
         next_index = (current_index + 1) % len(on_call_schedule.roster)
         on_call_schedule.current_index = next_index
 
         return on_call_person, on_call_schedule
+
+    @traced("oncall.notify_rotations")
+    async def notify_rotations(self, rotations: list[Rotation]) -> dict[str, RotationResult]:
+        """
+        Notifies the current person of every given rotation concurrently.
+        A failure in one rotation is reported in its result and does not stop
+        the others.
+        """
+        async def notify(rotation: Rotation) -> RotationResult:
+            on_call_person = current_on_call(rotation)
+            if on_call_person is None:
+                return RotationResult(status="failed", error="Rotation roster is empty.")
+            try:
+                await self._announce(rotation.slack_channel, on_call_person)
+            except Exception as e:
+                logger.error(
+                    "Error notifying on-call rotation %s: %s", rotation.id, e,
+                    extra={"rotation_id": rotation.id, "outcome": "failed"},
+                )
+                return RotationResult(status="failed", error=str(e))
+            return RotationResult(
+                status="notified",
+                on_call_name=on_call_person.name,
+                slack_user_id=on_call_person.slack_user_id,
+            )
+
+        results = await asyncio.gather(*(notify(rotation) for rotation in rotations))
+        return {rotation.id: result for rotation, result in zip(rotations, results)}
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+from ..models.report_index import ReportIndexEntry
+from .config_backend import ConfigConflictError
+
+logger = logging.getLogger(__name__)
+
+# Characters not kept when a space key becomes part of a document name.
+_UNSAFE_NAME_CHARS = re.compile(r"[^\w~-]")
+
+
+def _space_document(document_name: str, space_key: str) -> str:
+    """Names a space's index document, e.g. "report_index.RD4.json"."""
+    stem, ext = os.path.splitext(document_name)
+    return f"{stem}.{_UNSAFE_NAME_CHARS.sub('_', space_key)}{ext}"
+
+
+class LocalReportIndexStore:
+    """
+    Stores the report index as one JSON file per space on local disk, next to
+    ``path``. Reads and conditional writes go through the file config backend,
+    so the files have the same stat-based generations and cross-process write
+    lock.
+    """
+
+    def __init__(self, path: str):
+        from .file_config_backend import FileConfigBackend
+
+        self.path = path
+        self.document_name = os.path.basename(path)
+        self._files = FileConfigBackend(path)
+
+    def get_generation(self, space_key: str) -> int | None:
+        return self._files.get_generation(_space_document(self.document_name, space_key))
+
+    def load(self, space_key: str) -> tuple[dict, int | None]:
+        data, generation = self._files.read_document(
+            _space_document(self.document_name, space_key)
+        )
+        return data or {}, generation
+
+    def save(
+        self, space_key: str, data: dict, if_generation_match: int | None = None
+    ) -> int | None:
+        return self._files.write_document(
+            _space_document(self.document_name, space_key), data, if_generation_match
+        )
+
+
+class ConfigBackendReportIndexStore:
+    """Stores the report index as one document per space next to the config file."""
+
+    def __init__(self, document_name: str):
+        self.document_name = document_name
+
+    def get_generation(self, space_key: str) -> int | None:
+        from .config_backend import get_config_backend
+
+        return get_config_backend().get_generation(
+            _space_document(self.document_name, space_key)
+        )
+
+    def load(self, space_key: str) -> tuple[dict, int | None]:
+        from .config_backend import get_config_backend
+
+        data, generation = get_config_backend().read_document(
+            _space_document(self.document_name, space_key)
+        )
+        return data or {}, generation
+
+    def save(
+        self, space_key: str, data: dict, if_generation_match: int | None = None
+    ) -> int | None:
+        from .config_backend import get_config_backend
+
+        return get_config_backend().write_document(
+            _space_document(self.document_name, space_key), data, if_generation_match
+        )
+
+
+class ReportIndex:
+    """
+    A small persistent index of where each space's weekly reports live.
+    Maps ``space_key`` + year to the yearly root page and the latest report, so
+    a steady-state run can skip the root lookup and the child-page scan.
+    Each space has its own stored document, so a batch over many teams never
+    contends on one object. Several instances may share the stored index: a
+    space's document is reloaded when its generation changes, and changes are
+    written back with compare-and-swap, re-applied after a jittered backoff
+    on a conflict. The index is only a cache: load and save failures are
+    reported and ignored.
+    """
+
+    def __init__(self, store, max_attempts: int = 5):
+        self.store = store
+        self.max_attempts = max_attempts
+        # Space key -> (entries by year, generation they were read at).
+        self._spaces: dict[str, tuple[dict, int | None]] = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self, space_key: str) -> dict:
+        # A cheap generation check first; the document is only re-read if it changed.
+        generation = self.store.get_generation(space_key)
+        with self._lock:
+            cached = self._spaces.get(space_key)
+            if cached is not None and cached[1] == generation:
+                return cached[0]
+        entries, generation = self.store.load(space_key)
+        with self._lock:
+            self._spaces[space_key] = (entries, generation)
+        return entries
+
+    async def _ensure_loaded(self, space_key: str) -> dict:
+        try:
+            return await asyncio.to_thread(self._refresh, space_key)
+        except Exception as e:
+            logger.warning("Error loading report index for %s: %s", space_key, e)
+            return self._spaces.get(space_key, ({}, None))[0]
+
+    async def get(self, space_key: str, year: int) -> ReportIndexEntry | None:
+        """Returns the cached entry for a space and year, if any."""
+        entries = await self._ensure_loaded(space_key)
+        data = entries.get(str(year))
+        if not data:
+            return None
+        try:
+            return ReportIndexEntry(**data)
+        except Exception:
+            return None
+
+    async def put(self, space_key: str, entries: dict[int, ReportIndexEntry]):
+        """Records entries for a space, keyed by year, and persists the index."""
+
+        def apply(current: dict) -> bool:
+            for year, entry in entries.items():
+                current[str(year)] = entry.model_dump()
+            return True
+
+        await self._update(space_key, apply)
+
+    async def invalidate(self, space_key: str, year: int):
+        """Drops a stale entry so the next run falls back to a full scan."""
+        await self._update(
+            space_key, lambda current: current.pop(str(year), None) is not None
+        )
+
+    def _update_stored(self, space_key: str, apply):
+        """
+        Applies ``apply`` to the space's freshly read entries and writes them
+        back if it reports a change, only if no other writer got there first.
+        """
+        for attempt in range(self.max_attempts):
+            entries, generation = self.store.load(space_key)
+            entries = dict(entries)  # The store may cache the dict it returned
+            if not apply(entries):
+                break
+            try:
+                generation = self.store.save(
+                    space_key, entries, if_generation_match=generation or 0
+                )
+            except ConfigConflictError:
+                # Another instance wrote the document; re-apply on its version.
+                time.sleep(random.uniform(0, 0.05 * 2**attempt))
+                continue
+            break
+        else:
+            raise ConfigConflictError(
+                f"Report index update for {space_key} failed after "
+                f"{self.max_attempts} conflicting attempts."
+            )
+        with self._lock:
+            self._spaces[space_key] = (entries, generation)
+
+    async def _update(self, space_key: str, apply):
+        try:
+            await asyncio.to_thread(self._update_stored, space_key, apply)
+        except Exception as e:
+            logger.warning("Error saving report index for %s: %s", space_key, e)
+
+
+_report_index: ReportIndex | None = None
+
+def get_report_index() -> ReportIndex | None:
+    """
+    Returns the process-wide report index, or None when it is disabled.
+    REPORT_INDEX_BACKEND selects "config" (documents named after
+    REPORT_INDEX_DOCUMENT, one per space, stored in the config backend next
+    to the config file), "local" (files named after REPORT_INDEX_PATH) or
+    "none". It defaults to "config" when a config store is configured.
+    """
+    global _report_index
+    if _report_index is None:
+        has_config_store = bool(os.getenv("GCS_BUCKET_NAME")) or (
+            os.getenv("CONFIG_BACKEND", "gcs").lower() != "gcs"
+        )
+        default_backend = "config" if has_config_store else "none"
+        backend = os.getenv("REPORT_INDEX_BACKEND", default_backend).lower()
+        if backend == "local":
+            store = LocalReportIndexStore(
+                os.getenv("REPORT_INDEX_PATH", "report_index.json")
+            )
+        elif backend == "config":
+            store = ConfigBackendReportIndexStore(
+                os.getenv("REPORT_INDEX_DOCUMENT", "report_index.json")
+            )
+        elif backend == "none":
+            return None
+        else:
+            raise ValueError(f"Unknown REPORT_INDEX_BACKEND: {backend}")
+        _report_index = ReportIndex(store)
+    return _report_index
@@ -0,0 +1,98 @@
+import asyncio
+import html
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .confluence_client import ConfluenceClient
+
+# "{{ week }}", "{{on_call}}": placeholders are word characters in double braces.
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+def render_template(body: str, values: dict[str, str]) -> str:
+    """
+    Replaces known ``{{name}}`` placeholders in a storage-format body in a
+    single pass. Values are XML-escaped; unknown placeholders are left as is.
+    """
+
+    def replace(match: re.Match) -> str:
+        value = values.get(match.group(1))
+        return match.group(0) if value is None else html.escape(value, quote=False)
+
+    return _PLACEHOLDER_RE.sub(replace, body)
+
+
+class ReportTemplateCache:
+    """
+    Caches template pages' storage-format bodies across report runs.
+    A cached body is trusted for ``check_seconds``; after that its page's
+    version is re-read (a small metadata request) and the body is fetched
+    again only if the version changed. Concurrent lookups of the same page
+    share one fetch, so a batch over many teams loads the template once.
+    """
+
+    def __init__(self, check_seconds: float = 300.0, max_entries: int = 64):
+        self.check_seconds = check_seconds
+        self.max_entries = max_entries
+        # (base URL, page ID) -> (version, body, monotonic time of the last check)
+        self._entries: OrderedDict[tuple[str, str], tuple[int | None, str, float]] = OrderedDict()
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+
+    async def get(self, client: "ConfluenceClient", page_id: str) -> str:
+        """Returns the template page's storage body, fetching it only when needed."""
+        key = (client.base_url, page_id)
+        entry = self._entries.get(key)
+        if entry and time.monotonic() - entry[2] < self.check_seconds:
+            self._entries.move_to_end(key)
+            return entry[1]
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._refresh(client, page_id, key, entry))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _refresh(
+        self,
+        client: "ConfluenceClient",
+        page_id: str,
+        key: tuple[str, str],
+        entry: tuple[int | None, str, float] | None,
+    ) -> str:
+        if entry and entry[0] is not None:
+            page = await client.get_page(page_id)
+            if page and page.get("version", {}).get("number") == entry[0]:
+                self._store(key, entry[0], entry[1])
+                return entry[1]
+        page = await client.get_page_content(page_id)
+        body = page["body"]["storage"]["value"]
+        self._store(key, page.get("version", {}).get("number"), body)
+        return body
+
+    def _store(self, key: tuple[str, str], version: int | None, body: str):
+        self._entries[key] = (version, body, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, base_url: str, page_id: str):
+        self._entries.pop((base_url, page_id), None)
+
+
+_report_template_cache: ReportTemplateCache | None = None
+
+def get_report_template_cache() -> ReportTemplateCache:
+    """
+    Returns the process-wide template cache. REPORT_TEMPLATE_CHECK_SECONDS sets
+    how long a cached template is used before its version is re-checked.
+    """
+    global _report_template_cache
+    if _report_template_cache is None:
+        _report_template_cache = ReportTemplateCache(
+            check_seconds=float(os.getenv("REPORT_TEMPLATE_CHECK_SECONDS", "300"))
+        )
+    return _report_template_cache
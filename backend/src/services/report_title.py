@@ -0,0 +1,118 @@
+import datetime
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+
+# "2025 W01 技術部 RD4 團隊週報 (1229-0102)": a year label, an optional ISO week,
+# the team/report label and the Monday-Friday date range as MMDD-MMDD.
+_TITLE_RE = re.compile(
+    r"\s*(?P<year>\d{4})(?:\s+W(?P<week>\d{1,2}))?\s*(?P<label>.*?)\s*"
+    r"\((?P<start>\d{4})-(?P<end>\d{4})\)"
+)
+
+
+@lru_cache(maxsize=4096)
+def _resolve_fields(
+    year: str, week: str | None, start: str, end: str
+) -> tuple[int, int | None, datetime.date, datetime.date] | None:
+    """
+    Converts a title's year, week and MMDD-MMDD range into numbers and dates.
+    The year label is either the ISO year or the calendar year of the
+    Monday, which differ around New Year (e.g. "2025 W01 (1230-0103)" and
+    "2025 W01 (1229-0102)" are different weeks). Of the candidate years
+    around the label, the one whose start date is a Monday in the titled ISO
+    week wins; the label year itself breaks ties.
+    """
+    year_label = int(year)
+    week_number = int(week) if week else None
+    start_month, start_day = int(start[:2]), int(start[2:])
+    end_month, end_day = int(end[:2]), int(end[2:])
+    best, best_score = None, -1
+    for candidate in (year_label, year_label - 1, year_label + 1):
+        try:
+            start_date = datetime.date(candidate, start_month, start_day)
+        except ValueError:
+            continue
+        iso_week = start_date.isocalendar()[1]
+        score = (start_date.weekday() == 0) + (week_number is None or iso_week == week_number)
+        if score > best_score:
+            best, best_score = start_date, score
+        if score == 2:
+            break
+    if best is None:
+        return None
+    end_year = best.year + ((end_month, end_day) < (start_month, start_day))
+    try:
+        return year_label, week_number, best, datetime.date(end_year, end_month, end_day)
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True, slots=True, repr=False)
+class WeeklyReportTitle:
+    """
+    A parsed weekly report title: year label, ISO week, team label and date range.
+    Parsed titles are cached and shared, so instances are immutable.
+    """
+
+    year: int
+    week: int | None
+    label: str
+    start_date: datetime.date
+    end_date: datetime.date
+
+    @classmethod
+    def for_week(
+        cls, label: str, monday: datetime.date, with_week: bool = True
+    ) -> "WeeklyReportTitle":
+        """
+        Builds the title for the Monday-Friday week starting on ``monday``.
+        The year label is the Monday's calendar year, which is also the year
+        folder the report is filed under.
+        """
+        week = monday.isocalendar()[1] if with_week else None
+        return cls(monday.year, week, label, monday, monday + datetime.timedelta(days=4))
+
+    def next_week(self) -> "WeeklyReportTitle":
+        """Returns the title for the first Monday-Friday week after this one."""
+        next_monday = self.end_date + datetime.timedelta(days=1)
+        next_monday += datetime.timedelta(days=-next_monday.weekday() % 7)
+        return WeeklyReportTitle.for_week(self.label, next_monday, self.week is not None)
+
+    def __str__(self) -> str:
+        week = f" W{self.week:02d}" if self.week is not None else ""
+        label = f" {self.label}" if self.label else ""
+        return (
+            f"{self.year}{week}{label} "
+            f"({self.start_date:%m%d}-{self.end_date:%m%d})"
+        )
+
+    def __repr__(self) -> str:
+        return f"WeeklyReportTitle({str(self)!r})"
+
+
+def _from_match(match: re.Match) -> WeeklyReportTitle | None:
+    year, week, label, start, end = match.groups()
+    fields = _resolve_fields(year, week, start, end)
+    if fields is None:
+        return None
+    year, week, start_date, end_date = fields
+    return WeeklyReportTitle(year, week, label, start_date, end_date)
+
+
+@lru_cache(maxsize=4096)
+def parse_report_title(title: str) -> WeeklyReportTitle | None:
+    """Parses a weekly report title, or returns None if it is not one. Cached."""
+    match = _TITLE_RE.match(title)
+    return _from_match(match) if match else None
+
+
+def parse_report_titles(titles: Iterable[str]) -> list[WeeklyReportTitle | None]:
+    """
+    Parses many titles at once, e.g. for archive scans; the result is aligned
+    with the input. Titles bypass the per-title cache, so a scan of thousands
+    of old pages neither pays for the cache bookkeeping nor evicts the recent
+    titles, while weeks shared by several teams' reports are resolved once.
+    """
+    return [_from_match(match) if match else None for match in map(_TITLE_RE.match, titles)]
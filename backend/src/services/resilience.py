@@ -0,0 +1,280 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Monotonic time by which the job running in this context must finish, if any.
+# Like the upstream timings, it follows asyncio tasks and asyncio.to_thread.
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a job's overall deadline passes before an upstream call."""
+
+
+@contextmanager
+def deadline(seconds: float | None) -> Iterator[None]:
+    """
+    Bounds every upstream call made in this context to ``seconds`` from now.
+    Nested deadlines can only shorten the time left, never extend it.
+    """
+    if seconds is None:
+        yield
+        return
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires_at if current is None else min(current, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> float | None:
+    """Returns the seconds left before the current deadline, or None without one."""
+    expires_at = _deadline.get()
+    return None if expires_at is None else expires_at - time.monotonic()
+
+
+def call_timeout(timeout: float) -> float:
+    """Caps an upstream call's timeout at the time left; raises if none is left."""
+    remaining = remaining_time()
+    if remaining is None:
+        return timeout
+    if remaining <= 0:
+        raise DeadlineExceededError("Job deadline exceeded.")
+    return min(timeout, remaining)
+
+
+class CircuitBreaker:
+    """
+    Fails fast while an upstream is degraded.
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_seconds``. It then lets a single trial call
+    through (half-open): success closes it again, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raises CircuitOpenError if the call must not go to the upstream."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    raise CircuitOpenError("Circuit breaker is open.")
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                raise CircuitOpenError("Circuit breaker is half-open; a trial call is in flight.")
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        """Ends a call that proved nothing about the upstream's health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class Upstream:
+    """
+    The resilience policy for one upstream (Confluence, Slack or GCS).
+    Every call goes through its circuit breaker and the current deadline.
+    Transient failures (as judged by the caller's ``is_transient``) count
+    against the breaker, and idempotent calls are retried on them with
+    exponential backoff and full jitter, up to ``max_attempts`` in total.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        breaker: CircuitBreaker,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+    ):
+        self.name = name
+        self.breaker = breaker
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._stats_lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.rejected = 0
+
+    def _count(self, field: str):
+        with self._stats_lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def _before_attempt(self):
+        self._count("calls")
+        remaining = remaining_time()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceededError(f"Job deadline exceeded before calling {self.name}.")
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            self._count("rejected")
+            raise CircuitOpenError(f"{self.name}: {e}") from None
+
+    def _after_failure(
+        self,
+        error: Exception,
+        attempt: int,
+        idempotent: bool,
+        is_transient: Callable[[Exception], bool],
+    ) -> float | None:
+        """Records a failed attempt; returns the delay before retrying, or None to raise."""
+        if isinstance(error, DeadlineExceededError) or not is_transient(error):
+            self.breaker.release() # e.g. a 404: the upstream itself is fine
+            return None
+        self._count("failures")
+        self.breaker.record_failure()
+        if not idempotent or attempt + 1 >= self.max_attempts:
+            return None
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        remaining = remaining_time()
+        if remaining is not None and remaining <= delay:
+            return None
+        self._count("retries")
+        return delay
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        idempotent: bool,
+        is_transient: Callable[[Exception], bool],
+    ) -> T:
+        """Runs a blocking upstream call under the breaker, deadline and retry policy."""
+        attempt = 0
+        while True:
+            self._before_attempt()
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._after_failure(e, attempt, idempotent, is_transient)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        idempotent: bool,
+        is_transient: Callable[[Exception], bool],
+    ) -> T:
+        """Async counterpart of ``call``; each attempt is also cut off at the deadline."""
+        attempt = 0
+        while True:
+            self._before_attempt()
+            try:
+                remaining = remaining_time()
+                if remaining is None:
+                    result = await fn()
+                else:
+                    try:
+                        result = await asyncio.wait_for(fn(), remaining)
+                    except asyncio.TimeoutError:
+                        raise DeadlineExceededError(
+                            f"Job deadline exceeded while calling {self.name}."
+                        ) from None
+            except Exception as e:
+                delay = self._after_failure(e, attempt, idempotent, is_transient)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            except BaseException: # e.g. cancellation: free a half-open trial slot
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "state": self.breaker.state,
+                "consecutive_failures": self.breaker.consecutive_failures,
+                "calls": self.calls,
+                "failures": self.failures,
+                "retries": self.retries,
+                "rejected": self.rejected,
+            }
+
+
+_upstreams: dict[str, Upstream] = {}
+_upstreams_lock = threading.Lock()
+
+def get_upstream(name: str) -> Upstream:
+    """
+    Returns the process-wide policy for an upstream, created on first use.
+    UPSTREAM_FAILURE_THRESHOLD (default 5) and UPSTREAM_RESET_SECONDS (30)
+    configure the breakers, UPSTREAM_MAX_ATTEMPTS (3) the attempts per
+    idempotent call.
+    """
+    with _upstreams_lock:
+        upstream = _upstreams.get(name)
+        if upstream is None:
+            upstream = Upstream(
+                name,
+                CircuitBreaker(
+                    failure_threshold=int(os.getenv("UPSTREAM_FAILURE_THRESHOLD", "5")),
+                    reset_seconds=float(os.getenv("UPSTREAM_RESET_SECONDS", "30")),
+                ),
+                max_attempts=int(os.getenv("UPSTREAM_MAX_ATTEMPTS", "3")),
+            )
+            _upstreams[name] = upstream
+        return upstream
+
+
+def resilience_stats() -> dict:
+    """Returns breaker state and call, failure, retry and rejection counts per upstream."""
+    with _upstreams_lock:
+        upstreams = list(_upstreams.values())
+    return {upstream.name: upstream.stats() for upstream in upstreams}
@@ -0,0 +1,194 @@
+import asyncio
+import datetime
+import heapq
+import logging
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from .config_backend import ConfigConflictError
+from .cron import CronSchedule, compile_cron
+from .job_runner import get_job_runner
+
+logger = logging.getLogger(__name__)
+
+# A job provider returns the jobs that should currently be scheduled, as
+# ``{name: (cron_expression, fn)}``. It is re-read periodically so config
+# changes (new cron strings, jobs switched on or off) are picked up.
+JobProvider = Callable[[], dict[str, tuple[str, Callable[[], Awaitable]]]]
+
+
+class LeaderLock:
+    """
+    A lease stored as a document in the config backend, so only one replica fires.
+    The lease is taken and renewed with compare-and-swap writes; it expires
+    after ``lease_seconds`` if its holder stops renewing it, e.g. on a crash.
+    """
+
+    def __init__(self, document_name: str, lease_seconds: float, holder_id: str | None = None):
+        self.document_name = document_name
+        self.lease_seconds = lease_seconds
+        self.holder_id = holder_id or f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+
+    def acquire(self) -> bool:
+        """Takes or renews the lease; returns whether this replica holds it."""
+        from .config_backend import get_config_backend
+
+        backend = get_config_backend()
+        data, generation = backend.read_document(self.document_name)
+        now = time.time()
+        if data and data.get("holder") != self.holder_id and data.get("expires_at", 0) > now:
+            return False
+        lease = {"holder": self.holder_id, "expires_at": now + self.lease_seconds}
+        try:
+            backend.write_document(self.document_name, lease, generation or 0)
+        except ConfigConflictError:
+            return False # Another replica took it first
+        return True
+
+    def release(self):
+        """Gives up the lease so another replica can take over immediately."""
+        from .config_backend import get_config_backend
+
+        backend = get_config_backend()
+        data, generation = backend.read_document(self.document_name)
+        if data and data.get("holder") == self.holder_id:
+            try:
+                backend.write_document(
+                    self.document_name, {"holder": None, "expires_at": 0}, generation
+                )
+            except ConfigConflictError:
+                pass
+
+
+class Scheduler:
+    """
+    Fires cron jobs in-process, for deployments without Cloud Scheduler.
+    Due times live in a min-heap keyed by next fire time, so the loop sleeps
+    until exactly the earliest one. Jobs are re-read from ``jobs_provider``
+    every ``refresh_seconds``, which also renews the leader lease. Due jobs
+    run on the background job runner, and only while this replica is leader.
+    """
+
+    def __init__(
+        self,
+        jobs_provider: JobProvider,
+        lock: LeaderLock | None = None,
+        refresh_seconds: float = 60.0,
+        timezone_name: str = "UTC",
+    ):
+        self.jobs_provider = jobs_provider
+        self.lock = lock
+        self.refresh_seconds = refresh_seconds
+        self.timezone_name = timezone_name
+        self.is_leader = lock is None
+        self._jobs: dict[str, tuple[CronSchedule, Callable[[], Awaitable]]] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._task: asyncio.Task | None = None
+
+    def refresh(self, now: datetime.datetime):
+        """Reloads jobs and reschedules those whose cron expression changed."""
+        jobs = {}
+        for name, (expression, fn) in self.jobs_provider().items():
+            try:
+                jobs[name] = (compile_cron(expression, self.timezone_name), fn)
+            except ValueError as e:
+                logger.warning("Skipping scheduled job %s: %s", name, e)
+        changed = {
+            name
+            for name in jobs.keys() | self._jobs.keys()
+            if name not in jobs
+            or name not in self._jobs
+            or jobs[name][0] is not self._jobs[name][0]
+        }
+        self._jobs = jobs
+        if changed:
+            self._heap = [entry for entry in self._heap if entry[1] not in changed]
+            for name in changed & jobs.keys():
+                self._heap.append((jobs[name][0].next_fire(now).timestamp(), name))
+            heapq.heapify(self._heap)
+
+    def next_fire_at(self) -> float | None:
+        """Returns the earliest scheduled fire time as a timestamp."""
+        return self._heap[0][0] if self._heap else None
+
+    def run_pending(self, now: datetime.datetime) -> list[str]:
+        """Submits every job due at ``now`` and schedules its next fire."""
+        fired = []
+        while self._heap and self._heap[0][0] <= now.timestamp():
+            fire_at, name = heapq.heappop(self._heap)
+            schedule, fn = self._jobs[name]
+            due = datetime.datetime.fromtimestamp(fire_at, datetime.timezone.utc)
+            heapq.heappush(self._heap, (schedule.next_fire(max(due, now)).timestamp(), name))
+            if self.is_leader:
+                get_job_runner().submit(name, fn)
+                fired.append(name)
+        return fired
+
+    async def _update_leadership(self):
+        if self.lock is None:
+            return
+        try:
+            self.is_leader = await asyncio.to_thread(self.lock.acquire)
+        except Exception as e:
+            logger.error("Error renewing scheduler lease: %s", e)
+            self.is_leader = False
+
+    async def run(self):
+        refresh_at = 0.0
+        while True:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            if time.monotonic() >= refresh_at:
+                try:
+                    await asyncio.to_thread(self.refresh, now)
+                except Exception as e:
+                    logger.error("Error refreshing scheduled jobs: %s", e)
+                await self._update_leadership()
+                refresh_at = time.monotonic() + self.refresh_seconds
+            self.run_pending(now)
+            delay = refresh_at - time.monotonic()
+            next_fire_at = self.next_fire_at()
+            if next_fire_at is not None:
+                delay = min(delay, next_fire_at - time.time())
+            await asyncio.sleep(max(delay, 0))
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.lock is not None and self.is_leader:
+            try:
+                await asyncio.to_thread(self.lock.release)
+            except Exception as e:
+                logger.warning("Error releasing scheduler lease: %s", e)
+
+
+def build_scheduler(jobs_provider: JobProvider) -> Scheduler | None:
+    """
+    Builds the in-process scheduler when SCHEDULER_ENABLED is true.
+    SCHEDULER_TIMEZONE sets the zone cron strings are read in (default UTC),
+    SCHEDULER_REFRESH_SECONDS how often jobs and the lease are refreshed, and
+    SCHEDULER_LOCK_DOCUMENT the leader lease document in the config backend.
+    """
+    if os.getenv("SCHEDULER_ENABLED", "false").lower() != "true":
+        return None
+    refresh_seconds = float(os.getenv("SCHEDULER_REFRESH_SECONDS", "60"))
+    lock = LeaderLock(
+        os.getenv("SCHEDULER_LOCK_DOCUMENT", "scheduler_lock.json"),
+        lease_seconds=refresh_seconds * 3,
+    )
+    return Scheduler(
+        jobs_provider,
+        lock,
+        refresh_seconds=refresh_seconds,
+        timezone_name=os.getenv("SCHEDULER_TIMEZONE", "UTC"),
+    )
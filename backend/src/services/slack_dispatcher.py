@@ -0,0 +1,226 @@
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+from .resilience import get_upstream
+from .telemetry import track_upstream
+
+if TYPE_CHECKING:
+    from slack_sdk.errors import SlackApiError
+
+# Sustained rate (calls per second) and burst size for each Slack method,
+# following Slack's published tiers. chat.postMessage has its own "special"
+# limit: about one message per second per channel, with a workspace-wide
+# ceiling of several hundred per minute.
+METHOD_LIMITS = {
+    "chat.postMessage": (300 / 60, 10),
+    "conversations.setTopic": (20 / 60, 3), # Tier 2
+}
+DEFAULT_METHOD_LIMIT = (50 / 60, 5) # Tier 3
+CHANNEL_LIMIT = (1.0, 1)
+# Methods that are safe to resend after a network error; a retried
+# chat.postMessage could post the message twice.
+IDEMPOTENT_METHODS = {"conversations.setTopic"}
+
+
+def _is_transient(error: Exception) -> bool:
+    """
+    Whether a failed Slack call says the server or network is degraded.
+    Rate limits are not: the dispatcher paces and retries those itself.
+    """
+    from slack_sdk.errors import SlackApiError
+
+    if isinstance(error, SlackApiError):
+        return error.response.status_code >= 500
+    if isinstance(error, (OSError, TimeoutError)): # urllib and socket errors
+        return True
+    aiohttp = sys.modules.get("aiohttp")
+    return aiohttp is not None and isinstance(error, aiohttp.ClientError)
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket that hands out reservations.
+    ``reserve`` always takes a token and returns how long the caller must
+    wait for it, letting the balance go negative; callers therefore queue in
+    arrival order without polling.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Takes one token and returns the seconds to wait before using it."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def pause(self, seconds: float):
+        """Holds back new reservations for ``seconds``, e.g. after a Retry-After."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+class SlackDispatcher:
+    """
+    Paces Slack API calls with per-method and per-channel token buckets.
+    Each call first waits for a token from its method's bucket and from the
+    channel's bucket. A ``ratelimited`` response pauses the method's bucket
+    for the server's Retry-After (or an exponential backoff when it is
+    missing) and retries with jitter, up to ``max_retries`` times. The same
+    buckets pace sync and async callers across the process.
+    """
+
+    def __init__(self, max_retries: int = 3):
+        self.max_retries = max_retries
+        self._method_buckets: dict[str, TokenBucket] = {}
+        self._channel_buckets: dict[tuple[str, str], TokenBucket] = {}
+        self._buckets_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._queue_depth: dict[str, int] = defaultdict(int)
+        self._calls: dict[str, int] = defaultdict(int)
+        self._rate_limited: dict[str, int] = defaultdict(int)
+        self._wait_seconds: dict[str, float] = defaultdict(float)
+        self._max_wait_seconds: dict[str, float] = defaultdict(float)
+
+    def _reserve(self, method: str, channel: str | None) -> float:
+        with self._buckets_lock:
+            method_bucket = self._method_buckets.get(method)
+            if method_bucket is None:
+                method_bucket = TokenBucket(*METHOD_LIMITS.get(method, DEFAULT_METHOD_LIMIT))
+                self._method_buckets[method] = method_bucket
+            channel_bucket = None
+            if channel:
+                channel_bucket = self._channel_buckets.get((method, channel))
+                if channel_bucket is None:
+                    channel_bucket = TokenBucket(*CHANNEL_LIMIT)
+                    self._channel_buckets[(method, channel)] = channel_bucket
+        delay = method_bucket.reserve()
+        if channel_bucket is not None:
+            delay = max(delay, channel_bucket.reserve())
+        return delay
+
+    def _start_wait(self, method: str, delay: float):
+        with self._stats_lock:
+            self._calls[method] += 1
+            self._wait_seconds[method] += delay
+            self._max_wait_seconds[method] = max(self._max_wait_seconds[method], delay)
+            if delay > 0:
+                self._queue_depth[method] += 1
+
+    def _end_wait(self, method: str, delay: float):
+        if delay > 0:
+            with self._stats_lock:
+                self._queue_depth[method] -= 1
+
+    def _backoff(self, method: str, error: "SlackApiError", attempt: int) -> float | None:
+        """Returns the delay before retrying a rate-limited call, or None to give up."""
+        response = error.response
+        if response.status_code != 429 and response.get("error") != "ratelimited":
+            return None
+        if attempt >= self.max_retries:
+            return None
+        with self._stats_lock:
+            self._rate_limited[method] += 1
+        retry_after = response.headers.get("Retry-After") or response.headers.get("retry-after")
+        delay = float(retry_after) if retry_after else 2.0**attempt
+        self._method_buckets[method].pause(delay)
+        return delay + random.uniform(0, min(1.0, delay))
+
+    def call(self, method: str, channel: str | None, fn: Callable[[], object]):
+        """
+        Runs a blocking Slack call once tokens are available, retrying rate
+        limits. Each call also goes through the Slack circuit breaker.
+        """
+        from slack_sdk.errors import SlackApiError
+
+        def timed_call():
+            with track_upstream("slack", method):
+                return fn()
+
+        for attempt in range(self.max_retries + 1):
+            delay = self._reserve(method, channel)
+            self._start_wait(method, delay)
+            try:
+                if delay > 0:
+                    time.sleep(delay)
+            finally:
+                self._end_wait(method, delay)
+            try:
+                return get_upstream("slack").call(
+                    timed_call, idempotent=method in IDEMPOTENT_METHODS, is_transient=_is_transient
+                )
+            except SlackApiError as e:
+                backoff = self._backoff(method, e, attempt)
+                if backoff is None:
+                    raise
+                time.sleep(backoff)
+
+    async def acall(self, method: str, channel: str | None, fn: Callable[[], Awaitable]):
+        """Async counterpart of ``call`` that waits without blocking the event loop."""
+        from slack_sdk.errors import SlackApiError
+
+        async def timed_call():
+            with track_upstream("slack", method):
+                return await fn()
+
+        for attempt in range(self.max_retries + 1):
+            delay = self._reserve(method, channel)
+            self._start_wait(method, delay)
+            try:
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            finally:
+                self._end_wait(method, delay)
+            try:
+                return await get_upstream("slack").acall(
+                    timed_call, idempotent=method in IDEMPOTENT_METHODS, is_transient=_is_transient
+                )
+            except SlackApiError as e:
+                backoff = self._backoff(method, e, attempt)
+                if backoff is None:
+                    raise
+                await asyncio.sleep(backoff)
+
+    def stats(self) -> dict:
+        """Returns per-method call counts, queue depth, wait times and rate-limit hits."""
+        with self._stats_lock:
+            return {
+                method: {
+                    "calls": calls,
+                    "queue_depth": self._queue_depth[method],
+                    "rate_limited": self._rate_limited[method],
+                    "wait_seconds_total": self._wait_seconds[method],
+                    "wait_seconds_max": self._max_wait_seconds[method],
+                }
+                for method, calls in self._calls.items()
+            }
+
+
+_slack_dispatcher: SlackDispatcher | None = None
+_slack_dispatcher_lock = threading.Lock()
+
+def get_slack_dispatcher() -> SlackDispatcher:
+    global _slack_dispatcher
+    with _slack_dispatcher_lock:
+        if _slack_dispatcher is None:
+            _slack_dispatcher = SlackDispatcher(
+                max_retries=int(os.getenv("SLACK_MAX_RETRIES", "3"))
+            )
+        return _slack_dispatcher
@@ -1,34 +1,179 @@
+import asyncio
+import logging
 import os
+import threading
+from typing import TYPE_CHECKING
 
-from slack_sdk import WebClient
-from slack_sdk.errors import SlackApiError
+from .slack_dispatcher import get_slack_dispatcher
+from .tracing import trace_headers
+
+if TYPE_CHECKING:
+    from slack_sdk import WebClient
+    from slack_sdk.web.async_client import AsyncWebClient
+
+logger = logging.getLogger(__name__)
+
+# Process-wide Slack clients. The sync client is shared by every SlackService;
+# the async client owns a keep-alive aiohttp connection pool, which is bound to
+# the event loop it was created on and recreated if the running loop changes.
+# slack_sdk and aiohttp are imported on first use to keep app startup fast.
+_web_client: "WebClient | None" = None
+_web_client_lock = threading.Lock()
+_async_client: "AsyncWebClient | None" = None
+_async_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_timeout() -> int:
+    return int(os.getenv("SLACK_TIMEOUT_SECONDS", "30"))
+
+
+def _get_base_url() -> str:
+    # Overridable so benchmarks and tests can point the clients at a local fake.
+    return os.getenv("SLACK_API_URL", "https://slack.com/api/")
+
+
+def _get_token() -> str:
+    token = os.getenv("SLACK_API_TOKEN")
+    if not token:
+        raise ValueError("SLACK_API_TOKEN environment variable not set.")
+    return token
+
+
+def get_slack_client() -> "WebClient":
+    """Returns the process-wide sync Slack client."""
+    global _web_client
+    with _web_client_lock:
+        if _web_client is None:
+            from slack_sdk import WebClient
+
+            _web_client = WebClient(
+                token=_get_token(), base_url=_get_base_url(), timeout=_get_timeout()
+            )
+        return _web_client
+
+
+def get_async_slack_client() -> "AsyncWebClient":
+    """Returns the process-wide async Slack client for the running event loop."""
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        import aiohttp
+        from slack_sdk.web.async_client import AsyncWebClient
+
+        token = _get_token()
+        pool_size = int(os.getenv("SLACK_POOL_SIZE", "10"))
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size)
+        )
+        _async_client = AsyncWebClient(
+            token=token, session=session, base_url=_get_base_url(), timeout=_get_timeout()
+        )
+        _async_client_loop = loop
+    return _async_client
+
+
+async def close_slack_client():
+    """Closes the async client's connection pool, if one was created on this loop."""
+    global _async_client, _async_client_loop
+    if _async_client is not None and _async_client_loop is asyncio.get_running_loop():
+        await _async_client.session.close()
+    _async_client = None
+    _async_client_loop = None
 
 
 class SlackService:
     def __init__(self):
-        self.token = os.getenv("SLACK_API_TOKEN")
-        if not self.token:
-            raise ValueError("SLACK_API_TOKEN environment variable not set.")
-        self.client = WebClient(token=self.token)
+        self.client = get_slack_client()
+        self.dispatcher = get_slack_dispatcher()
 
     def send_message(self, channel: str, message: str):
+        from slack_sdk.errors import SlackApiError
+
         try:
-            response = self.client.chat_postMessage(
-                channel=channel,
-                text=message
+            response = self.dispatcher.call(
+                "chat.postMessage",
+                channel,
+                lambda: self.client.api_call(
+                    "chat.postMessage",
+                    json={"channel": channel, "text": message},
+                    headers=trace_headers(),
+                ),
             )
             return response
         except SlackApiError as e:
-            print(f"Error sending Slack message: {e.response['error']}")
+            logger.error(
+                "Error sending Slack message: %s", e.response["error"],
+                extra={"upstream": "slack", "operation": "chat.postMessage", "outcome": "error"},
+            )
             raise # Re-raise to indicate send failure
 
     def update_channel_description(self, channel: str, description: str):
+        from slack_sdk.errors import SlackApiError
+
         try:
-            response = self.client.conversations_setTopic(
-                channel=channel,
-                topic=description
+            response = self.dispatcher.call(
+                "conversations.setTopic",
+                channel,
+                lambda: self.client.api_call(
+                    "conversations.setTopic",
+                    params={"channel": channel, "topic": description},
+                    headers=trace_headers(),
+                ),
             )
             return response
         except SlackApiError as e:
-            print(f"Error updating Slack channel description: {e.response['error']}")
+            logger.error(
+                "Error updating Slack channel description: %s", e.response["error"],
+                extra={"upstream": "slack", "operation": "conversations.setTopic", "outcome": "error"},
+            )
+            raise # Re-raise to indicate update failure
+
+
+class AsyncSlackService:
+    """SlackService for async handlers, backed by the pooled AsyncWebClient."""
+
+    def __init__(self):
+        self.client = get_async_slack_client()
+        self.dispatcher = get_slack_dispatcher()
+
+    async def send_message(self, channel: str, message: str):
+        from slack_sdk.errors import SlackApiError
+
+        try:
+            response = await self.dispatcher.acall(
+                "chat.postMessage",
+                channel,
+                lambda: self.client.api_call(
+                    "chat.postMessage",
+                    json={"channel": channel, "text": message},
+                    headers=trace_headers(),
+                ),
+            )
+            return response
+        except SlackApiError as e:
+            logger.error(
+                "Error sending Slack message: %s", e.response["error"],
+                extra={"upstream": "slack", "operation": "chat.postMessage", "outcome": "error"},
+            )
+            raise # Re-raise to indicate send failure
+
+    async def update_channel_description(self, channel: str, description: str):
+        from slack_sdk.errors import SlackApiError
+
+        try:
+            response = await self.dispatcher.acall(
+                "conversations.setTopic",
+                channel,
+                lambda: self.client.api_call(
+                    "conversations.setTopic",
+                    params={"channel": channel, "topic": description},
+                    headers=trace_headers(),
+                ),
+            )
+            return response
+        except SlackApiError as e:
+            logger.error(
+                "Error updating Slack channel description: %s", e.response["error"],
+                extra={"upstream": "slack", "operation": "conversations.setTopic", "outcome": "error"},
+            )
             raise # Re-raise to indicate update failure
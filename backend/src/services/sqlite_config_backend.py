@@ -0,0 +1,106 @@
+import json
+import sqlite3
+import threading
+
+from .config_backend import ConfigBackend, ConfigConflictError
+
+
+class SQLiteConfigBackend(ConfigBackend):
+    """
+    Stores the config file and sibling documents in a SQLite database.
+    The database runs in WAL mode so readers never block the writer. Each
+    document row carries an integer generation that is bumped on every write,
+    which makes cache revalidation a primary-key lookup and compare-and-swap a
+    single conditional transaction. Batched reads and writes use one query and
+    one transaction respectively.
+    """
+
+    upstream = "sqlite"
+
+    def __init__(self, db_path: str, config_name: str = "config.json", cache_ttl_seconds: float = 0.0):
+        super().__init__(config_name, cache_ttl_seconds)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " name TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " generation INTEGER NOT NULL)"
+        )
+        self._documents: dict[str, tuple[int, dict]] = {}
+
+    def get_generation(self, name: str) -> int | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT generation FROM documents WHERE name = ?", (name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def read_document(self, name: str) -> tuple[dict | None, int | None]:
+        return self.read_documents([name])[name]
+
+    def read_documents(self, names: list[str]) -> dict[str, tuple[dict | None, int | None]]:
+        placeholders = ",".join("?" * len(names))
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT name, data, generation FROM documents WHERE name IN ({placeholders})",
+                names,
+            ).fetchall()
+        found = {}
+        for name, data, generation in rows:
+            cached = self._documents.get(name)
+            if not cached or cached[0] != generation:
+                cached = (generation, json.loads(data))
+                self._documents[name] = cached
+            found[name] = (cached[1], generation)
+        return {name: found.get(name, (None, None)) for name in names}
+
+    def _write(self, name: str, data: dict, if_generation_match: int | None) -> int:
+        row = self._connection.execute(
+            "SELECT generation FROM documents WHERE name = ?", (name,)
+        ).fetchone()
+        current = row[0] if row else 0
+        if if_generation_match is not None and current != if_generation_match:
+            raise ConfigConflictError(
+                f"{name} changed since generation {if_generation_match}."
+            )
+        generation = current + 1
+        self._connection.execute(
+            "INSERT INTO documents (name, data, generation) VALUES (?, ?, ?)"
+            " ON CONFLICT(name) DO UPDATE SET"
+            " data = excluded.data, generation = excluded.generation",
+            (name, json.dumps(data), generation),
+        )
+        self._documents[name] = (generation, data)
+        return generation
+
+    def write_document(
+        self, name: str, data: dict, if_generation_match: int | None = None
+    ) -> int | None:
+        return self.write_documents({name: data}, {name: if_generation_match})[name]
+
+    def write_documents(
+        self,
+        documents: dict[str, dict],
+        if_generation_match: dict[str, int | None] | None = None,
+    ) -> dict[str, int | None]:
+        if_generation_match = if_generation_match or {}
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock up front, so the generation
+            # checks and the writes are atomic across processes.
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                generations = {
+                    name: self._write(name, data, if_generation_match.get(name))
+                    for name, data in documents.items()
+                }
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+        return generations
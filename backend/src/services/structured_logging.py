@@ -0,0 +1,196 @@
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .tracing import current_span
+
+# Fields describing the work running in this context, e.g. the job ID and
+# team; every record logged in the context carries them. Like the upstream
+# timings, they follow asyncio tasks and asyncio.to_thread.
+_log_context: ContextVar[dict | None] = ContextVar("log_context", default=None)
+
+# Attributes every LogRecord has; anything else on a record came from ``extra``.
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", logging.INFO, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "taskName"}
+
+
+@contextmanager
+def log_context(**fields) -> Iterator[None]:
+    """Adds ``fields`` to every record logged in this context."""
+    token = _log_context.set({**(_log_context.get() or {}), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Copies the log context and the current trace onto each record.
+    It runs on the logging thread, before the record is queued, since the
+    context is gone by the time the listener thread formats it.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in (_log_context.get() or {}).items():
+            if not hasattr(record, key): # Explicit ``extra`` fields win
+                setattr(record, key, value)
+        span = current_span()
+        if span is not None:
+            record.trace_id = span.trace_id
+            record.span_id = span.span_id
+        return True
+
+
+class DebugRateLimitFilter(logging.Filter):
+    """
+    Thins out DEBUG records so heavy batch runs are not slowed by log I/O.
+    Each call site (logger and message template) may emit ``rate`` DEBUG
+    records per second, with bursts of up to ``burst``; of those, only a
+    ``sample_ratio`` share is kept. Other levels always pass.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, sample_ratio: float = 1.0):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.sample_ratio = sample_ratio
+        self._buckets: dict[tuple[str, str], list[float]] = {} # site -> [tokens, updated]
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.sample_ratio < 1 and random.random() >= self.sample_ratio:
+            self.dropped += 1
+            return False
+        site = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.setdefault(site, [float(self.burst), now])
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+            if bucket[0] < 1:
+                self.dropped += 1
+                return False
+            bucket[0] -= 1
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line, including its context and extras."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the listener thread without waiting: when the queue is
+    full the record is dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now: arguments may change and
+        # traceback frames must not be kept alive in the queue. Formatting
+        # to JSON is left to the listener thread.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _parse_levels(spec: str) -> dict[str, str]:
+    """Parses "logger=LEVEL,other.logger=LEVEL" into a mapping."""
+    levels = {}
+    for item in spec.split(","):
+        name, _, level = item.partition("=")
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+_listener: logging.handlers.QueueListener | None = None
+_listener_lock = threading.Lock()
+
+def configure_logging():
+    """
+    Routes the root logger through a bounded queue to a JSON stdout handler
+    on a background thread; the first call wins. LOG_LEVEL (default INFO)
+    sets the root level and LOG_LEVELS per-logger levels, e.g.
+    "src.services.confluence_client=DEBUG,httpx=WARNING". DEBUG records are
+    limited to LOG_DEBUG_RATE per second per call site (default 10) and
+    sampled at LOG_DEBUG_SAMPLE_RATIO (default 1). LOG_QUEUE_SIZE (10000)
+    bounds the records waiting to be written.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+        log_queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(
+            DebugRateLimitFilter(
+                rate=float(os.getenv("LOG_DEBUG_RATE", "10")),
+                sample_ratio=float(os.getenv("LOG_DEBUG_SAMPLE_RATIO", "1")),
+            )
+        )
+        handler.addFilter(ContextFilter())
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(JsonFormatter())
+
+        root = logging.getLogger()
+        root.handlers = [handler]
+        root.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        for name, level in _parse_levels(os.getenv("LOG_LEVELS", "")).items():
+            logging.getLogger(name).setLevel(level)
+
+        _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _listener.start()
+        atexit.register(stop_logging)
+
+def stop_logging():
+    """Writes out the queued records and stops the listener thread."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
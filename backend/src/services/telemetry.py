@@ -0,0 +1,73 @@
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from ..models.job import UpstreamTiming
+from .metrics import upstream_duration
+from .tracing import start_span
+
+logger = logging.getLogger(__name__)
+
+# Timings for the job running in the current context, if any. Context variables
+# follow asyncio tasks and asyncio.to_thread, so nested service calls record
+# into the job that started them.
+_current_timings: ContextVar[list[UpstreamTiming] | None] = ContextVar(
+    "current_timings", default=None
+)
+
+
+@contextmanager
+def collect_timings() -> Iterator[list[UpstreamTiming]]:
+    """Collects the upstream timings recorded in this context."""
+    timings: list[UpstreamTiming] = []
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def track_upstream(upstream: str, operation: str) -> Iterator[None]:
+    """
+    Times one upstream call, records it for the current job, adds it to the
+    upstream latency histogram and logs it at DEBUG level. The call runs in
+    a client span, so ``trace_headers()`` inside the block names it as the
+    remote parent.
+    """
+    started = time.perf_counter()
+    ok = False
+    try:
+        with start_span(
+            f"{upstream} {operation}",
+            kind="client",
+            attributes={"peer.service": upstream, "upstream.operation": operation},
+        ):
+            yield
+        ok = True
+    finally:
+        duration = time.perf_counter() - started
+        outcome = "ok" if ok else "error"
+        upstream_duration.observe(duration, upstream, operation, outcome)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "%s %s %s", upstream, operation, outcome,
+                extra={
+                    "upstream": upstream,
+                    "operation": operation,
+                    "duration_ms": duration * 1000,
+                    "outcome": outcome,
+                },
+            )
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.append(
+                UpstreamTiming(
+                    upstream=upstream,
+                    operation=operation,
+                    duration_ms=duration * 1000,
+                    ok=ok,
+                )
+            )
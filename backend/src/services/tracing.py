@@ -0,0 +1,238 @@
+import functools
+import inspect
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# version-trace_id-parent_id-flags, lowercase hex (W3C Trace Context).
+_TRACEPARENT_RE = re.compile(r"([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+
+# The span the code running in this context belongs to. Like the upstream
+# timings, it follows asyncio tasks and asyncio.to_thread.
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+class SpanContext(NamedTuple):
+    """The identity of a span, as carried in a W3C ``traceparent`` header."""
+    trace_id: str # 32 hex digits
+    span_id: str # 16 hex digits
+    sampled: bool
+
+
+class Span:
+    """
+    One timed operation in a trace. Fields follow the OpenTelemetry span
+    model, so exported spans can be loaded into any OTLP-compatible backend.
+    """
+
+    __slots__ = (
+        "name",
+        "kind",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "sampled",
+        "start_time_unix_nano",
+        "end_time_unix_nano",
+        "attributes",
+        "status",
+        "status_message",
+    )
+
+    def __init__(self, name: str, kind: str, parent: SpanContext | None, attributes: dict | None):
+        self.name = name
+        self.kind = kind # "internal", "server" or "client"
+        if parent is None:
+            self.trace_id = f"{random.getrandbits(128):032x}"
+            self.parent_span_id = None
+            self.sampled = random.random() < _sample_ratio()
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_span_id = parent.span_id
+            self.sampled = parent.sampled
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano: int | None = None
+        self.attributes = dict(attributes or {})
+        self.status = "UNSET" # "UNSET", "OK" or "ERROR"
+        self.status_message = ""
+
+    @property
+    def context(self) -> SpanContext:
+        return SpanContext(self.trace_id, self.span_id, self.sampled)
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.end_time_unix_nano is None:
+            return None
+        return (self.end_time_unix_nano - self.start_time_unix_nano) / 1e6
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status = "ERROR"
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "start_time_unix_nano": self.start_time_unix_nano,
+            "end_time_unix_nano": self.end_time_unix_nano,
+            "attributes": self.attributes,
+            "status": {"code": self.status, "message": self.status_message},
+        }
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, trace_id={self.trace_id!r}, span_id={self.span_id!r})"
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in a list; meant for tests."""
+
+    def __init__(self):
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+
+    def get_finished_spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+
+
+class LogSpanExporter:
+    """Logs each finished span, as one JSON record, for a log-based collector."""
+
+    def export(self, span: Span):
+        logger.info("span", extra={"span": span.to_dict()})
+
+
+_exporters: list | None = None
+_exporters_lock = threading.Lock()
+
+def _get_exporters() -> list:
+    """
+    Returns the span exporters, configured on first use. TRACING_EXPORTER
+    selects one: "none" (the default, which disables tracing) or "log".
+    """
+    global _exporters
+    if _exporters is None:
+        with _exporters_lock:
+            if _exporters is None:
+                exporter = os.getenv("TRACING_EXPORTER", "none").lower()
+                _exporters = [LogSpanExporter()] if exporter == "log" else []
+    return _exporters
+
+def add_span_exporter(exporter):
+    """Sends finished spans to ``exporter`` as well, e.g. an InMemorySpanExporter."""
+    with _exporters_lock:
+        global _exporters
+        _exporters = [*(_exporters or []), exporter]
+
+def remove_span_exporter(exporter):
+    with _exporters_lock:
+        global _exporters
+        _exporters = [e for e in (_exporters or []) if e is not exporter]
+
+def _sample_ratio() -> float:
+    return float(os.getenv("TRACING_SAMPLE_RATIO", "1"))
+
+
+def current_span() -> Span | None:
+    """Returns the span of the code running in this context, if it is traced."""
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(
+    name: str,
+    kind: str = "internal",
+    attributes: dict | None = None,
+    parent: SpanContext | None = None,
+) -> Iterator[Span | None]:
+    """
+    Runs the block in a new span, a child of ``parent`` or else of the
+    current span. Yields None, at almost no cost, when tracing is disabled.
+    Exceptions leaving the block mark the span as failed.
+    """
+    exporters = _get_exporters()
+    if not exporters:
+        yield None
+        return
+    if parent is None:
+        current = _current_span.get()
+        parent = current.context if current is not None else None
+    span = Span(name, kind, parent, attributes)
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end_time_unix_nano = time.time_ns()
+        if span.sampled:
+            for exporter in exporters:
+                exporter.export(span)
+
+
+def traced(name: str) -> Callable:
+    """Decorates a sync or async function so each call runs in a span called ``name``."""
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with start_span(name):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with start_span(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def trace_headers() -> dict[str, str]:
+    """Returns the W3C ``traceparent`` header for the current span, if any."""
+    span = _current_span.get()
+    if span is None:
+        return {}
+    return {"traceparent": f"00-{span.trace_id}-{span.span_id}-{'01' if span.sampled else '00'}"}
+
+
+def extract_span_context(headers) -> SpanContext | None:
+    """Parses an incoming ``traceparent`` header; returns None if absent or malformed."""
+    match = _TRACEPARENT_RE.fullmatch((headers.get("traceparent") or "").strip())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 1))
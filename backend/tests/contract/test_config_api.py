@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 import pytest
 from backend.src.main import app
+from backend.src.models.config import AppConfig
 from fastapi.testclient import TestClient
 
 
@@ -92,3 +93,33 @@ def test_put_app_config_validation_error(client):
 
     assert response.status_code == 422 # Pydantic validation error
     assert "value is not a valid cron expression" in response.json()["detail"][0]["msg"]
+
+def test_put_app_config_passes_if_match_and_reports_ignored_fields(client):
+    config_data = {
+        "confluence_config": {"confluence_url": "https://test.confluence.com", "slack_channel": "C1"},
+        "on_call_config": {"slack_channel": "C2"},
+        "on_call_schedule": {"current_index": 0, "roster": []}
+    }
+    with patch(
+        'backend.src.api.config.save_app_config',
+        return_value=["on_call_schedule.current_index"],
+    ) as save:
+        response = client.put("/api/config", json=config_data, headers={"If-Match": '"42"'})
+
+    assert response.status_code == 200
+    assert save.call_args.args[1] == 42
+    assert response.headers["Config-Ignored-Fields"] == "on_call_schedule.current_index"
+
+def test_get_app_config_returns_generation_as_etag(client):
+    config = AppConfig(
+        confluence_config={"confluence_url": "https://test.confluence.com", "slack_channel": "C1"},
+        on_call_config={"slack_channel": "C2"},
+        on_call_schedule={"current_index": 0, "roster": []},
+    )
+    with (
+        patch('backend.src.api.config.get_app_config', return_value=config),
+        patch('backend.src.api.config.get_app_config_generation', return_value=42),
+    ):
+        response = client.get("/api/config")
+
+    assert response.headers["ETag"] == '"42"'
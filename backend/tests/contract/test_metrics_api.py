@@ -0,0 +1,17 @@
+from backend.src.main import app
+from fastapi.testclient import TestClient
+
+client = TestClient(app)
+
+
+def test_metrics_reports_route_latency_by_template():
+    client.get("/schedule/jobs/unknown-job")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/schedule/jobs/{job_id}",status="404"}'
+        in response.text
+    )
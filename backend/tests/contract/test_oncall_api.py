@@ -0,0 +1,96 @@
+from unittest.mock import patch
+
+import pytest
+from backend.src.main import app
+from backend.src.models.config import (
+    AppConfig,
+    ConfluenceConfig,
+    OnCallConfig,
+    OnCallPerson,
+    OnCallSchedule,
+    Rotation,
+)
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(autouse=True)
+def mock_app_config():
+    app_config = AppConfig(
+        confluence_config=ConfluenceConfig(confluence_url="https://test.confluence.com", slack_channel="C1"),
+        on_call_config=OnCallConfig(slack_channel="C2"),
+        on_call_schedule=OnCallSchedule(
+            rotation_start="2026-01-02T18:00:00Z",
+            roster=[
+                OnCallPerson(name="Alice", slack_user_id="U01A"),
+                OnCallPerson(name="Bob", slack_user_id="U01B")
+            ]
+        ),
+        rotations=[
+            Rotation(id="api", name="API", slack_channel="C3", current_index=1, roster=[
+                OnCallPerson(name="Alice", slack_user_id="U01A"),
+                OnCallPerson(name="Bob", slack_user_id="U01B")
+            ]),
+            Rotation(id="db", name="Database", slack_channel="C4", roster=[
+                OnCallPerson(name="Bob", slack_user_id="U01B")
+            ])
+        ]
+    )
+    with patch('backend.src.api.oncall.get_app_config', return_value=app_config):
+        yield app_config
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+def test_get_rotation_returns_current_on_call(client):
+    response = client.get("/api/oncall/rotations/api")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "API"
+    assert response.json()["on_call"]["slack_user_id"] == "U01B"
+
+def test_get_unknown_rotation_returns_404(client):
+    response = client.get("/api/oncall/rotations/missing")
+    assert response.status_code == 404
+
+def test_get_user_rotations(client):
+    response = client.get("/api/oncall/users/U01B")
+
+    assert response.status_code == 200
+    assert [r["id"] for r in response.json()["rotations"]] == ["api", "db"]
+
+def test_get_on_call_at_returns_shift(client):
+    response = client.get("/api/oncall/at", params={"ts": "2026-01-10T03:00:00Z"})
+
+    assert response.status_code == 200
+    assert response.json()["on_call"]["name"] == "Bob"
+    assert response.json()["start"].startswith("2026-01-09T18:00:00")
+
+def test_get_on_call_at_before_rotation_start_returns_404(client):
+    response = client.get("/api/oncall/at", params={"ts": "2025-01-01T00:00:00"})
+    assert response.status_code == 404
+
+def test_get_on_call_shifts_for_range(client):
+    response = client.get(
+        "/api/oncall/shifts",
+        params={"start": "2026-01-02T18:00:00Z", "end": "2026-01-23T18:00:00Z"},
+    )
+
+    assert response.status_code == 200
+    assert [s["on_call"]["name"] for s in response.json()] == ["Alice", "Bob", "Alice"]
+
+def test_get_on_call_shifts_rejects_inverted_range(client):
+    response = client.get(
+        "/api/oncall/shifts",
+        params={"start": "2026-01-23T18:00:00Z", "end": "2026-01-02T18:00:00Z"},
+    )
+    assert response.status_code == 400
+
+def test_get_on_call_shifts_treats_naive_bounds_as_utc(client):
+    response = client.get(
+        "/api/oncall/shifts",
+        params={"start": "2026-01-05T00:00:00", "end": "2026-01-20T00:00:00Z"},
+    )
+
+    assert response.status_code == 200
+    assert [s["on_call"]["name"] for s in response.json()] == ["Alice", "Bob", "Alice"]
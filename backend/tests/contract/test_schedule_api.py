@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from backend.src.main import app
@@ -40,6 +40,11 @@ def mock_gcs_config_service():
         }
         yield mock_instance
 
+# Start every test with an empty idempotency store
+@pytest.fixture(autouse=True)
+def reset_idempotency_store(monkeypatch):
+    monkeypatch.setattr("backend.src.services.idempotency._idempotency_store", None)
+
 # Mock the Confluence and Slack services
 @pytest.fixture
 def mock_confluence_service():
@@ -284,3 +289,177 @@ def test_on_call_notification_trigger_failure(
             mock_notify.assert_called_once()
             # No config should be saved on failure
             mock_gcs_config_service.save_config.assert_not_called()
+
+def test_confluence_weekly_report_batch_returns_per_team_results(client, mock_slack_service):
+    from backend.src.models.schedule import WeeklyReportResult
+
+    mock_slack_service.send_message = AsyncMock()
+
+    mock_app_config = AppConfig(
+        confluence_config=ConfluenceConfig(
+            enabled=True,
+            confluence_url="https://test.confluence.com",
+            slack_channel="C12345",
+            weekly_report_enabled=True,
+            weekly_report_slack_channel="C12345"
+        ),
+        on_call_config=OnCallConfig(slack_channel="C67890"),
+        on_call_schedule=OnCallSchedule(roster=[])
+    )
+    results = {
+        "rd4": WeeklyReportResult(status="created", url="/pages/1", duration_seconds=0.1),
+        "rd5": WeeklyReportResult(status="failed", error="boom", duration_seconds=0.1),
+    }
+    with patch('backend.src.api.schedule.get_app_config', return_value=mock_app_config), \
+         patch('backend.src.api.schedule.AsyncSlackService', return_value=mock_slack_service), \
+         patch('backend.src.api.schedule.create_weekly_reports', return_value=results) as mock_create:
+        response = client.post(
+            "/schedule/confluence-weekly-report/batch",
+            json={
+                "targets": [
+                    {"team": "rd4", "space_key": "RD4"},
+                    {"team": "rd5", "space_key": "RD5", "slack_channel": "C555"}
+                ],
+                "max_concurrency": 4,
+                "timeout_seconds": 30
+            },
+        )
+
+    assert response.status_code == 200
+    body = response.json()["results"]
+    assert body["rd4"]["status"] == "created"
+    assert body["rd5"]["error"] == "boom"
+    targets, max_concurrency, timeout_seconds = mock_create.call_args[0]
+    assert [t.space_key for t in targets] == ["RD4", "RD5"]
+    assert (max_concurrency, timeout_seconds) == (4, 30)
+    assert mock_slack_service.send_message.await_count == 2
+
+def test_confluence_weekly_report_batch_rejects_duplicate_teams(client):
+    response = client.post(
+        "/schedule/confluence-weekly-report/batch",
+        json={"targets": [{"team": "rd4", "space_key": "A"}, {"team": "rd4", "space_key": "B"}]},
+    )
+    assert response.status_code == 422
+
+def test_confluence_weekly_report_range_creates_weeks_and_notifies_once(client, mock_slack_service):
+    from backend.src.models.schedule import WeeklyReportWeekResult
+
+    mock_slack_service.send_message = AsyncMock()
+    mock_app_config = AppConfig(
+        confluence_config=ConfluenceConfig(
+            enabled=True,
+            confluence_url="https://test.confluence.com",
+            slack_channel="C12345",
+            weekly_report_enabled=True,
+            weekly_report_slack_channel="C12345"
+        ),
+        on_call_config=OnCallConfig(slack_channel="C67890"),
+        on_call_schedule=OnCallSchedule(roster=[])
+    )
+    results = [
+        WeeklyReportWeekResult(title="2025 W03 RD4 (0113-0117)", status="created", url="/pages/1"),
+        WeeklyReportWeekResult(title="2025 W04 RD4 (0120-0124)", status="failed", error="boom"),
+    ]
+    with patch('backend.src.api.schedule.get_app_config', return_value=mock_app_config), \
+         patch('backend.src.api.schedule.AsyncSlackService', return_value=mock_slack_service), \
+         patch('backend.src.api.schedule.ConfluenceService') as MockConfluenceService:
+        create_range = AsyncMock(return_value=results)
+        MockConfluenceService.return_value.create_weekly_reports_range = create_range
+        response = client.post(
+            "/schedule/confluence-weekly-report/range",
+            json={"space_key": "RD4", "weeks": 2, "max_concurrency": 2},
+        )
+
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == ["created", "failed"]
+    assert MockConfluenceService.call_args.kwargs["space_key"] == "RD4"
+    create_range.assert_awaited_once_with(weeks=2, through=None, max_concurrency=2)
+    mock_slack_service.send_message.assert_awaited_once()
+
+def test_confluence_weekly_report_range_requires_weeks_or_through(client):
+    response = client.post(
+        "/schedule/confluence-weekly-report/range",
+        json={"weeks": 2, "through": "2025-03-01"},
+    )
+    assert response.status_code == 422
+
+def test_on_call_notification_async_mode_returns_job(client):
+    from backend.src.services import job_runner
+
+    async def fake_run():
+        return {"message": "On-call notification triggered for Alice (U01A)."}
+
+    runner = job_runner.JobRunner()
+    with patch('backend.src.api.schedule.get_job_runner', return_value=runner), \
+         patch('backend.src.api.schedule._run_on_call_notification', side_effect=fake_run):
+        response = client.post("/schedule/on-call-notification?async=true")
+
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert response.json()["status_url"] == f"/schedule/jobs/{job_id}"
+
+        status_response = client.get(f"/schedule/jobs/{job_id}")
+        assert status_response.status_code == 200
+        assert status_response.json()["id"] == job_id
+        assert status_response.json()["type"] == "on-call-notification"
+
+def test_get_unknown_job_returns_404(client):
+    response = client.get("/schedule/jobs/does-not-exist")
+    assert response.status_code == 404
+
+def test_on_call_notification_duplicate_trigger_is_replayed(client):
+    calls = 0
+
+    async def fake_run():
+        nonlocal calls
+        calls += 1
+        return {"message": "On-call notification triggered for Alice (U01A)."}
+
+    with patch('backend.src.api.schedule._run_on_call_notification', side_effect=fake_run):
+        first = client.post("/schedule/on-call-notification")
+        retry = client.post("/schedule/on-call-notification")
+        other_key = client.post(
+            "/schedule/on-call-notification", headers={"Idempotency-Key": "manual-1"}
+        )
+
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert other_key.status_code == 200
+    assert calls == 2
+
+def test_on_call_rotations_notifies_due_rotations_and_advances_them(client, mock_slack_service):
+    from backend.src.models.config import Rotation
+    from backend.src.models.schedule import RotationResult
+
+    mock_app_config = AppConfig(
+        confluence_config=ConfluenceConfig(confluence_url="https://test.confluence.com", slack_channel="C1"),
+        on_call_config=OnCallConfig(slack_channel="C2"),
+        on_call_schedule=OnCallSchedule(roster=[]),
+        rotations=[
+            Rotation(id="api", slack_channel="C3", roster=[
+                OnCallPerson(name="Alice", slack_user_id="U01A"),
+                OnCallPerson(name="Bob", slack_user_id="U01B")
+            ]),
+            Rotation(id="db", slack_channel="C4", roster=[OnCallPerson(name="Carol", slack_user_id="U01C")]),
+            Rotation(id="off", slack_channel="C5", enabled=False, roster=[OnCallPerson(name="Dan", slack_user_id="U01D")])
+        ]
+    )
+    results = {
+        "api": RotationResult(status="notified", on_call_name="Alice", slack_user_id="U01A"),
+        "db": RotationResult(status="failed", error="channel_not_found"),
+    }
+    with patch('backend.src.api.schedule.get_app_config', return_value=mock_app_config), \
+         patch('backend.src.api.schedule.OnCallService') as MockOnCallService, \
+         patch('backend.src.api.schedule.advance_rotations') as mock_advance:
+        MockOnCallService.return_value.notify_rotations = AsyncMock(return_value=results)
+        response = client.post("/schedule/on-call-rotations")
+
+    assert response.status_code == 200
+    assert response.json()["results"]["api"]["status"] == "notified"
+    assert response.json()["results"]["db"]["status"] == "failed"
+    notified = MockOnCallService.return_value.notify_rotations.call_args[0][0]
+    assert [rotation.id for rotation in notified] == ["api", "db"]
+    advances, _ = mock_advance.call_args[0]
+    assert advances == {"api": (0, 1)}
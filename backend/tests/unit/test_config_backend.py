@@ -0,0 +1,66 @@
+import pytest
+from backend.src.services.config_backend import ConfigConflictError
+from backend.src.services.file_config_backend import FileConfigBackend
+from backend.src.services.sqlite_config_backend import SQLiteConfigBackend
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "file":
+        return FileConfigBackend(str(tmp_path / "config.json"))
+    return SQLiteConfigBackend(str(tmp_path / "config.db"))
+
+def test_load_config_missing_returns_empty(backend):
+    assert backend.load_config() == {}
+    assert backend.generation is None
+
+def test_save_and_load_config_round_trip(backend):
+    backend.save_config({"key": "value"})
+    assert backend.load_config() == {"key": "value"}
+    assert backend.cache_hits == 1
+
+def test_load_config_sees_writes_from_another_instance(backend, tmp_path):
+    backend.save_config({"key": "old"})
+    backend.load_config()
+
+    other = type(backend)(
+        str(tmp_path / ("config.json" if isinstance(backend, FileConfigBackend) else "config.db"))
+    )
+    other.save_config({"key": "new"})
+
+    assert backend.load_config() == {"key": "new"}
+
+def test_conditional_write_conflict(backend):
+    backend.save_config({"key": "value"}, if_generation_match=0)
+    with pytest.raises(ConfigConflictError):
+        backend.save_config({"key": "other"}, if_generation_match=0)
+    with pytest.raises(ConfigConflictError):
+        backend.save_config({"key": "other"}, if_generation_match=backend.generation + 1)
+    backend.save_config({"key": "other"}, if_generation_match=backend.generation)
+    assert backend.load_config() == {"key": "other"}
+
+def test_update_config_applies_mutator(backend):
+    backend.save_config({"count": 1})
+
+    def increment(config):
+        config["count"] += 1
+
+    assert backend.update_config(increment) == {"count": 2}
+    assert backend.load_config() == {"count": 2}
+
+def test_update_config_skips_write_when_unchanged(backend):
+    backend.save_config({"count": 1})
+    generation = backend.generation
+
+    assert backend.update_config(lambda config: None) == {"count": 1}
+    assert backend.get_generation(backend.config_name) == generation
+
+def test_batched_document_reads_and_writes(backend):
+    generations = backend.write_documents({"a.json": {"a": 1}, "b.json": {"b": 2}})
+    assert set(generations) == {"a.json", "b.json"}
+
+    documents = backend.read_documents(["a.json", "b.json", "missing.json"])
+
+    assert documents["a.json"] == ({"a": 1}, generations["a.json"])
+    assert documents["b.json"][0] == {"b": 2}
+    assert documents["missing.json"] == (None, None)
@@ -0,0 +1,126 @@
+import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+from backend.src.models.config import (
+    AppConfig,
+    ConfluenceConfig,
+    OnCallConfig,
+    OnCallPerson,
+    OnCallSchedule,
+    Rotation,
+)
+from backend.src.services import config_service
+
+
+@pytest.fixture
+def stored_config():
+    return AppConfig(
+        confluence_config=ConfluenceConfig(confluence_url="https://test.confluence.com", slack_channel="C1"),
+        on_call_config=OnCallConfig(slack_channel="C2"),
+        on_call_schedule=OnCallSchedule(
+            current_index=1,
+            roster=[
+                OnCallPerson(name="Alice", slack_user_id="U01A"),
+                OnCallPerson(name="Bob", slack_user_id="U01B"),
+                OnCallPerson(name="Carol", slack_user_id="U01C")
+            ]
+        ),
+        rotations=[
+            Rotation(
+                id="api",
+                slack_channel="C3",
+                current_index=1,
+                roster=[
+                    OnCallPerson(name="Alice", slack_user_id="U01A"),
+                    OnCallPerson(name="Bob", slack_user_id="U01B")
+                ]
+            ),
+            Rotation(id="db", slack_channel="C4", roster=[OnCallPerson(name="Carol", slack_user_id="U01C")])
+        ]
+    ).model_dump(mode="json")
+
+@pytest.fixture
+def mock_gcs_service(stored_config):
+    service = MagicMock()
+    service.generation = 7
+
+    def update_config(mutator, max_attempts=5):
+        updated = mutator(stored_config)
+        return stored_config if updated is None else updated
+
+    service.update_config.side_effect = update_config
+    with patch.object(config_service, "get_config_backend", return_value=service):
+        yield service
+    config_service._app_config_instance = None
+    config_service._app_config_generation = None
+
+def test_advance_on_call_rotation_moves_expected_index(mock_gcs_service, stored_config):
+    config_service.advance_on_call_rotation(expected_index=1, next_index=2)
+    assert stored_config["on_call_schedule"]["current_index"] == 2
+    mock_gcs_service.save_config.assert_not_called()
+
+def test_advance_on_call_rotation_skips_when_already_advanced(mock_gcs_service, stored_config):
+    stored_config["on_call_schedule"]["current_index"] = 2 # A concurrent trigger won
+    config_service.advance_on_call_rotation(expected_index=1, next_index=2)
+    assert stored_config["on_call_schedule"]["current_index"] == 2
+
+def test_save_app_config_keeps_stored_rotation_index(mock_gcs_service, stored_config):
+    edited = AppConfig(**stored_config)
+    edited.on_call_schedule.current_index = 0 # Stale index from an older read
+    edited.on_call_config.slack_channel = "C99"
+
+    config_service.save_app_config(edited)
+
+    assert edited.on_call_schedule.current_index == 1
+    assert edited.on_call_config.slack_channel == "C99"
+    assert config_service._app_config_instance is edited
+
+def test_save_app_config_writes_rotation_index_without_conflict(mock_gcs_service, stored_config):
+    edited = AppConfig(**stored_config)
+    edited.on_call_schedule.current_index = 0
+    edited.rotations[0].current_index = 0
+
+    ignored = config_service.save_app_config(edited, expected_generation=7)
+
+    assert ignored == []
+    assert edited.on_call_schedule.current_index == 0
+    assert edited.rotations[0].current_index == 0
+
+def test_save_app_config_reports_kept_fields_on_conflict(mock_gcs_service, stored_config):
+    edited = AppConfig(**stored_config)
+    edited.on_call_schedule.current_index = 0
+    edited.rotations[0].current_index = 0
+
+    ignored = config_service.save_app_config(edited, expected_generation=6)
+
+    assert ignored == ["on_call_schedule.current_index", "rotations[api].current_index"]
+    assert edited.on_call_schedule.current_index == 1
+    assert edited.rotations[0].current_index == 1
+
+def test_advance_rotations_moves_only_expected_rotations(mock_gcs_service, stored_config):
+    now = datetime.datetime(2026, 3, 6, 18, tzinfo=datetime.timezone.utc)
+
+    advanced = config_service.advance_rotations(
+        {"api": (1, 0), "db": (3, 0)}, {"api": now, "db": now}
+    )
+
+    assert advanced == ["api"]
+    api, db = stored_config["rotations"]
+    assert api["current_index"] == 0
+    assert api["last_advanced_at"] == now.isoformat()
+    assert db["last_advanced_at"] is None
+    mock_gcs_service.update_config.assert_called_once()
+
+def test_save_app_config_keeps_stored_rotation_state(mock_gcs_service, stored_config):
+    stored_config["rotations"][0]["last_advanced_at"] = "2026-03-06T18:00:00Z"
+    edited = AppConfig(**stored_config)
+    edited.rotations[0].current_index = 0
+    edited.rotations[0].last_advanced_at = None
+    edited.rotations[0].slack_channel = "C99"
+
+    config_service.save_app_config(edited)
+
+    assert edited.rotations[0].current_index == 1
+    assert edited.rotations[0].last_advanced_at.year == 2026
+    assert edited.rotations[0].slack_channel == "C99"
@@ -0,0 +1,239 @@
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from backend.src.services import confluence_client
+from backend.src.services.confluence_client import ConfluenceClient, get_http_client
+
+
+@pytest.fixture
+def confluence_env(monkeypatch):
+    monkeypatch.setenv("CONFLUENCE_DOMAIN", "test.atlassian.net")
+    monkeypatch.setenv("CONFLUENCE_USERNAME", "user")
+    monkeypatch.setenv("CONFLUENCE_API_TOKEN", "token")
+    monkeypatch.setenv("CONFLUENCE_SPACE_KEY", "SPACE")
+
+@pytest.fixture
+def mock_transport(monkeypatch):
+    requests_seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_seen.append(request)
+        if request.url.path.endswith("/missing/child/page"):
+            return httpx.Response(404, text="not found")
+        return httpx.Response(200, json={"results": [{"id": "1", "title": "Page"}]})
+
+    monkeypatch.setattr(
+        confluence_client,
+        "_build_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    yield requests_seen
+    confluence_client._http_client = None
+    confluence_client._http_client_loop = None
+
+def test_client_reuses_shared_pool(confluence_env, mock_transport):
+    async def run():
+        client = ConfluenceClient()
+        first = get_http_client()
+        await asyncio.gather(client.get_child_pages("1"), client.get_page_by_title("Page"))
+        assert get_http_client() is first
+        await confluence_client.close_http_client()
+
+    asyncio.run(run())
+    assert len(mock_transport) == 2
+    assert str(mock_transport[0].url).startswith("https://test.atlassian.net/wiki/rest/api/")
+
+def test_client_raises_on_http_error(confluence_env, mock_transport):
+    async def run():
+        await ConfluenceClient().get_child_pages("missing")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+
+def test_explicit_scheme_in_domain(confluence_env, monkeypatch):
+    monkeypatch.setenv("CONFLUENCE_DOMAIN", "http://127.0.0.1:8090")
+    assert ConfluenceClient().base_url == "http://127.0.0.1:8090/wiki/rest/api"
+
+def test_iter_child_pages_follows_next_links(confluence_env, monkeypatch):
+    seen_params = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        start = int(request.url.params["start"])
+        seen_params.append(dict(request.url.params))
+        links = {}
+        if start < 4:
+            links["next"] = f"/rest/api/content/1/child/page?limit=2&start={start + 2}"
+        results = [{"id": str(start + i), "title": f"Page {start + i}"} for i in range(2)]
+        return httpx.Response(200, json={"results": results, "_links": links})
+
+    monkeypatch.setattr(
+        confluence_client,
+        "_build_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    async def run():
+        client = ConfluenceClient()
+        return [page["id"] async for page in client.iter_child_pages("1", limit=2)]
+
+    assert asyncio.run(run()) == ["0", "1", "2", "3", "4", "5"]
+    assert [p["start"] for p in seen_params] == ["0", "2", "4"]
+    confluence_client._http_client = None
+
+def test_search_pages_builds_cql(confluence_env, monkeypatch):
+    seen_params = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_params.append(dict(request.url.params))
+        return httpx.Response(200, json={"results": [{"id": "7", "title": "Report"}]})
+
+    monkeypatch.setattr(
+        confluence_client,
+        "_build_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    async def run():
+        return await ConfluenceClient().search_pages(ancestor="123", title='週報 "RD4"', limit=1)
+
+    assert asyncio.run(run()) == [{"id": "7", "title": "Report"}]
+    assert seen_params == [
+        {
+            "cql": 'type = page AND space = "SPACE" AND ancestor = 123'
+            ' AND title ~ "週報 \\"RD4\\"" ORDER BY created DESC',
+            "limit": "1",
+        }
+    ]
+    confluence_client._http_client = None
+
+def test_search_pages_remembers_unsupported_servers(confluence_env, monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(404, text="not found")
+
+    monkeypatch.setattr(
+        confluence_client,
+        "_build_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(confluence_client, "_cql_unsupported", set())
+
+    async def run():
+        client = ConfluenceClient()
+        return await client.search_pages(ancestor="1"), await client.search_pages(ancestor="1")
+
+    assert asyncio.run(run()) == (None, None)
+    assert len(calls) == 1
+    confluence_client._http_client = None
+
+def test_search_pages_falls_back_per_query_on_bad_request(confluence_env, monkeypatch):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(400, text="could not parse cql")
+        return httpx.Response(200, json={"results": [{"id": "1", "title": "Page"}]})
+
+    monkeypatch.setattr(
+        confluence_client,
+        "_build_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(confluence_client, "_cql_unsupported", set())
+
+    async def run():
+        client = ConfluenceClient()
+        return await client.search_pages(title="週報 (*"), await client.search_pages(ancestor="1")
+
+    assert asyncio.run(run()) == (None, [{"id": "1", "title": "Page"}])
+    assert len(calls) == 2
+    assert confluence_client._cql_unsupported == set()
+    confluence_client._http_client = None
+
+def test_reads_are_retried_on_server_errors_but_writes_are_not(confluence_env, monkeypatch):
+    monkeypatch.setattr("backend.src.services.resilience._upstreams", {})
+    monkeypatch.setattr("backend.src.services.resilience.random.uniform", lambda a, b: 0)
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) == 1 or request.method == "POST":
+            return httpx.Response(503, text="busy")
+        return httpx.Response(200, json={"id": "1", "title": "Page"})
+
+    monkeypatch.setattr(
+        confluence_client,
+        "_build_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    async def run():
+        client = ConfluenceClient()
+        page = await client.get_page("1")
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.create_page("SPACE", "1", "New", "<p/>")
+        return page
+
+    assert asyncio.run(run())["title"] == "Page"
+    assert calls == ["GET", "GET", "POST"]
+    confluence_client._http_client = None
+
+def test_superseded_client_is_closed_on_its_own_loop(monkeypatch):
+    clients = []
+
+    def build():
+        client = MagicMock(aclose=AsyncMock())
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(confluence_client, "_build_http_client", build)
+    monkeypatch.setattr(confluence_client, "_http_client", None)
+    monkeypatch.setattr(confluence_client, "_http_client_loop", None)
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+    try:
+        async def create():
+            return get_http_client()
+
+        first = asyncio.run_coroutine_threadsafe(create(), other_loop).result()
+
+        async def run():
+            second = get_http_client()
+            await asyncio.sleep(0.05)  # Let the other loop run the close
+            await confluence_client.close_http_client()
+            return second
+
+        second = asyncio.run(run())
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+
+    assert clients == [first, second]
+    first.aclose.assert_awaited_once()
+    second.aclose.assert_awaited_once()
+    assert confluence_client._http_client is None
+
+def test_client_from_a_finished_loop_is_logged(monkeypatch, caplog):
+    monkeypatch.setattr(
+        confluence_client, "_build_http_client", lambda: MagicMock(aclose=AsyncMock())
+    )
+    monkeypatch.setattr(confluence_client, "_http_client", None)
+    monkeypatch.setattr(confluence_client, "_http_client_loop", None)
+
+    async def create():
+        return get_http_client()
+
+    stale = asyncio.run(create())
+    with caplog.at_level("WARNING", logger=confluence_client.__name__):
+        asyncio.run(create())
+
+    stale.aclose.assert_not_awaited()
+    assert "event loop has closed" in caplog.text
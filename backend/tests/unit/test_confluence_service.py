@@ -1,9 +1,11 @@
+import asyncio
 from datetime import date
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from backend.src.models.config import ConfluenceConfig
-from backend.src.services.confluence_service import ConfluenceService
+from backend.src.services.confluence_service import LATEST_REPORT_CANDIDATES, ConfluenceService
+from backend.src.services.report_title import WeeklyReportTitle
 
 
 # Fixture for a mock ConfluenceConfig
@@ -90,3 +92,386 @@ def test_create_weekly_report_failure(
     with pytest.raises(Exception, match="Failed to create Confluence page"):
         service.create_weekly_report(mock_confluence_config)
     mock_post.assert_called_once()
+
+def test_create_weekly_reports_bounds_concurrency_and_times_out(monkeypatch):
+    from backend.src.models.schedule import WeeklyReportTarget
+    from backend.src.services import confluence_service
+
+    class FakeService:
+        in_flight = 0
+        peak = 0
+
+        def __init__(self, space_key=None, **kwargs):
+            self.space_key = space_key
+
+        async def create_next_weekly_report(self):
+            FakeService.in_flight += 1
+            FakeService.peak = max(FakeService.peak, FakeService.in_flight)
+            try:
+                if self.space_key == "SLOW":
+                    await asyncio.sleep(1)
+                if self.space_key == "BROKEN":
+                    raise Exception("Confluence API Error")
+                await asyncio.sleep(0.01)
+                return f"https://wiki/{self.space_key}"
+            finally:
+                FakeService.in_flight -= 1
+
+    monkeypatch.setattr(confluence_service, "ConfluenceService", FakeService)
+    targets = [WeeklyReportTarget(team=f"team{i}", space_key=f"S{i}") for i in range(6)]
+    targets.append(WeeklyReportTarget(team="slow", space_key="SLOW"))
+    targets.append(WeeklyReportTarget(team="broken", space_key="BROKEN"))
+
+    results = asyncio.run(
+        confluence_service.create_weekly_reports(targets, max_concurrency=3, timeout_seconds=0.2)
+    )
+
+    assert FakeService.peak <= 3
+    assert results["team0"].status == "created"
+    assert results["team0"].url == "https://wiki/S0"
+    assert results["slow"].status == "timeout"
+    assert results["broken"].status == "failed"
+    assert results["broken"].error == "Confluence API Error"
+
+def _streaming_service(monkeypatch, pages):
+    from backend.src.services import confluence_service
+
+    consumed = []
+
+    async def iter_child_pages(page_id, orderby=None):
+        for page in pages:
+            consumed.append(page["id"])
+            yield page
+
+    client = MagicMock()
+    client.iter_child_pages = iter_child_pages
+    client.search_pages = AsyncMock(return_value=None) # CQL unavailable
+    monkeypatch.setattr(confluence_service, "ConfluenceClient", lambda space_key=None: client)
+    return ConfluenceService(), consumed
+
+def test_find_latest_weekly_report_streams_running_max(monkeypatch):
+    pages = [
+        {"id": "1", "title": "2025 W02 RD4 團隊週報 (0106-0110)"},
+        {"id": "2", "title": "Meeting notes"},
+        {"id": "3", "title": "2025 W03 RD4 團隊週報 (0113-0117)"},
+        {"id": "4", "title": "2024 W52 RD4 團隊週報 (1223-1227)"},
+    ]
+    service, consumed = _streaming_service(monkeypatch, pages)
+    latest = asyncio.run(service._find_latest_weekly_report("root"))
+    assert latest["id"] == "3"
+    assert consumed == ["1", "2", "3", "4"]
+
+def test_find_latest_weekly_report_ignores_creation_order(monkeypatch):
+    # Newest first by creation, but the second page was a backfilled older week.
+    pages = [
+        {"id": "3", "title": "2025 W02 RD4 團隊週報 (0106-0110)"},
+        {"id": "2", "title": "2025 W03 RD4 團隊週報 (0113-0117)"},
+        {"id": "1", "title": "2025 W01 RD4 團隊週報 (1230-0103)"},
+    ]
+    service, consumed = _streaming_service(monkeypatch, pages)
+    latest = asyncio.run(service._find_latest_weekly_report("root"))
+    assert latest["id"] == "2"
+    assert consumed == ["3", "2", "1"]
+
+def test_find_latest_weekly_report_uses_cql_search(monkeypatch):
+    pages = [{"id": "1", "title": "2025 W02 RD4 團隊週報 (0106-0110)"}]
+    service, consumed = _streaming_service(monkeypatch, pages)
+    newest = {"id": "9", "title": "2025 W09 RD4 團隊週報 (0224-0228)"}
+    service.confluence_client.search_pages = AsyncMock(return_value=[newest])
+
+    latest = asyncio.run(service._find_latest_weekly_report("root"))
+
+    assert latest is newest
+    assert consumed == []
+    service.confluence_client.search_pages.assert_awaited_once_with(
+        ancestor="root", title=None, limit=LATEST_REPORT_CANDIDATES
+    )
+
+def test_find_latest_weekly_report_compares_cql_results_by_week(monkeypatch):
+    service, consumed = _streaming_service(monkeypatch, [])
+    # A backfilled week was created after the latest one.
+    service.confluence_client.search_pages = AsyncMock(
+        return_value=[
+            {"id": "5", "title": "2025 W05 RD4 團隊週報 (0127-0131)"},
+            {"id": "2", "title": "Meeting notes"},
+            {"id": "9", "title": "2025 W09 RD4 團隊週報 (0224-0228)"},
+        ]
+    )
+
+    latest = asyncio.run(service._find_latest_weekly_report("root"))
+
+    assert latest["id"] == "9"
+    assert consumed == []
+
+def test_find_latest_weekly_report_scans_when_newest_page_is_not_a_report(monkeypatch):
+    pages = [{"id": "1", "title": "2025 W02 RD4 團隊週報 (0106-0110)"}]
+    service, consumed = _streaming_service(monkeypatch, pages)
+    service.confluence_client.search_pages = AsyncMock(
+        return_value=[{"id": "2", "title": "Meeting notes"}]
+    )
+
+    latest = asyncio.run(service._find_latest_weekly_report("root"))
+
+    assert latest["id"] == "1"
+    assert consumed == ["1"]
+
+def test_create_weekly_reports_range_crosses_year_with_one_scan(monkeypatch, tmp_path):
+    from backend.src.services import confluence_service
+    from backend.src.services.report_index import LocalReportIndexStore, ReportIndex
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2025, 12, 17)
+
+    monkeypatch.setattr(confluence_service.datetime, "date", FakeDate)
+    service, consumed = _streaming_service(
+        monkeypatch, [{"id": "10", "title": "2025 W51 RD4 週報 (1215-1219)"}]
+    )
+    client = service.confluence_client
+    client.space_key = "RD4"
+    client.get_page_by_title = AsyncMock(
+        side_effect=lambda title: {"id": title[-4:], "title": title}
+    )
+    copies = iter(range(100, 200))
+
+    async def copy_page(page_id, destination, title=None):
+        if "0105" in title:
+            raise Exception("conflict")
+        copy_id = str(next(copies))
+        return {
+            "id": copy_id,
+            "title": title,
+            "version": {"number": 1},
+            "_links": {"webui": f"/pages/{copy_id}"},
+        }
+
+    client.copy_page = AsyncMock(side_effect=copy_page)
+    client.update_page = AsyncMock()
+    service.report_index = ReportIndex(LocalReportIndexStore(str(tmp_path / "index.json")))
+
+    results = asyncio.run(service.create_weekly_reports_range(weeks=3, max_concurrency=2))
+
+    assert [(r.title, r.status) for r in results] == [
+        ("2025 W52 RD4 週報 (1222-1226)", "created"),
+        ("2025 W01 RD4 週報 (1229-0102)", "created"),
+        ("2026 W02 RD4 週報 (0105-0109)", "failed"),
+    ]
+    assert consumed == ["10"]
+    assert [c.args[0] for c in client.get_page_by_title.await_args_list] == ["團隊週會 2025", "團隊週會 2026"]
+    destinations = [
+        c.kwargs["destination"]["destination"]["value"] for c in client.copy_page.await_args_list
+    ]
+    assert sorted(destinations) == ["2025", "2025", "2026"]
+    client.update_page.assert_not_awaited()
+    entry = asyncio.run(service.report_index.get("RD4", 2025))
+    assert entry.latest_report_title == "2025 W01 RD4 週報 (1229-0102)"
+
+def test_create_weekly_reports_range_backfills_from_last_years_folder(monkeypatch):
+    from backend.src.services import confluence_service
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2026, 1, 12)
+
+    monkeypatch.setattr(confluence_service.datetime, "date", FakeDate)
+    service, consumed = _streaming_service(
+        monkeypatch, [{"id": "10", "title": "2025 W51 RD4 週報 (1215-1219)"}]
+    )
+    service.report_index = None
+    client = service.confluence_client
+    client.space_key = "RD4"
+    client.get_page_by_title = AsyncMock(
+        side_effect=lambda title: {"id": "2025", "title": title} if title == "團隊週會 2025" else None
+    )
+    client.create_page = AsyncMock(return_value={"id": "2026", "title": "團隊週會 2026"})
+    copies = iter(range(100, 200))
+
+    async def copy_page(page_id, destination, title=None):
+        copy_id = str(next(copies))
+        return {"id": copy_id, "title": title, "_links": {"webui": f"/pages/{copy_id}"}}
+
+    client.copy_page = AsyncMock(side_effect=copy_page)
+
+    results = asyncio.run(service.create_weekly_reports_range(through=date(2026, 1, 16)))
+
+    assert [(r.title, r.status) for r in results] == [
+        ("2025 W52 RD4 週報 (1222-1226)", "created"),
+        ("2025 W01 RD4 週報 (1229-0102)", "created"),
+        ("2026 W02 RD4 週報 (0105-0109)", "created"),
+        ("2026 W03 RD4 週報 (0112-0116)", "created"),
+    ]
+    assert consumed == ["10"]
+    client.create_page.assert_awaited_once()
+    assert client.create_page.await_args.kwargs["title"] == "團隊週會 2026"
+    destinations = [
+        c.kwargs["destination"]["destination"]["value"] for c in client.copy_page.await_args_list
+    ]
+    assert sorted(destinations) == ["2025", "2025", "2026", "2026"]
+
+def test_create_next_weekly_report_continues_from_last_years_folder(monkeypatch):
+    from backend.src.services import confluence_service
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2026, 1, 7)
+
+    monkeypatch.setattr(confluence_service.datetime, "date", FakeDate)
+    service, _ = _streaming_service(
+        monkeypatch, [{"id": "10", "title": "2025 W01 RD4 週報 (1229-0102)"}]
+    )
+    service.report_index = None
+    client = service.confluence_client
+    roots = {"團隊週會 2025": {"id": "2025", "title": "團隊週會 2025"}}
+    client.get_page_by_title = AsyncMock(side_effect=roots.get)
+    client.create_page = AsyncMock(return_value={"id": "2026", "title": "團隊週會 2026"})
+    client.copy_page = AsyncMock(
+        return_value={"id": "11", "title": "2026 W02 RD4 週報 (0105-0109)", "_links": {"webui": "/pages/11"}}
+    )
+
+    assert asyncio.run(service.create_next_weekly_report()) == "/pages/11"
+    assert client.copy_page.await_args.kwargs["destination"]["destination"]["value"] == "2026"
+    client.create_page.assert_awaited_once()
+
+def test_find_latest_creates_no_root_when_no_reports_exist(monkeypatch):
+    service, _ = _streaming_service(monkeypatch, [])
+    service.report_index = None
+    client = service.confluence_client
+    client.get_page_by_title = AsyncMock(return_value=None)
+    client.create_page = AsyncMock()
+
+    with pytest.raises(Exception, match="No weekly reports found"):
+        asyncio.run(service._find_latest(2026))
+
+    assert [c.args[0] for c in client.get_page_by_title.await_args_list] == ["團隊週會 2026", "團隊週會 2025"]
+    client.create_page.assert_not_awaited()
+
+def test_create_weekly_reports_range_backfills_through_date(monkeypatch):
+    service, _ = _streaming_service(monkeypatch, [])
+    service.report_index = None
+    latest = {"id": "10", "title": "2025 W02 RD4 週報 (0106-0110)"}
+    service._find_latest = AsyncMock(return_value=({"id": "1"}, latest))
+    service._find_or_create_root_page = AsyncMock(return_value=({"id": "2"}, True))
+    service._copy_report = AsyncMock(
+        side_effect=lambda source, title, parent_id: {"id": title, "_links": {"webui": title}}
+    )
+
+    results = asyncio.run(service.create_weekly_reports_range(through=date(2025, 1, 29)))
+
+    assert [r.title for r in results] == [
+        "2025 W03 RD4 週報 (0113-0117)",
+        "2025 W04 RD4 週報 (0120-0124)",
+        "2025 W05 RD4 週報 (0127-0131)",
+    ]
+    assert all(r.status == "created" for r in results)
+
+def test_copy_report_sets_title_in_copy_request(monkeypatch):
+    service, _ = _streaming_service(monkeypatch, [])
+    client = service.confluence_client
+    client.copy_page = AsyncMock(
+        return_value={"id": "5", "title": "2025 W03 RD4 (0113-0117)", "version": {"number": 1}}
+    )
+    client.update_page = AsyncMock()
+
+    page = asyncio.run(
+        service._copy_report({"id": "4"}, "2025 W03 RD4 (0113-0117)", "root")
+    )
+
+    assert page["id"] == "5"
+    assert client.copy_page.await_args.kwargs["title"] == "2025 W03 RD4 (0113-0117)"
+    client.update_page.assert_not_awaited()
+
+def test_copy_report_renames_when_server_ignores_page_title(monkeypatch):
+    service, _ = _streaming_service(monkeypatch, [])
+    client = service.confluence_client
+    client.copy_page = AsyncMock(
+        return_value={"id": "5", "title": "Copy of report", "version": {"number": 1}}
+    )
+    client.update_page = AsyncMock(return_value={"id": "5", "title": "2025 W03 RD4 (0113-0117)"})
+
+    page = asyncio.run(
+        service._copy_report({"id": "4"}, "2025 W03 RD4 (0113-0117)", "root")
+    )
+
+    assert page["title"] == "2025 W03 RD4 (0113-0117)"
+    client.update_page.assert_awaited_once_with(
+        page_id="5", title="2025 W03 RD4 (0113-0117)", version=2
+    )
+
+def test_create_report_renders_cached_template(monkeypatch):
+    from backend.src.models.config import OnCallPerson, OnCallSchedule
+    from backend.src.services import confluence_service, report_template
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2025, 1, 8)
+
+    monkeypatch.setattr(confluence_service.datetime, "date", FakeDate)
+    monkeypatch.setattr(report_template, "_report_template_cache", None)
+    service, _ = _streaming_service(monkeypatch, [])
+    service.template_page_id = "77"
+    service.on_call_schedule = OnCallSchedule(
+        current_index=1,
+        roster=[
+            OnCallPerson(name="Alice", slack_user_id="U1"),
+            OnCallPerson(name="Bob & Co", slack_user_id="U2"),
+        ],
+    )
+    client = service.confluence_client
+    client.space_key = "RD4"
+    client.base_url = "https://wiki"
+    client.get_page_content = AsyncMock(
+        return_value={
+            "version": {"number": 3},
+            "body": {
+                "storage": {"value": "<p>W{{week}} {{date_range}} {{ on_call }} {{unknown}}</p>"}
+            },
+        }
+    )
+    client.create_page = AsyncMock(side_effect=lambda **kwargs: kwargs)
+    client.copy_page = AsyncMock()
+    title = WeeklyReportTitle.for_week("RD4 週報", date(2025, 1, 13))
+
+    async def run():
+        return await asyncio.gather(
+            service._create_report({"id": "4"}, title, "root"),
+            service._create_report({"id": "4"}, title.next_week(), "root"),
+        )
+
+    first, second = asyncio.run(run())
+
+    assert first["title"] == "2025 W03 RD4 週報 (0113-0117)"
+    assert first["content"] == "<p>W03 0113-0117 Bob &amp; Co {{unknown}}</p>"
+    assert second["content"].startswith("<p>W04 0120-0124")
+    client.get_page_content.assert_awaited_once_with("77")
+    client.copy_page.assert_not_awaited()
+
+def test_on_call_without_calendar_moves_along_the_roster_by_week(monkeypatch):
+    from backend.src.models.config import OnCallPerson, OnCallSchedule
+    from backend.src.services import confluence_service
+
+    class FakeDate(date):
+        @classmethod
+        def today(cls):
+            return cls(2025, 1, 10)
+
+    monkeypatch.setattr(confluence_service.datetime, "date", FakeDate)
+    service, _ = _streaming_service(monkeypatch, [])
+    service.on_call_schedule = OnCallSchedule(
+        current_index=1,
+        roster=[
+            OnCallPerson(name="Alice", slack_user_id="U1"),
+            OnCallPerson(name="Bob", slack_user_id="U2"),
+            OnCallPerson(name="Carol", slack_user_id="U3"),
+        ],
+    )
+
+    names = [
+        service._on_call_for(monday).name
+        for monday in (date(2025, 1, 6), date(2025, 1, 13), date(2025, 1, 20), date(2025, 1, 27))
+    ]
+
+    assert names == ["Alice", "Bob", "Carol", "Alice"]
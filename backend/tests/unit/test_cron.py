@@ -0,0 +1,45 @@
+import datetime
+
+import pytest
+from backend.src.services.cron import CronSchedule, compile_cron
+
+UTC = datetime.timezone.utc
+
+
+def _utc(*args) -> datetime.datetime:
+    return datetime.datetime(*args, tzinfo=UTC)
+
+def test_next_fire_for_weekly_defaults():
+    # The default on-call schedule: Friday 18:00.
+    schedule = CronSchedule("0 18 * * 5")
+    assert schedule.next_fire(_utc(2026, 10, 18, 12)) == _utc(2026, 10, 23, 18)
+    assert schedule.next_fire(_utc(2026, 10, 23, 18)) == _utc(2026, 10, 30, 18)
+    assert schedule.next_fire(_utc(2026, 10, 23, 17, 59, 30)) == _utc(2026, 10, 23, 18)
+
+def test_next_fire_with_ranges_steps_and_names():
+    schedule = CronSchedule("*/15 9-17 * * mon-fri")
+    assert schedule.next_fire(_utc(2026, 10, 16, 17, 50)) == _utc(2026, 10, 19, 9)
+    assert schedule.next_fire(_utc(2026, 10, 19, 9, 1)) == _utc(2026, 10, 19, 9, 15)
+
+def test_next_fire_rolls_over_months_and_years():
+    assert CronSchedule("0 0 1 jan *").next_fire(_utc(2026, 3, 1)) == _utc(2027, 1, 1)
+    assert CronSchedule("0 0 29 2 *").next_fire(_utc(2026, 3, 1)) == _utc(2028, 2, 29)
+    assert CronSchedule("@monthly").next_fire(_utc(2026, 1, 31, 12)) == _utc(2026, 2, 1)
+
+def test_day_of_month_and_weekday_match_either_when_both_restricted():
+    schedule = CronSchedule("0 0 13 * 5") # The 13th, or any Friday
+    assert schedule.next_fire(_utc(2026, 10, 10)) == _utc(2026, 10, 13)
+    assert schedule.next_fire(_utc(2026, 10, 13)) == _utc(2026, 10, 16)
+
+def test_sunday_can_be_zero_or_seven():
+    assert CronSchedule("0 0 * * 7").weekdays == CronSchedule("0 0 * * 0").weekdays
+
+def test_next_fire_in_time_zone():
+    schedule = compile_cron("0 10 * * 1", "Asia/Taipei")
+    assert schedule.next_fire(_utc(2026, 10, 18)) == _utc(2026, 10, 19, 2)
+    assert compile_cron("0 10 * * 1", "Asia/Taipei") is schedule
+
+@pytest.mark.parametrize("expression", ["0 18 * *", "60 * * * *", "0 0 0 * *", "*/0 * * * *", "x * * * *"])
+def test_invalid_expressions_raise(expression):
+    with pytest.raises(ValueError):
+        CronSchedule(expression)
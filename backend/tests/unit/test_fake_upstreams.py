@@ -0,0 +1,78 @@
+import asyncio
+import datetime
+import json
+
+import httpx
+import pytest
+from backend.benchmarks.fake_upstreams import FakeConfluence, FakeGCS, FakeSlack
+from backend.src.services import confluence_client, resilience
+from backend.src.services.config_backend import ConfigConflictError
+from backend.src.services.confluence_client import ConfluenceClient
+
+
+@pytest.fixture(autouse=True)
+def fresh_upstreams(monkeypatch):
+    monkeypatch.setattr(resilience, "_upstreams", {})
+    yield
+    confluence_client._http_client = None
+    confluence_client._http_client_loop = None
+
+def test_fake_confluence_serves_the_client(monkeypatch):
+    with FakeConfluence() as fake:
+        monkeypatch.setenv("CONFLUENCE_DOMAIN", fake.url)
+        monkeypatch.setenv("CONFLUENCE_USERNAME", "user")
+        monkeypatch.setenv("CONFLUENCE_API_TOKEN", "token")
+        monkeypatch.setenv("CONFLUENCE_SPACE_KEY", "TEAM")
+        monkeypatch.setenv("CONFLUENCE_HTTP2", "false")
+
+        async def run():
+            client = ConfluenceClient()
+            root = await client.get_page_by_title(f"團隊週會 {datetime.date.today().year}")
+            [report] = await client.get_child_pages(root["id"])
+            destination = {"destination": {"type": "parent_page", "value": root["id"]}}
+            copy = await client.copy_page(report["id"], destination, title="Next week")
+            with pytest.raises(httpx.HTTPStatusError) as excinfo:
+                await client.copy_page(report["id"], destination, title="Next week")
+            children = [page async for page in client.iter_child_pages(root["id"], limit=1)]
+            await confluence_client.close_http_client()
+            return report, copy, excinfo.value.response.status_code, children
+
+        report, copy, duplicate_status, children = asyncio.run(run())
+
+    assert copy["title"] == "Next week"
+    assert duplicate_status == 400 # Titles are unique per space
+    assert [page["id"] for page in children] == [report["id"], copy["id"]]
+
+def test_fake_gcs_enforces_generation_preconditions(monkeypatch):
+    with FakeGCS() as fake:
+        monkeypatch.setenv("STORAGE_EMULATOR_HOST", fake.url)
+        monkeypatch.setenv("GOOGLE_CLOUD_PROJECT", "test")
+        fake.put_object("bucket", "config.json", json.dumps({"value": 1}).encode())
+        from backend.src.services.gcs_service import GCSConfigService
+
+        service = GCSConfigService("bucket", "config.json")
+        assert service.load_config() == {"value": 1}
+        service.save_config({"value": 2}, if_generation_match=service.generation)
+        with pytest.raises(ConfigConflictError):
+            service.save_config({"value": 3}, if_generation_match=1)
+
+        assert json.loads(fake.get_object("bucket", "config.json")) == {"value": 2}
+
+def test_fakes_inject_errors_and_rate_limits():
+    with FakeSlack(rate_limit=1, burst=1) as slack, FakeGCS(error_rate=1.0) as gcs:
+        headers = {"Authorization": "Bearer token"}
+        posted = httpx.post(
+            f"{slack.url}/api/chat.postMessage", json={"channel": "C1", "text": "hi"}, headers=headers
+        )
+        limited = httpx.post(
+            f"{slack.url}/api/chat.postMessage", json={"channel": "C1", "text": "hi"}, headers=headers
+        )
+        failed = httpx.get(f"{gcs.url}/storage/v1/b/bucket/o/config.json")
+
+    assert posted.json()["ok"] is True
+    assert limited.status_code == 429
+    assert limited.json() == {"ok": False, "error": "ratelimited"}
+    assert limited.headers["Retry-After"] == "1"
+    assert failed.status_code == 503
+    assert slack.messages == [{"channel": "C1", "text": "hi"}]
+    assert slack.stats()["rate_limited"] == 1 and gcs.stats()["injected_errors"] == 1
@@ -25,7 +25,6 @@ def mock_gcs_blob(mock_gcs_bucket):
 def test_gcs_config_service_init(mock_gcs_client, mock_gcs_bucket, mock_gcs_blob):
     service = GCSConfigService("test-bucket", "test-path.json")
     mock_gcs_client.bucket.assert_called_with("test-bucket")
-    mock_gcs_bucket.blob.assert_called_with("test-path.json")
     assert service.bucket_name == "test-bucket"
     assert service.config_file_path == "test-path.json"
 
@@ -37,12 +36,35 @@ def test_load_config_success(mock_gcs_blob):
     mock_gcs_blob.download_as_text.assert_called_once()
 
 def test_load_config_file_not_found(mock_gcs_blob):
-    mock_gcs_blob.download_as_text.side_effect = Exception("File not found")
+    from google.api_core.exceptions import NotFound
+
+    mock_gcs_blob.download_as_text.side_effect = NotFound("File not found")
     service = GCSConfigService("test-bucket", "test-path.json")
     config = service.load_config()
-    assert config == {} # Should return empty dict on error
+    assert config == {} # A missing config file loads as empty
     mock_gcs_blob.download_as_text.assert_called_once()
 
+def test_load_config_raises_other_errors_without_a_cached_config(mock_gcs_blob, monkeypatch):
+    from google.api_core.exceptions import Forbidden
+
+    monkeypatch.setattr("backend.src.services.resilience._upstreams", {})
+    mock_gcs_blob.download_as_text.side_effect = Forbidden("denied")
+    service = GCSConfigService("test-bucket", "test-path.json")
+    with pytest.raises(Forbidden):
+        service.load_config()
+    mock_gcs_blob.download_as_text.assert_called_once() # Not transient, so not retried
+
+def test_load_config_retries_transient_errors(mock_gcs_blob, monkeypatch):
+    from google.api_core.exceptions import ServiceUnavailable
+
+    monkeypatch.setattr("backend.src.services.resilience._upstreams", {})
+    monkeypatch.setattr("backend.src.services.resilience.random.uniform", lambda a, b: 0)
+    mock_gcs_blob.generation = 1
+    mock_gcs_blob.download_as_text.side_effect = [ServiceUnavailable("busy"), '{"key": "value"}']
+    service = GCSConfigService("test-bucket", "test-path.json")
+    assert service.load_config() == {"key": "value"}
+    assert mock_gcs_blob.download_as_text.call_args.kwargs["retry"] is None
+
 def test_save_config_success(mock_gcs_blob):
     service = GCSConfigService("test-bucket", "test-path.json")
     config_data = {"new_key": "new_value"}
@@ -71,3 +93,104 @@ def test_get_gcs_config_service_no_bucket_name(mock_getenv):
     mock_getenv.side_effect = lambda x: None if x == "GCS_BUCKET_NAME" else "config.json"
     with pytest.raises(ValueError, match="GCS_BUCKET_NAME environment variable not set."):
         get_gcs_config_service()
+
+def test_load_config_reuses_cache_when_generation_unchanged(mock_gcs_blob):
+    mock_gcs_blob.generation = 1
+    mock_gcs_blob.download_as_text.return_value = '{"key": "value"}'
+    service = GCSConfigService("test-bucket", "test-path.json")
+
+    assert service.load_config() == {"key": "value"}
+    assert service.load_config() == {"key": "value"}
+
+    mock_gcs_blob.download_as_text.assert_called_once()
+    mock_gcs_blob.reload.assert_called_once()
+    assert service.cache_stats() == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+
+def test_load_config_redownloads_when_generation_changes(mock_gcs_blob):
+    mock_gcs_blob.generation = 1
+    mock_gcs_blob.download_as_text.return_value = '{"key": "old"}'
+    service = GCSConfigService("test-bucket", "test-path.json")
+    service.load_config()
+
+    mock_gcs_blob.generation = 2
+    mock_gcs_blob.download_as_text.return_value = '{"key": "new"}'
+
+    assert service.load_config() == {"key": "new"}
+    assert service.generation == 2
+    assert service.cache_misses == 2
+
+def test_load_config_trusts_cache_within_ttl(mock_gcs_blob):
+    mock_gcs_blob.generation = 1
+    mock_gcs_blob.download_as_text.return_value = '{"key": "value"}'
+    service = GCSConfigService("test-bucket", "test-path.json", cache_ttl_seconds=60)
+
+    service.load_config()
+    service.load_config()
+
+    mock_gcs_blob.reload.assert_not_called()
+    assert service.cache_hits == 1
+
+def test_load_config_serves_cached_config_on_error(mock_gcs_blob):
+    mock_gcs_blob.generation = 1
+    mock_gcs_blob.download_as_text.return_value = '{"key": "value"}'
+    service = GCSConfigService("test-bucket", "test-path.json")
+    service.load_config()
+
+    mock_gcs_blob.reload.side_effect = Exception("GCS unavailable")
+
+    assert service.load_config() == {"key": "value"}
+
+def test_save_config_with_generation_precondition_conflict(mock_gcs_blob):
+    from backend.src.services.config_backend import ConfigConflictError
+    from google.api_core.exceptions import PreconditionFailed
+
+    mock_gcs_blob.upload_from_string.side_effect = PreconditionFailed("conflict")
+    service = GCSConfigService("test-bucket", "test-path.json")
+    with pytest.raises(ConfigConflictError):
+        service.save_config({"key": "value"}, if_generation_match=3)
+    assert mock_gcs_blob.upload_from_string.call_args.kwargs["if_generation_match"] == 3
+
+def test_update_config_retries_and_reapplies_mutator_on_conflict(mock_gcs_blob):
+    from google.api_core.exceptions import PreconditionFailed
+
+    mock_gcs_blob.generation = 1
+    mock_gcs_blob.download_as_text.return_value = '{"count": 1}'
+    service = GCSConfigService("test-bucket", "test-path.json")
+    service.load_config()
+
+    def upload(data, content_type, if_generation_match, **options):
+        if mock_gcs_blob.upload_from_string.call_count == 1:
+            # Another writer got there first
+            mock_gcs_blob.generation = 2
+            mock_gcs_blob.download_as_text.return_value = '{"count": 5}'
+            raise PreconditionFailed("conflict")
+        mock_gcs_blob.generation = 3
+
+    mock_gcs_blob.upload_from_string.side_effect = upload
+
+    def increment(config):
+        config["count"] += 1
+
+    assert service.update_config(increment) == {"count": 6}
+    preconditions = [
+        c.kwargs["if_generation_match"] for c in mock_gcs_blob.upload_from_string.call_args_list
+    ]
+    assert preconditions == [1, 2]
+    assert service.generation == 3
+
+def test_concurrent_calls_use_their_own_blobs(mock_gcs_bucket):
+    blobs = []
+
+    def new_blob(name):
+        blob = MagicMock()
+        blob.generation = len(blobs) + 1
+        blob.download_as_text.return_value = f'{{"read": {blob.generation}}}'
+        blobs.append(blob)
+        return blob
+
+    mock_gcs_bucket.blob.side_effect = new_blob
+    service = GCSConfigService("test-bucket", "test-path.json")
+
+    assert service.read_document("test-path.json") == ({"read": 1}, 1)
+    assert service.get_generation("test-path.json") == 2 # A reload does not touch the first blob
+    assert blobs[0].generation == 1
@@ -0,0 +1,129 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from backend.src.services.file_config_backend import FileConfigBackend
+from backend.src.services.idempotency import (
+    ConfigBackendIdempotencyStore,
+    IdempotencyStore,
+    NotRecorded,
+    derive_idempotency_key,
+)
+
+
+def test_duplicate_key_replays_first_response():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        return {"message": "created"}
+
+    async def run():
+        store = IdempotencyStore()
+        first = await store.run("weekly:2026-W10", work)
+        second = await store.run("weekly:2026-W10", work)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first == ({"message": "created"}, False)
+    assert second == ({"message": "created"}, True)
+    assert calls == 1
+
+def test_concurrent_duplicates_share_in_flight_run():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"message": "created"}
+
+    async def run():
+        store = IdempotencyStore()
+        return await asyncio.gather(*(store.run("key", work) for _ in range(3)))
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert [replayed for _, replayed in results] == [False, True, True]
+
+def test_failures_are_not_recorded():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("Confluence unavailable")
+        return {"message": "created"}
+
+    async def run():
+        store = IdempotencyStore()
+        with pytest.raises(RuntimeError):
+            await store.run("key", work)
+        return await store.run("key", work)
+
+    assert asyncio.run(run()) == ({"message": "created"}, False)
+    assert calls == 2
+
+def test_not_recorded_responses_run_again():
+    enabled = False
+
+    async def work():
+        if not enabled:
+            return NotRecorded({"message": "disabled"})
+        return {"message": "created"}
+
+    async def run():
+        nonlocal enabled
+        store = IdempotencyStore()
+        skipped = await store.run("weekly:2026-W10", work)
+        enabled = True # Turned on later in the same week
+        return skipped, await store.run("weekly:2026-W10", work)
+
+    skipped, created = asyncio.run(run())
+    assert skipped == ({"message": "disabled"}, False)
+    assert created == ({"message": "created"}, False)
+
+def test_expired_and_evicted_records_run_again():
+    async def work():
+        return {}
+
+    async def run():
+        store = IdempotencyStore(max_entries=1)
+        await store.run("a", work)
+        await store.run("b", work)
+        evicted = await store.run("a", work)
+        store.ttl_seconds = 0
+        await store.run("c", work)
+        expired = await store.run("c", work)
+        return evicted, expired
+
+    evicted, expired = asyncio.run(run())
+    assert evicted[1] is False
+    assert expired[1] is False
+
+def test_persistent_store_dedups_across_instances(tmp_path):
+    backend = FileConfigBackend(str(tmp_path / "config.json"))
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        return {"message": "created"}
+
+    async def run():
+        first = IdempotencyStore(store=ConfigBackendIdempotencyStore("idempotency.json"))
+        second = IdempotencyStore(store=ConfigBackendIdempotencyStore("idempotency.json"))
+        await first.run("key", work)
+        return await second.run("key", work)
+
+    with patch("backend.src.services.config_backend.get_config_backend", return_value=backend):
+        assert asyncio.run(run()) == ({"message": "created"}, True)
+    assert calls == 1
+
+def test_derived_key_uses_iso_week_and_payload():
+    key = derive_idempotency_key("on-call-notification")
+    assert key.startswith("on-call-notification:")
+    assert "-W" in key
+    assert derive_idempotency_key("batch", "a") != derive_idempotency_key("batch", "b")
@@ -0,0 +1,73 @@
+import asyncio
+
+from backend.src.services.job_runner import JobRunner
+from backend.src.services.telemetry import track_upstream
+
+
+def test_job_runner_records_result_and_timings():
+    async def work():
+        with track_upstream("confluence", "copy_page"):
+            await asyncio.sleep(0)
+        await asyncio.to_thread(_slack_call)
+        return {"message": "done"}
+
+    def _slack_call():
+        with track_upstream("slack", "chat.postMessage"):
+            pass
+
+    async def run():
+        runner = JobRunner(max_workers=2)
+        job = runner.submit("test", work)
+        assert job.status == "queued"
+        await runner.shutdown()
+        return runner.get(job.id)
+
+    job = asyncio.run(run())
+    assert job.status == "succeeded"
+    assert job.result == {"message": "done"}
+    assert [(t.upstream, t.operation, t.ok) for t in job.timings] == [
+        ("confluence", "copy_page", True),
+        ("slack", "chat.postMessage", True),
+    ]
+    assert job.started_at <= job.finished_at
+
+def test_job_runner_records_failure_and_bounds_workers():
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        raise ValueError("upstream down")
+
+    async def run():
+        runner = JobRunner(max_workers=2)
+        jobs = [runner.submit("test", work) for _ in range(5)]
+        await runner.shutdown()
+        return jobs
+
+    jobs = asyncio.run(run())
+    assert peak == 2
+    assert {job.status for job in jobs} == {"failed"}
+    assert jobs[0].error == "upstream down"
+
+def test_job_runner_evicts_oldest_finished_jobs():
+    async def work():
+        return {}
+
+    async def run():
+        runner = JobRunner(max_jobs=2)
+        first = runner.submit("test", work)
+        await runner.shutdown()
+        runner.submit("test", work)
+        await runner.shutdown()
+        last = runner.submit("test", work)
+        await runner.shutdown()
+        return runner, first, last
+
+    runner, first, last = asyncio.run(run())
+    assert runner.get(first.id) is None
+    assert runner.get(last.id) is not None
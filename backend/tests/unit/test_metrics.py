@@ -0,0 +1,55 @@
+import threading
+
+from backend.src.services import metrics
+from backend.src.services.metrics import Counter, Histogram, render_metrics
+from backend.src.services.resilience import get_upstream
+from backend.src.services.telemetry import track_upstream
+
+
+def test_histogram_merges_thread_shards_into_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test latency.", ("route",), buckets=(0.1, 1.0))
+
+    def record():
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value, "/a")
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(histogram._shards) == 4
+    assert histogram.render() == [
+        "# HELP test_seconds Test latency.",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{route="/a",le="0.1"} 8',
+        'test_seconds_bucket{route="/a",le="1"} 12',
+        'test_seconds_bucket{route="/a",le="+Inf"} 16',
+        'test_seconds_sum{route="/a"} 10.6',
+        'test_seconds_count{route="/a"} 16',
+    ]
+
+def test_counter_escapes_label_values():
+    counter = Counter("test_total", "Test count.", ("name",))
+    counter.inc('a "quoted"\nname')
+    counter.inc('a "quoted"\nname', amount=2)
+
+    assert counter.render()[-1] == 'test_total{name="a \\"quoted\\"\\nname"} 3'
+
+def test_render_includes_upstream_calls_jobs_and_breakers(monkeypatch):
+    monkeypatch.setattr("backend.src.services.resilience._upstreams", {})
+    get_upstream("confluence")
+    before = metrics.upstream_duration.count("confluence", "metrics_test", "error")
+    try:
+        with track_upstream("confluence", "metrics_test"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    metrics.record_job("metrics-test", "succeeded", 0.2)
+
+    text = render_metrics()
+    assert metrics.upstream_duration.count("confluence", "metrics_test", "error") == before + 1
+    assert 'jobs_total{job_type="metrics-test",outcome="succeeded"}' in text
+    assert 'upstream_circuit_state{upstream="confluence",state="closed"} 1' in text
+    assert 'upstream_retries_total{upstream="confluence"} 0' in text
@@ -0,0 +1,74 @@
+import datetime
+
+import pytest
+from backend.src.models.config import OnCallOverride, OnCallPerson, OnCallSchedule, OnCallSwap
+from backend.src.services import oncall_calendar
+from backend.src.services.oncall_calendar import OnCallCalendar
+
+UTC = datetime.timezone.utc
+START = datetime.datetime(2026, 1, 2, 18, tzinfo=UTC) # A Friday handover
+
+
+def _at(days: float) -> datetime.datetime:
+    return START + datetime.timedelta(days=days)
+
+@pytest.fixture
+def schedule():
+    return OnCallSchedule(
+        rotation_start=START,
+        roster=[
+            OnCallPerson(name="Alice", slack_user_id="U01A"),
+            OnCallPerson(name="Bob", slack_user_id="U01B"),
+            OnCallPerson(name="Carol", slack_user_id="U01C")
+        ]
+    )
+
+def test_calendar_cycles_through_roster(schedule):
+    calendar = OnCallCalendar(schedule, _at(70))
+
+    assert len(calendar) == 10
+    assert calendar.at(_at(0)).on_call.name == "Alice"
+    assert calendar.at(_at(6.9)).on_call.name == "Alice"
+    assert calendar.at(_at(7)).on_call.name == "Bob"
+    assert calendar.at(_at(21)).on_call.name == "Alice"
+    assert calendar.at(_at(-1)) is None
+    assert calendar.at(_at(70)) is None
+
+def test_override_splits_and_replaces_shifts(schedule):
+    schedule.overrides = [
+        OnCallOverride(start=_at(5), end=_at(8), name="Dan", slack_user_id="U01D")
+    ]
+    calendar = OnCallCalendar(schedule, _at(28))
+
+    shifts = calendar.between(_at(0), _at(14))
+    assert [(s.on_call.name, s.override) for s in shifts] == [
+        ("Alice", False), ("Dan", True), ("Bob", False)
+    ]
+    assert shifts[1].start == _at(5)
+    assert shifts[1].end == _at(8)
+    assert shifts[2].start == _at(8)
+
+def test_swap_exchanges_two_shifts(schedule):
+    schedule.swaps = [OnCallSwap(first=_at(1), second=_at(15))]
+    calendar = OnCallCalendar(schedule, _at(28))
+
+    assert calendar.at(_at(1)).on_call.name == "Carol"
+    assert calendar.at(_at(15)).on_call.name == "Alice"
+    assert calendar.at(_at(8)).on_call.name == "Bob"
+
+def test_range_query_returns_overlapping_shifts(schedule):
+    calendar = OnCallCalendar(schedule, _at(365 * 3))
+
+    shifts = calendar.between(_at(10), _at(22))
+    assert [s.on_call.name for s in shifts] == ["Bob", "Carol", "Alice"]
+    assert calendar.between(_at(365 * 3 + 1), _at(365 * 3 + 8)) == []
+
+def test_calendar_without_rotation_start_is_empty(schedule):
+    schedule.rotation_start = None
+    assert OnCallCalendar(schedule, _at(28)).at(_at(1)) is None
+
+def test_get_on_call_calendar_reuses_calendar_for_same_schedule(schedule, monkeypatch):
+    monkeypatch.setattr(oncall_calendar, "_calendar", None)
+    first = oncall_calendar.get_on_call_calendar(schedule)
+    assert oncall_calendar.get_on_call_calendar(schedule) is first
+    assert oncall_calendar.get_on_call_calendar(schedule.model_copy()) is not first
@@ -1,14 +1,32 @@
-from unittest.mock import patch
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, patch
 
 import pytest
-from backend.src.models.config import OnCallConfig, OnCallPerson, OnCallSchedule
-from backend.src.services.oncall_service import OnCallService
+from backend.src.models.config import (
+    OnCallConfig,
+    OnCallOverride,
+    OnCallPerson,
+    OnCallSchedule,
+    Rotation,
+)
+from backend.src.services.oncall_service import (
+    OnCallService,
+    RotationIndex,
+    get_rotation_index,
+    is_rotation_due,
+    next_rotation_index,
+    scheduled_handover_at,
+)
 
 
 @pytest.fixture
 def mock_slack_service():
-    with patch('backend.src.services.slack_service.SlackService') as MockSlackService:
-        yield MockSlackService.return_value
+    with patch('backend.src.services.oncall_service.AsyncSlackService') as MockSlackService:
+        mock_instance = MockSlackService.return_value
+        mock_instance.send_message = AsyncMock()
+        mock_instance.update_channel_description = AsyncMock()
+        yield mock_instance
 
 @pytest.fixture
 def mock_app_config():
@@ -28,7 +46,7 @@ def test_notify_on_call_person_success(mock_slack_service, mock_app_config):
     )
 
     service = OnCallService()
-    result_person, result_schedule = service.notify_on_call_person(mock_app_config, on_call_schedule)
+    result_person, result_schedule = asyncio.run(service.notify_on_call_person(mock_app_config, on_call_schedule))
 
     assert result_person.name == "Alice"
     assert result_person.slack_user_id == "U01A"
@@ -50,7 +68,7 @@ def test_notify_on_call_person_roster_empty(mock_slack_service, mock_app_config)
 
     service = OnCallService()
     with pytest.raises(ValueError, match="On-call roster is empty."):
-        service.notify_on_call_person(mock_app_config, on_call_schedule)
+        asyncio.run(service.notify_on_call_person(mock_app_config, on_call_schedule))
 
     mock_slack_service.send_message.assert_not_called()
     mock_slack_service.update_channel_description.assert_not_called()
@@ -65,8 +83,123 @@ def test_notify_on_call_person_index_wraps_around(mock_slack_service, mock_app_c
     )
 
     service = OnCallService()
-    result_person, result_schedule = service.notify_on_call_person(mock_app_config, on_call_schedule)
+    result_person, result_schedule = asyncio.run(service.notify_on_call_person(mock_app_config, on_call_schedule))
 
     assert result_person.name == "Bob"
     assert result_person.slack_user_id == "U01B"
     assert result_schedule.current_index == 0 # Should wrap around to 0
+
+def test_notify_on_call_person_sends_slack_calls_concurrently(mock_slack_service, mock_app_config):
+    in_flight = 0
+    peak = 0
+
+    async def slack_call(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    mock_slack_service.send_message.side_effect = slack_call
+    mock_slack_service.update_channel_description.side_effect = slack_call
+    on_call_schedule = OnCallSchedule(
+        current_index=0,
+        roster=[OnCallPerson(name="Alice", slack_user_id="U01A")]
+    )
+
+    asyncio.run(OnCallService().notify_on_call_person(mock_app_config, on_call_schedule))
+
+    assert peak == 2
+
+def test_notify_on_call_person_pages_the_calendar_person(mock_slack_service, mock_app_config):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    on_call_schedule = OnCallSchedule(
+        current_index=0,
+        rotation_start=now - datetime.timedelta(days=1),
+        roster=[
+            OnCallPerson(name="Alice", slack_user_id="U01A"),
+            OnCallPerson(name="Bob", slack_user_id="U01B")
+        ],
+        overrides=[
+            OnCallOverride(
+                start=now - datetime.timedelta(hours=1),
+                end=now + datetime.timedelta(hours=1),
+                name="Carol",
+                slack_user_id="U01C",
+            )
+        ],
+    )
+
+    person, _ = asyncio.run(OnCallService().notify_on_call_person(mock_app_config, on_call_schedule))
+
+    assert person.slack_user_id == "U01C"
+
+def _rotation(rotation_id, *slack_user_ids, **kwargs):
+    return Rotation(
+        id=rotation_id,
+        slack_channel=f"C-{rotation_id}",
+        roster=[OnCallPerson(name=uid, slack_user_id=uid) for uid in slack_user_ids],
+        **kwargs
+    )
+
+def test_rotation_index_looks_up_by_id_and_slack_user():
+    rotations = [_rotation("api", "U1", "U2"), _rotation("db", "U2", "U3")]
+    index = RotationIndex(rotations)
+
+    assert index.get("db") is rotations[1]
+    assert index.get("missing") is None
+    assert [r.id for r in index.for_slack_user("U2")] == ["api", "db"]
+    assert index.for_slack_user("U9") == []
+    assert get_rotation_index(rotations) is get_rotation_index(rotations)
+
+def test_is_rotation_due_follows_cadence():
+    now = datetime.datetime(2026, 3, 6, 18, tzinfo=datetime.timezone.utc)
+    weekly = _rotation("api", "U1", last_advanced_at=now - datetime.timedelta(days=7, minutes=-5))
+    daily = _rotation("db", "U1", cadence_days=1, last_advanced_at=now - datetime.timedelta(hours=12))
+
+    assert is_rotation_due(weekly, now) # A slightly early trigger still hands over
+    assert not is_rotation_due(daily, now)
+    assert is_rotation_due(_rotation("new", "U1"), now)
+    assert not is_rotation_due(_rotation("off", "U1", enabled=False), now)
+    assert not is_rotation_due(_rotation("empty"), now)
+
+def test_handovers_stay_anchored_to_the_schedule():
+    # Hourly checks starting up to a few seconds late for 12 weeks.
+    last = datetime.datetime(2026, 3, 2, 10, tzinfo=datetime.timezone.utc)
+    rotation = _rotation("api", "U1", last_advanced_at=last)
+    now = last
+    for week in range(12):
+        now += datetime.timedelta(hours=1)
+        while not is_rotation_due(rotation, now + datetime.timedelta(seconds=week % 3)):
+            now += datetime.timedelta(hours=1)
+        rotation.last_advanced_at = scheduled_handover_at(rotation, now)
+
+    assert rotation.last_advanced_at == last + datetime.timedelta(weeks=12)
+    assert now.hour == 9 # The tolerance lets a run an hour early hand over, no earlier
+
+def test_scheduled_handover_skips_missed_periods():
+    now = datetime.datetime(2026, 3, 30, 10, 5, tzinfo=datetime.timezone.utc)
+    last = datetime.datetime(2026, 3, 2, 10, tzinfo=datetime.timezone.utc)
+
+    assert scheduled_handover_at(_rotation("api", "U1", last_advanced_at=last), now) == last + datetime.timedelta(weeks=4)
+    assert scheduled_handover_at(_rotation("new", "U1"), now) == now
+
+def test_next_rotation_index_wraps_and_resets():
+    assert next_rotation_index(_rotation("a", "U1", "U2", current_index=1)) == 0
+    assert next_rotation_index(_rotation("a", "U1", "U2", current_index=5)) == 1
+
+def test_notify_rotations_reports_each_rotation(mock_slack_service):
+    async def send_message(channel, message):
+        if channel == "C-db":
+            raise RuntimeError("channel_not_found")
+
+    mock_slack_service.send_message.side_effect = send_message
+    rotations = [_rotation("api", "U1", "U2", current_index=1), _rotation("db", "U3")]
+
+    results = asyncio.run(OnCallService().notify_rotations(rotations))
+
+    assert results["api"].status == "notified"
+    assert results["api"].slack_user_id == "U2"
+    assert results["db"].status == "failed"
+    assert "channel_not_found" in results["db"].error
+    assert mock_slack_service.update_channel_description.await_count == 2
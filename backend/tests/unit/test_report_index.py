@@ -0,0 +1,182 @@
+import asyncio
+import datetime
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from backend.src.models.report_index import ReportIndexEntry
+from backend.src.services import confluence_service
+from backend.src.services.confluence_service import ConfluenceService
+from backend.src.services.report_index import LocalReportIndexStore, ReportIndex
+
+
+@pytest.fixture
+def report_index(tmp_path):
+    return ReportIndex(LocalReportIndexStore(str(tmp_path / "report_index.json")))
+
+@pytest.fixture
+def mock_client(monkeypatch):
+    client = MagicMock()
+    client.space_key = "RD4"
+
+    async def iter_child_pages(page_id, orderby=None):
+        yield {"id": "10", "title": "2025 W02 RD4 團隊週報 (0106-0110)"}
+
+    client.iter_child_pages = MagicMock(side_effect=iter_child_pages)
+    client.search_pages = AsyncMock(return_value=None) # CQL unavailable
+    client.get_page_by_title = AsyncMock(
+        side_effect=lambda title: {"id": "1", "title": title} if title == "團隊週會 2025" else None
+    )
+    client.copy_page = AsyncMock(return_value={"id": "11", "version": {"number": 1}})
+    client.update_page = AsyncMock(
+        return_value={
+            "id": "11",
+            "title": "2025 W03 RD4 團隊週報 (0113-0117)",
+            "version": {"number": 2},
+            "_links": {"webui": "/pages/11"},
+        }
+    )
+    client.get_page = AsyncMock(
+        return_value={"id": "11", "title": "2025 W03 RD4 團隊週報 (0113-0117)"}
+    )
+    monkeypatch.setattr(confluence_service, "ConfluenceClient", lambda space_key=None: client)
+    return client
+
+def test_report_index_round_trips_through_local_file(report_index, tmp_path):
+    entry = ReportIndexEntry(
+        root_page_id="1",
+        root_page_title="團隊週會 2025",
+        latest_report_id="11",
+        latest_report_title="2025 W03 RD4 團隊週報 (0113-0117)",
+    )
+    asyncio.run(report_index.put("RD4", {2025: entry}))
+
+    stored = json.loads((tmp_path / "report_index.RD4.json").read_text())
+    assert stored["2025"]["latest_report_id"] == "11"
+
+    reloaded = ReportIndex(LocalReportIndexStore(str(tmp_path / "report_index.json")))
+    assert asyncio.run(reloaded.get("RD4", 2025)) == entry
+    assert asyncio.run(reloaded.get("RD4", 2024)) is None
+
+def test_second_run_uses_index_instead_of_scanning(report_index, mock_client, monkeypatch):
+    class FakeDate(datetime.date):
+        @classmethod
+        def today(cls):
+            return cls(2025, 1, 8)
+
+    monkeypatch.setattr(confluence_service.datetime, "date", FakeDate)
+    service = ConfluenceService(report_index=report_index)
+
+    asyncio.run(service.create_next_weekly_report())
+    assert mock_client.get_page_by_title.await_count == 1
+    assert mock_client.iter_child_pages.call_count == 1
+
+    mock_client.update_page.return_value = {
+        "id": "12",
+        "title": "2025 W04 RD4 團隊週報 (0120-0124)",
+        "version": {"number": 2},
+        "_links": {"webui": "/pages/12"},
+    }
+    url = asyncio.run(service.create_next_weekly_report())
+
+    assert url == "/pages/12"
+    # Only the check that the week after the cached report is still free.
+    assert mock_client.get_page_by_title.await_args.args == ("2025 W04 RD4 團隊週報 (0120-0124)",)
+    assert mock_client.iter_child_pages.call_count == 1
+    mock_client.get_page.assert_awaited_once_with("11")
+    assert mock_client.update_page.call_args.kwargs["title"] == "2025 W04 RD4 團隊週報 (0120-0124)"
+
+def test_stale_index_entry_falls_back_to_scan(report_index, mock_client):
+    entry = ReportIndexEntry(
+        root_page_id="1",
+        root_page_title="團隊週會 2025",
+        latest_report_id="99",
+        latest_report_title="2025 W01 RD4 團隊週報 (1230-0103)",
+    )
+    asyncio.run(report_index.put("RD4", {2025: entry}))
+    mock_client.get_page.return_value = None
+    service = ConfluenceService(report_index=report_index)
+
+    root_page, latest = asyncio.run(service._lookup_report_index(2025))
+
+    assert (root_page, latest) == (None, None)
+    assert asyncio.run(report_index.get("RD4", 2025)) is None
+
+def test_index_entry_is_stale_once_the_next_week_exists(report_index, mock_client):
+    entry = ReportIndexEntry(
+        root_page_id="1",
+        root_page_title="團隊週會 2025",
+        latest_report_id="11",
+        latest_report_title="2025 W03 RD4 團隊週報 (0113-0117)",
+    )
+    asyncio.run(report_index.put("RD4", {2025: entry}))
+    # Another instance already created the following week.
+    mock_client.get_page_by_title.side_effect = None
+    mock_client.get_page_by_title.return_value = {"id": "12", "title": "2025 W04 RD4 團隊週報 (0120-0124)"}
+    service = ConfluenceService(report_index=report_index)
+
+    assert asyncio.run(service._lookup_report_index(2025)) == (None, None)
+    assert asyncio.run(report_index.get("RD4", 2025)) is None
+
+def test_instances_sharing_an_index_see_and_keep_each_others_entries(tmp_path):
+    path = str(tmp_path / "report_index.json")
+    first = ReportIndex(LocalReportIndexStore(path))
+    second = ReportIndex(LocalReportIndexStore(path))
+
+    def entry(report_id: str) -> ReportIndexEntry:
+        return ReportIndexEntry(
+            root_page_id="1",
+            root_page_title="團隊週會 2025",
+            latest_report_id=report_id,
+            latest_report_title=f"Report {report_id}",
+        )
+
+    async def run():
+        assert await second.get("RD4", 2025) is None # Loaded before the other write
+        await first.put("RD4", {2025: entry("11")})
+        await second.put("OPS", {2025: entry("21")})
+        return await first.get("OPS", 2025), await second.get("RD4", 2025)
+
+    assert asyncio.run(run()) == (entry("21"), entry("11"))
+
+def test_batch_of_spaces_writes_every_entry(tmp_path):
+    path = str(tmp_path / "report_index.json")
+    instances = [ReportIndex(LocalReportIndexStore(path)) for _ in range(2)]
+    entry = ReportIndexEntry(
+        root_page_id="1",
+        root_page_title="團隊週會 2025",
+        latest_report_id="11",
+        latest_report_title="2025 W03 RD4 團隊週報 (0113-0117)",
+    )
+
+    async def run():
+        await asyncio.gather(
+            *(instances[i % 2].put(f"T{i}", {2025: entry}) for i in range(40))
+        )
+
+    asyncio.run(run())
+
+    reloaded = ReportIndex(LocalReportIndexStore(path))
+    assert all(asyncio.run(reloaded.get(f"T{i}", 2025)) == entry for i in range(40))
+
+def test_conflicting_write_is_retried_after_backoff(monkeypatch):
+    from backend.src.services import report_index as report_index_module
+    from backend.src.services.config_backend import ConfigConflictError
+
+    sleeps = []
+    monkeypatch.setattr(report_index_module.time, "sleep", sleeps.append)
+    store = MagicMock()
+    store.load.return_value = ({}, 3)
+    store.save.side_effect = [ConfigConflictError("lost the race"), 4]
+    entry = ReportIndexEntry(
+        root_page_id="1",
+        root_page_title="團隊週會 2025",
+        latest_report_id="11",
+        latest_report_title="2025 W03 RD4 團隊週報 (0113-0117)",
+    )
+
+    asyncio.run(ReportIndex(store).put("RD4", {2025: entry}))
+
+    assert store.save.call_count == 2
+    assert len(sleeps) == 1 and 0 <= sleeps[0] <= 0.05
+    assert store.save.call_args.args[:2] == ("RD4", {"2025": entry.model_dump()})
@@ -0,0 +1,64 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from backend.src.services.report_template import ReportTemplateCache, render_template
+
+
+def _client(version=1, body="<p>{{week}}</p>"):
+    client = MagicMock()
+    client.base_url = "https://wiki"
+    client.get_page = AsyncMock(return_value={"id": "7", "version": {"number": version}})
+    client.get_page_content = AsyncMock(
+        return_value={
+            "id": "7",
+            "version": {"number": version},
+            "body": {"storage": {"value": body}},
+        }
+    )
+    return client
+
+def test_render_template_escapes_values_and_keeps_unknown_placeholders():
+    body = "<p>{{ team }} / {{week}} / {{missing}}</p>"
+
+    assert render_template(body, {"team": "R&D <4>", "week": "03"}) == (
+        "<p>R&amp;D &lt;4&gt; / 03 / {{missing}}</p>"
+    )
+
+def test_cache_serves_body_without_requests_within_check_interval():
+    cache = ReportTemplateCache(check_seconds=60)
+    client = _client()
+
+    async def run():
+        return [await cache.get(client, "7") for _ in range(3)]
+
+    assert asyncio.run(run()) == ["<p>{{week}}</p>"] * 3
+    client.get_page_content.assert_awaited_once_with("7")
+    client.get_page.assert_not_awaited()
+
+def test_cache_rechecks_version_and_refetches_only_on_change():
+    cache = ReportTemplateCache(check_seconds=0)
+    client = _client(version=1)
+
+    asyncio.run(cache.get(client, "7"))
+    asyncio.run(cache.get(client, "7"))
+    assert client.get_page_content.await_count == 1
+    assert client.get_page.await_count == 1
+
+    client.get_page.return_value = {"id": "7", "version": {"number": 2}}
+    client.get_page_content.return_value = {
+        "id": "7",
+        "version": {"number": 2},
+        "body": {"storage": {"value": "<p>new</p>"}},
+    }
+    assert asyncio.run(cache.get(client, "7")) == "<p>new</p>"
+    assert client.get_page_content.await_count == 2
+
+def test_concurrent_lookups_share_one_fetch():
+    cache = ReportTemplateCache()
+    client = _client()
+
+    async def run():
+        return await asyncio.gather(*(cache.get(client, "7") for _ in range(20)))
+
+    assert len(set(asyncio.run(run()))) == 1
+    client.get_page_content.assert_awaited_once()
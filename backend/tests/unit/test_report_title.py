@@ -0,0 +1,84 @@
+import dataclasses
+import datetime
+
+import pytest
+
+from backend.src.services.report_title import (
+    WeeklyReportTitle,
+    parse_report_title,
+    parse_report_titles,
+)
+
+
+def test_parse_report_title_fields():
+    parsed = parse_report_title("2025 W02 技術部 RD4 團隊週報 (0106-0110)")
+
+    assert parsed.year == 2025
+    assert parsed.week == 2
+    assert parsed.label == "技術部 RD4 團隊週報"
+    assert parsed.start_date == datetime.date(2025, 1, 6)
+    assert parsed.end_date == datetime.date(2025, 1, 10)
+    assert str(parsed) == "2025 W02 技術部 RD4 團隊週報 (0106-0110)"
+
+def test_parse_report_title_year_end_with_calendar_year_label():
+    # Monday 2025-12-29 is in ISO week 1 of 2026 but filed under 2025.
+    parsed = parse_report_title("2025 W01 RD4 週報 (1229-0102)")
+
+    assert parsed.start_date == datetime.date(2025, 12, 29)
+    assert parsed.end_date == datetime.date(2026, 1, 2)
+
+def test_parse_report_title_year_end_with_iso_year_label():
+    # Monday 2024-12-30 is in ISO week 1 of 2025.
+    parsed = parse_report_title("2025 W01 RD4 週報 (1230-0103)")
+
+    assert parsed.start_date == datetime.date(2024, 12, 30)
+    assert parsed.end_date == datetime.date(2025, 1, 3)
+
+def test_parse_report_title_without_week():
+    parsed = parse_report_title("2025 RD4 週報 (0303-0307)")
+
+    assert parsed.week is None
+    assert parsed.label == "RD4 週報"
+    assert parsed.end_date == datetime.date(2025, 3, 7)
+    assert str(parsed.next_week()) == "2025 RD4 週報 (0310-0314)"
+
+def test_parse_report_title_rejects_other_pages():
+    assert parse_report_title("會議紀錄") is None
+    assert parse_report_title("2025 會議紀錄 0106") is None
+    assert parse_report_title("2025 W09 RD4 週報 (0230-0304)") is None
+
+def test_parse_report_title_is_cached():
+    title = "2025 W10 RD4 週報 (0303-0307)"
+
+    assert parse_report_title(title) is parse_report_title(title)
+
+def test_cached_titles_are_immutable():
+    parsed = parse_report_title("2025 W10 RD4 週報 (0303-0307)")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        parsed.label = "RD5 週報"
+    assert parse_report_title("2025 W10 RD4 週報 (0303-0307)").label == "RD4 週報"
+
+def test_next_week_crosses_year():
+    parsed = parse_report_title("2025 W52 RD4 週報 (1222-1226)")
+
+    next_title = parsed.next_week()
+
+    assert str(next_title) == "2025 W01 RD4 週報 (1229-0102)"
+    assert next_title.next_week() == WeeklyReportTitle(
+        2026, 2, "RD4 週報", datetime.date(2026, 1, 5), datetime.date(2026, 1, 9)
+    )
+
+def test_parse_report_titles_matches_single_parse():
+    titles = [
+        "2025 W01 RD4 週報 (1229-0102)",
+        "會議紀錄",
+        "2024 W50 RD1 週報 (1209-1213)",
+        "",
+    ]
+
+    parsed = parse_report_titles(titles)
+
+    assert parsed == [parse_report_title(title) for title in titles]
+    assert parsed[1] is None and parsed[3] is None
+    assert parsed[2].end_date == datetime.date(2024, 12, 13)
@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import pytest
+from backend.src.services import resilience
+from backend.src.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceededError,
+    Upstream,
+    call_timeout,
+    deadline,
+    remaining_time,
+)
+
+
+class Transient(Exception):
+    pass
+
+def _is_transient(error: Exception) -> bool:
+    return isinstance(error, Transient)
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(resilience.random, "uniform", lambda a, b: 0)
+
+def test_breaker_opens_after_threshold_and_half_opens_after_reset(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: clock[0])
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=10)
+
+    for _ in range(2):
+        breaker.before_call()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock[0] += 10
+    breaker.before_call() # The single trial call
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_failed_trial_reopens_breaker(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: clock[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10)
+    breaker.before_call()
+    breaker.record_failure()
+
+    clock[0] += 10
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+def test_idempotent_calls_are_retried_on_transient_errors():
+    upstream = Upstream("test", CircuitBreaker(failure_threshold=10), max_attempts=3)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise Transient()
+        return "ok"
+
+    assert upstream.call(flaky, idempotent=True, is_transient=_is_transient) == "ok"
+    assert upstream.stats()["retries"] == 2
+    assert upstream.breaker.state == CircuitBreaker.CLOSED
+
+def test_non_idempotent_and_permanent_errors_are_not_retried():
+    upstream = Upstream("test", CircuitBreaker(failure_threshold=10), max_attempts=3)
+    calls = []
+
+    def fail(error):
+        calls.append(error)
+        raise error
+
+    with pytest.raises(Transient):
+        upstream.call(lambda: fail(Transient()), idempotent=False, is_transient=_is_transient)
+    with pytest.raises(ValueError):
+        upstream.call(lambda: fail(ValueError()), idempotent=True, is_transient=_is_transient)
+
+    assert len(calls) == 2
+    stats = upstream.stats()
+    assert (stats["failures"], stats["retries"]) == (1, 0)
+
+def test_open_breaker_fails_fast():
+    upstream = Upstream("test", CircuitBreaker(failure_threshold=1), max_attempts=1)
+
+    def fail():
+        raise Transient()
+
+    with pytest.raises(Transient):
+        upstream.call(fail, True, _is_transient)
+
+    called = []
+    with pytest.raises(CircuitOpenError, match="test"):
+        upstream.call(lambda: called.append(1), True, _is_transient)
+
+    assert called == []
+    assert upstream.stats()["rejected"] == 1
+
+def test_deadline_caps_timeouts_and_nests():
+    assert remaining_time() is None
+    assert call_timeout(30) == 30
+    with deadline(5):
+        assert call_timeout(30) <= 5
+        with deadline(60):
+            assert remaining_time() <= 5 # Nested deadlines never extend
+    assert remaining_time() is None
+
+def test_async_call_is_cut_off_at_deadline():
+    upstream = Upstream("test", CircuitBreaker())
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    async def run():
+        with deadline(0.05):
+            await upstream.acall(slow, idempotent=True, is_transient=lambda e: True)
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(run())
+    assert time.monotonic() - started < 0.5
+    assert upstream.breaker.consecutive_failures == 0 # The deadline is not the upstream's fault
@@ -0,0 +1,79 @@
+import asyncio
+import datetime
+from unittest.mock import patch
+
+from backend.src.services.file_config_backend import FileConfigBackend
+from backend.src.services.job_runner import JobRunner
+from backend.src.services.scheduler import LeaderLock, Scheduler
+
+UTC = datetime.timezone.utc
+
+
+def _utc(*args) -> datetime.datetime:
+    return datetime.datetime(*args, tzinfo=UTC)
+
+def test_scheduler_fires_due_jobs_in_order():
+    fired = []
+
+    def job(name):
+        async def run():
+            fired.append(name)
+        return run
+
+    jobs = {
+        "on-call-notification": ("0 18 * * 5", job("on-call")),
+        "confluence-weekly-report": ("0 10 * * 1", job("report")),
+    }
+
+    async def run():
+        runner = JobRunner()
+        scheduler = Scheduler(lambda: jobs)
+        with patch("backend.src.services.scheduler.get_job_runner", return_value=runner):
+            scheduler.refresh(_utc(2026, 10, 18))
+            assert scheduler.next_fire_at() == _utc(2026, 10, 19, 10).timestamp()
+            assert scheduler.run_pending(_utc(2026, 10, 19, 9)) == []
+            assert scheduler.run_pending(_utc(2026, 10, 19, 10)) == ["confluence-weekly-report"]
+            assert scheduler.run_pending(_utc(2026, 10, 24)) == ["on-call-notification"]
+            await runner.shutdown()
+        return scheduler
+
+    scheduler = asyncio.run(run())
+    assert fired == ["report", "on-call"]
+    assert scheduler.next_fire_at() == _utc(2026, 10, 26, 10).timestamp()
+
+def test_scheduler_refresh_reschedules_changed_and_removed_jobs():
+    async def noop():
+        pass
+
+    jobs = {"report": ("0 10 * * 1", noop), "on-call": ("0 18 * * 5", noop)}
+    scheduler = Scheduler(lambda: dict(jobs))
+    scheduler.refresh(_utc(2026, 10, 18))
+
+    jobs["report"] = ("0 9 * * 1", noop)
+    del jobs["on-call"]
+    scheduler.refresh(_utc(2026, 10, 18))
+
+    assert sorted(scheduler._heap) == [(_utc(2026, 10, 19, 9).timestamp(), "report")]
+
+def test_follower_does_not_fire():
+    async def noop():
+        pass
+
+    scheduler = Scheduler(lambda: {"report": ("0 10 * * 1", noop)}, lock=LeaderLock("lock.json", 60))
+    scheduler.refresh(_utc(2026, 10, 18))
+    assert scheduler.is_leader is False
+    assert scheduler.run_pending(_utc(2026, 10, 19, 10)) == []
+
+def test_leader_lock_allows_one_holder_until_expiry(tmp_path):
+    backend = FileConfigBackend(str(tmp_path / "config.json"))
+    first = LeaderLock("lock.json", lease_seconds=60, holder_id="a")
+    second = LeaderLock("lock.json", lease_seconds=60, holder_id="b")
+
+    with patch("backend.src.services.config_backend.get_config_backend", return_value=backend):
+        assert first.acquire()
+        assert not second.acquire()
+        assert first.acquire() # Renewal
+        first.release()
+        assert second.acquire()
+        with patch("backend.src.services.scheduler.time.time", return_value=10**12):
+            assert first.acquire() # The lease expired
@@ -0,0 +1,98 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from backend.src.services.slack_dispatcher import SlackDispatcher, TokenBucket
+from slack_sdk.errors import SlackApiError
+from slack_sdk.web import SlackResponse
+
+
+def _slack_error(error: str, status_code: int = 200, headers: dict | None = None):
+    response = SlackResponse(
+        client=None,
+        http_verb="POST",
+        api_url="https://slack.com/api/chat.postMessage",
+        req_args={},
+        data={"ok": False, "error": error},
+        headers=headers or {},
+        status_code=status_code,
+    )
+    return SlackApiError(error, response)
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+def test_token_bucket_pause_delays_next_reservation():
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.pause(3)
+    assert bucket.reserve() == pytest.approx(3.1, abs=0.01)
+
+def test_rate_limited_call_honors_retry_after():
+    dispatcher = SlackDispatcher(max_retries=3)
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise _slack_error("ratelimited", 429, {"Retry-After": "2"})
+        return {"ok": True}
+
+    with patch("backend.src.services.slack_dispatcher.time.sleep") as mock_sleep:
+        assert dispatcher.call("chat.postMessage", "C1", fn) == {"ok": True}
+
+    backoff = mock_sleep.call_args_list[0].args[0]
+    assert 2 <= backoff <= 3
+    assert len(attempts) == 2
+    assert dispatcher.stats()["chat.postMessage"]["rate_limited"] == 1
+
+def test_rate_limited_call_gives_up_after_max_retries():
+    dispatcher = SlackDispatcher(max_retries=2)
+
+    def fn():
+        raise _slack_error("ratelimited", 429)
+
+    with patch("backend.src.services.slack_dispatcher.time.sleep"):
+        with pytest.raises(SlackApiError):
+            dispatcher.call("conversations.setTopic", "C1", fn)
+    assert dispatcher.stats()["conversations.setTopic"]["calls"] == 3
+
+def test_other_errors_are_not_retried():
+    dispatcher = SlackDispatcher()
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        raise _slack_error("channel_not_found")
+
+    with pytest.raises(SlackApiError):
+        dispatcher.call("chat.postMessage", "C1", fn)
+    assert len(attempts) == 1
+
+def test_async_calls_to_one_channel_are_paced():
+    dispatcher = SlackDispatcher()
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    async def fn():
+        return {"ok": True}
+
+    async def run():
+        with patch("backend.src.services.slack_dispatcher.asyncio.sleep", fake_sleep):
+            await asyncio.gather(
+                *(dispatcher.acall("chat.postMessage", "C1", fn) for _ in range(3))
+            )
+            await dispatcher.acall("chat.postMessage", "C2", fn)
+
+    asyncio.run(run())
+    # The channel allows one message per second; a different channel is not held back.
+    assert sleeps == pytest.approx([1.0, 2.0], abs=0.05)
+    stats = dispatcher.stats()["chat.postMessage"]
+    assert stats["calls"] == 4
+    assert stats["queue_depth"] == 0
+    assert stats["wait_seconds_max"] == pytest.approx(2.0, abs=0.05)
@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+from backend.src.services import slack_service
+
+
+@pytest.fixture(autouse=True)
+def slack_env(monkeypatch):
+    monkeypatch.setenv("SLACK_API_TOKEN", "xoxb-test")
+    monkeypatch.setattr(slack_service, "_web_client", None)
+    monkeypatch.setattr(slack_service, "_async_client", None)
+    monkeypatch.setattr(slack_service, "_async_client_loop", None)
+
+def test_slack_services_share_one_client():
+    assert slack_service.SlackService().client is slack_service.SlackService().client
+
+def test_async_slack_client_is_shared_per_loop_and_closed():
+    async def run():
+        first = slack_service.AsyncSlackService().client
+        second = slack_service.AsyncSlackService().client
+        session = first.session
+        await slack_service.close_slack_client()
+        return first, second, session
+
+    first, second, session = asyncio.run(run())
+    assert first is second
+    assert session.closed
+
+def test_missing_token_raises(monkeypatch):
+    monkeypatch.delenv("SLACK_API_TOKEN")
+    with pytest.raises(ValueError, match="SLACK_API_TOKEN"):
+        slack_service.SlackService()
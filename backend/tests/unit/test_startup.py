@@ -0,0 +1,15 @@
+import os
+
+from backend.benchmarks.startup_bench import app_import_ms, measure_import
+
+# Generous by default so slow CI machines pass; tighten locally to catch regressions.
+STARTUP_IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "500"))
+
+
+def test_app_import_defers_heavy_sdks_and_fits_budget():
+    timings = measure_import("backend.src.main")
+
+    # These SDKs are only needed once a trigger actually calls an upstream.
+    for module in ("aiohttp", "slack_sdk", "httpx", "google.cloud.storage"):
+        assert module not in timings, f"{module} is imported at startup"
+    assert app_import_ms(timings) < STARTUP_IMPORT_BUDGET_MS
@@ -0,0 +1,93 @@
+import io
+import json
+import logging
+import logging.handlers
+import queue
+
+from backend.src.services import structured_logging, tracing
+from backend.src.services.structured_logging import (
+    ContextFilter,
+    DebugRateLimitFilter,
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    configure_logging,
+    log_context,
+    stop_logging,
+)
+from backend.src.services.tracing import InMemorySpanExporter, start_span
+
+
+def _pipeline(maxsize: int = 100):
+    log_queue = queue.Queue(maxsize=maxsize)
+    handler = NonBlockingQueueHandler(log_queue)
+    handler.addFilter(ContextFilter())
+    stream = io.StringIO()
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(JsonFormatter())
+    logger = logging.getLogger("test.structured")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    return logger, handler, log_queue, stream_handler, stream
+
+def test_records_are_written_as_json_with_context_and_extras(monkeypatch):
+    monkeypatch.setattr(tracing, "_exporters", [InMemorySpanExporter()])
+    logger, _, log_queue, stream_handler, stream = _pipeline()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+
+    with log_context(job_id="job-1", team="alpha"), start_span("job") as span:
+        logger.info("copied %s", "page", extra={"upstream": "confluence", "duration_ms": 12.5})
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logger.exception("failed")
+    logger.info("outside")
+    listener.stop()
+
+    copied, failed, outside = (json.loads(line) for line in stream.getvalue().splitlines())
+    assert copied["message"] == "copied page"
+    assert copied["level"] == "INFO"
+    assert (copied["job_id"], copied["team"], copied["upstream"]) == ("job-1", "alpha", "confluence")
+    assert copied["duration_ms"] == 12.5
+    assert copied["trace_id"] == span.trace_id
+    assert "RuntimeError: boom" in failed["exc_info"]
+    assert "job_id" not in outside
+
+def test_full_queue_drops_records_instead_of_blocking():
+    logger, handler, log_queue, _, _ = _pipeline(maxsize=2)
+    for i in range(5):
+        logger.info("record %d", i)
+
+    assert log_queue.qsize() == 2
+    assert handler.dropped == 3
+
+def test_debug_records_are_rate_limited_per_call_site():
+    rate_limit = DebugRateLimitFilter(rate=0, burst=3)
+
+    def record(level: int, msg: str) -> logging.LogRecord:
+        return logging.LogRecord("test", level, "", 0, msg, None, None)
+
+    passed = [rate_limit.filter(record(logging.DEBUG, "hot path")) for _ in range(10)]
+    assert passed.count(True) == 3
+    assert rate_limit.filter(record(logging.DEBUG, "other site"))
+    assert rate_limit.filter(record(logging.INFO, "hot path"))
+    assert rate_limit.dropped == 7
+
+def test_configure_logging_sets_per_logger_levels(monkeypatch):
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", list(root.handlers))
+    monkeypatch.setattr(root, "level", root.level)
+    monkeypatch.setattr(structured_logging, "_listener", None)
+    monkeypatch.setenv("LOG_LEVEL", "warning")
+    monkeypatch.setenv("LOG_LEVELS", "test.chatty=DEBUG, test.quiet=ERROR")
+    try:
+        configure_logging()
+        assert root.level == logging.WARNING
+        assert logging.getLogger("test.chatty").level == logging.DEBUG
+        assert logging.getLogger("test.quiet").level == logging.ERROR
+        assert isinstance(root.handlers[0], NonBlockingQueueHandler)
+    finally:
+        stop_logging()
+        logging.getLogger("test.chatty").setLevel(logging.NOTSET)
+        logging.getLogger("test.quiet").setLevel(logging.NOTSET)
@@ -0,0 +1,101 @@
+import asyncio
+
+import httpx
+import pytest
+from backend.src.main import app
+from backend.src.services import confluence_client, tracing
+from backend.src.services.confluence_client import ConfluenceClient
+from backend.src.services.telemetry import track_upstream
+from backend.src.services.tracing import (
+    InMemorySpanExporter,
+    extract_span_context,
+    start_span,
+    trace_headers,
+    traced,
+)
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(tracing, "_exporters", [exporter])
+    return exporter
+
+def test_spans_nest_across_tasks_and_record_errors(exporter):
+    @traced("service.step")
+    async def step():
+        with track_upstream("confluence", "get_page"):
+            await asyncio.sleep(0)
+        with pytest.raises(RuntimeError), track_upstream("slack", "chat.postMessage"):
+            raise RuntimeError("down")
+
+    async def run():
+        with start_span("job") as root:
+            await asyncio.gather(step(), step())
+        return root
+
+    root = asyncio.run(run())
+    spans = {span.span_id: span for span in exporter.get_finished_spans()}
+    assert len(spans) == 7
+    assert {span.trace_id for span in spans.values()} == {root.trace_id}
+    steps = [s for s in spans.values() if s.name == "service.step"]
+    assert {s.parent_span_id for s in steps} == {root.span_id}
+    slack = [s for s in spans.values() if s.name == "slack chat.postMessage"]
+    assert {spans[s.parent_span_id].name for s in slack} == {"service.step"}
+    assert {(s.kind, s.status) for s in slack} == {("client", "ERROR")}
+
+def test_tracing_is_disabled_without_exporters(monkeypatch):
+    monkeypatch.setattr(tracing, "_exporters", [])
+    with start_span("job") as span:
+        assert span is None
+        assert trace_headers() == {}
+
+def test_traceparent_round_trips():
+    trace_id, span_id = "4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7"
+    context = extract_span_context({"traceparent": f"00-{trace_id}-{span_id}-01"})
+
+    assert (context.trace_id, context.span_id, context.sampled) == (trace_id, span_id, True)
+    assert extract_span_context({"traceparent": "00-xyz-00f067aa0ba902b7-01"}) is None
+    assert extract_span_context({}) is None
+
+def test_confluence_requests_carry_the_client_span_context(exporter, monkeypatch):
+    for name, value in {
+        "CONFLUENCE_DOMAIN": "test.atlassian.net",
+        "CONFLUENCE_USERNAME": "user",
+        "CONFLUENCE_API_TOKEN": "token",
+        "CONFLUENCE_SPACE_KEY": "SPACE",
+    }.items():
+        monkeypatch.setenv(name, value)
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("traceparent"))
+        return httpx.Response(200, json={"id": "1", "title": "Page"})
+
+    monkeypatch.setattr(
+        confluence_client,
+        "_build_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    monkeypatch.setattr(confluence_client, "_http_client", None)
+
+    async def run():
+        with start_span("job"):
+            await ConfluenceClient().get_page("1")
+
+    asyncio.run(run())
+    confluence_client._http_client = None
+
+    (span,) = [s for s in exporter.get_finished_spans() if s.kind == "client"]
+    assert seen == [f"00-{span.trace_id}-{span.span_id}-01"]
+    assert span.attributes["http.response.status_code"] == 200
+
+def test_route_spans_continue_the_callers_trace(exporter):
+    trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+    TestClient(app).get("/", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"})
+
+    (span,) = exporter.get_finished_spans()
+    assert (span.name, span.kind, span.trace_id) == ("GET /", "server", trace_id)
+    assert span.parent_span_id == "00f067aa0ba902b7"
+    assert span.attributes["http.response.status_code"] == 200